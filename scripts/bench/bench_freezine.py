@@ -0,0 +1,136 @@
+"""프리진경제 기사 목록 추출 벤치마크
+저장된 fixture 페이지로 기존 BeautifulSoup(html.parser) 경로와
+SiteProfile 엔진(lxml / 증분 HTMLParser)의 속도·결과 일치를 비교.
+
+    python scripts/bench/bench_freezine.py [반복 횟수]
+"""
+import io
+import os
+import re
+import sys
+import glob
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import update_news as un  # noqa: E402
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+COUNT = 3
+
+
+def extract_bs4(html, count):
+    """기존 get_freezine_section_news 의 BeautifulSoup 추출 로직 (기준)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    container = (
+        soup.find(id='section-list') or
+        soup.find(id='article-list') or
+        soup.find('div', class_=re.compile(r'(article|news)[_\-]?list|list[_\-]?body', re.I)) or
+        soup.find('ul',  class_=re.compile(r'(article|news)[_\-]?list', re.I))
+    )
+    if container:
+        a_tags = container.find_all('a', href=re.compile(r'articleView\.html\?idxno='))
+    else:
+        a_tags = []
+        for li in soup.find_all('li'):
+            for a in li.find_all('a', href=re.compile(r'articleView\.html\?idxno=')):
+                a_tags.append(a)
+        if not a_tags:
+            a_tags = soup.find_all('a', href=re.compile(r'articleView\.html\?idxno='))
+
+    out, seen = [], set()
+    for a_tag in a_tags:
+        title = a_tag.get_text(strip=True)
+        href  = a_tag.get('href', '')
+        if not title or len(title) < 8:
+            continue
+        if href.startswith('/'):
+            href = 'https://www.freezine.co.kr' + href
+        elif not href.startswith('http'):
+            href = 'https://www.freezine.co.kr/' + href.lstrip('/')
+        if href in seen:
+            continue
+        seen.add(href)
+        date = ''
+        parent = a_tag.find_parent('li') or a_tag.find_parent('div')
+        if parent:
+            m = re.search(r'(\d{4})[.\-](\d{1,2})[.\-](\d{1,2})', parent.get_text(' '))
+            if m:
+                date = f"{m.group(1)}-{m.group(2).zfill(2)}-{m.group(3).zfill(2)}"
+        out.append((title, href, date))
+        if len(out) >= count:
+            break
+    return out, bool(container)
+
+
+class _CountingStream(io.BytesIO):
+    """읽은 바이트 수 기록 (증분 파서가 어디서 멈췄는지 확인용)"""
+    consumed = 0
+
+    def read(self, n=-1):
+        data = super().read(n)
+        self.consumed += len(data)
+        return data
+
+
+def timeit(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, 'freezine_*.html')))
+    if not paths:
+        print("fixture 없음")
+        return 1
+
+    failed = False
+    for path in paths:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        html = raw.decode('utf-8', errors='replace')
+        name = os.path.basename(path)
+        print(f"── {name} ({len(raw) / 1024:.0f}KB, count={COUNT}, best of {repeat})")
+
+        ref = None
+        if BeautifulSoup is not None:
+            t, ref = timeit(lambda: extract_bs4(html, COUNT), repeat)
+            print(f"  bs4 html.parser : {t * 1000:8.2f} ms")
+        else:
+            print("  bs4 html.parser : (bs4 없음, 결과 비교 생략)")
+
+        runs = []
+        if un.lxml_html:
+            runs.append(('lxml', lambda: un.extract_listing_lxml(un.FREEZINE_PROFILE, html, COUNT)))
+        streams = []
+
+        def incremental():
+            s = _CountingStream(raw)
+            streams.append(s)
+            return un.extract_listing_incremental(un.FREEZINE_PROFILE, s, COUNT)
+        runs.append(('incremental', incremental))
+
+        for label, fn in runs:
+            t, got = timeit(fn, repeat)
+            note = ''
+            if label == 'incremental':
+                note = f" (읽은 양 {streams[-1].consumed / len(raw):.0%})"
+            same = '' if ref is None else ('  일치' if got == ref else '  불일치!')
+            print(f"  {label:<16}: {t * 1000:8.2f} ms{same}{note}")
+            if ref is not None and got != ref:
+                failed = True
+                print(f"    기준: {ref}\n    결과: {got}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
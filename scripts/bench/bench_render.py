@@ -0,0 +1,89 @@
+"""카드 HTML 렌더링 벤치마크
+fixtures/render_inputs.json 의 입력(카드별 인자 목록)으로 카드 빌더를 실행해
+fixtures/render/<카드>_<n>.html 기록본과 바이트 단위로 비교하고 빌더별 시간을 측정.
+
+    python scripts/bench/bench_render.py [반복 횟수] [--update-golden]
+
+--update-golden 은 의도한 출력 변경 후 기록본을 현재 출력으로 교체.
+"""
+import os
+import sys
+import json
+import time
+import statistics
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+import update_news as un  # noqa: E402
+
+FIXTURE_DIR = os.path.join(HERE, 'fixtures')
+GOLDEN_DIR  = os.path.join(FIXTURE_DIR, 'render')
+INPUTS_PATH = os.path.join(FIXTURE_DIR, 'render_inputs.json')
+
+BUILDERS = {
+    'volatility':  un.build_volatility_card_html,
+    'left':        un.build_left_card_html,
+    'right':       un.build_right_card_html,
+    'mk_dropdown': un.build_mk_dropdown_html,
+    'news_items':  un.build_news_items_html,
+}
+
+
+def golden_path(card, i):
+    return os.path.join(GOLDEN_DIR, f'{card}_{i}.html')
+
+
+def first_diff(a, b):
+    """처음 달라지는 위치 주변 (기록본, 결과)"""
+    i = next((k for k, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+    return a[max(i - 40, 0):i + 40], b[max(i - 40, 0):i + 40]
+
+
+def timeit(fn, args, repeat):
+    """반복 측정 → (중앙값, 최소) µs"""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        times.append((time.perf_counter() - t0) * 1e6)
+    return statistics.median(times), min(times)
+
+
+def main():
+    repeat = next((int(a) for a in sys.argv[1:] if a.isdigit()), 500)
+    update = '--update-golden' in sys.argv
+    with open(INPUTS_PATH, 'r', encoding='utf-8') as f:
+        inputs = json.load(f)
+
+    failed = False
+    print(f"{'카드':<16} {'입력':>4} {'중앙값':>10} {'최소':>10} {'크기':>8}  기록본")
+    for card, cases in inputs.items():
+        fn = BUILDERS[card]
+        for i, args in enumerate(cases):
+            out = fn(*args)
+            path = golden_path(card, i)
+            if update:
+                os.makedirs(GOLDEN_DIR, exist_ok=True)
+                with open(path, 'w', encoding='utf-8', newline='') as f:
+                    f.write(out)
+                same = '저장'
+            else:
+                try:
+                    with open(path, 'r', encoding='utf-8', newline='') as f:
+                        expected = f.read()
+                except OSError:
+                    expected = None
+                same = '없음' if expected is None else '일치' if out == expected else '불일치!'
+                if expected is not None and out != expected:
+                    failed = True
+            med, best = timeit(fn, args, repeat)
+            print(f"{card:<16} {i:>4} {med:8.1f}µs {best:8.1f}µs {len(out):>8}  {same}")
+            if same == '불일치!':
+                exp, got = first_diff(expected, out)
+                print(f"    기록본: {exp!r}\n    결과  : {got!r}")
+    print(f"(반복 {repeat}회)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""업데이트 단계별 오프라인 벤치마크
+fixtures/ 기록본을 로컬 대역 서버(fixture_server)로 응답하고, yfinance 는
+기록된 일봉 표로 대체해 각 단계를 따로 측정. 반복 중 최솟값을 baseline.json 과 비교
+(중앙값은 참고용 — 루프백 HTTP 단계는 중앙값 변동이 커서 판정에 쓰지 않음).
+
+    python scripts/bench/bench_stages.py [--repeat N] [--only 단계,...] [--update-baseline]
+
+캐시·상태 파일(.cache, data/econ_state.json, index.html)은 임시 디렉터리 사본을 사용.
+끝으로 같은 기록본으로 연속 실행했을 때 두 번째부터 EXIT_UNCHANGED 인지 확인 (--only 이면 'unchanged' 포함 시).
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import statistics
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(HERE))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, HERE)
+import update_news as un            # noqa: E402
+from fixture_server import FixtureServer, FIXTURE_DIR   # noqa: E402
+
+BASELINE_PATH = os.path.join(HERE, 'baseline.json')
+REGRESSION    = 0.50        # CPU 단계: 기준 대비 +50% 이상 느려지면 회귀로 표시 (최솟값도 실행 간 ±30% 흔들림)
+REGRESSION_IO = 1.00        # 대역 서버와 HTTP 를 주고받거나 매 반복 파일을 쓰는 단계: 스레드·소켓·디스크 잡음이 커서 +100%
+REGRESSION_MS = 0.5         # 단, 절대 차이가 이보다 작으면 (아주 짧은 단계의 잡음) 무시
+
+
+# ── 격리 환경 ──
+
+class Sandbox:
+    """단계마다 새 임시 디렉터리에 캐시·상태·index.html 사본을 두고 모듈 전역을 교체"""
+
+    def __init__(self):
+        self.dir = tempfile.mkdtemp(prefix='bench-')
+        shutil.copy(os.path.join(ROOT, 'index.html'), os.path.join(self.dir, 'index.html'))
+        shutil.copy(os.path.join(ROOT, un.ECON_STATE_PATH), os.path.join(self.dir, 'econ_state.json'))
+        d = self.dir
+        un.HTTP_CACHE       = un.HttpCache(cache_dir=os.path.join(d, 'http'))
+        un.FRED             = un.FredClient(cache=un.HTTP_CACHE, store=un.FredStore(os.path.join(d, 'fred')))
+        un.TRANSLATOR       = un.Translator(un.IdentityBackend(), path=os.path.join(d, 'translate.json'))
+        un.ECON_STATE       = un.EconState(os.path.join(d, 'econ_state.json'))
+        un.RENDER_STATE     = un.RenderState(os.path.join(d, 'render_state.json'))
+        un.SNAPSHOTS        = un.SnapshotStore(os.path.join(d, 'snapshots.json'))
+        un.ROLLING          = un.RollingStore(os.path.join(d, 'rolling.json'))
+        un.ARCHIVE          = un.RunArchive(os.path.join(d, 'archive'))
+        un.METRICS          = un.RunMetrics(os.path.join(d, 'metrics.jsonl'))
+        un.INDEX_HTML_PATH  = os.path.join(d, 'index.html')
+
+    def close(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def load_yf_frame():
+    """yf_prices.csv (long) → yf.download(group_by='column') 와 같은 (Price, Ticker) 열 표"""
+    pd = un.pd
+    long = pd.read_csv(os.path.join(FIXTURE_DIR, 'yf_prices.csv'), parse_dates=['Date'])
+    df = long.pivot(index='Date', columns='Ticker',
+                    values=['Close', 'High', 'Low', 'Open', 'Volume'])
+    df.columns.names = ['Price', 'Ticker']
+    return df
+
+
+def patch_yfinance(frame):
+    """yf.download → 기록된 표에서 요청 티커만, SPY 옵션 체인은 없음 처리"""
+    def download(tickers, **kwargs):
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        cols = [c for c in frame.columns if c[1] in tickers]
+        return frame[cols]
+    un.yf.download = download
+    un.get_spy_option_expiries = lambda: None
+
+
+# ── 단계 ──
+# 각 단계: setup(sandbox) → 측정 함수 (매 반복마다 새 Sandbox)
+
+def stage_fetch_rss_news(sb):
+    url = un.MK_RSS_SECTIONS['증권']
+    return lambda: un.fetch_rss_news(url, 10, '매일경제', 'https://www.mk.co.kr')
+
+
+def stage_freezine(sb):
+    return lambda: un.get_freezine_section_news('S1N6', 5)
+
+
+def _fetch_econ_fred():
+    """경제지표 FRED 시리즈를 수집 그래프로 받아 둠 (조립 단계는 저장소만 읽음)"""
+    un.run_fetch_graph(un.fred_fetch_tasks([sid for _, sid, _, _, _ in un.FRED_SERIES_CFG]))
+
+
+def stage_fred_history(sb):
+    def run():
+        _fetch_econ_fred()
+        return un.assemble_econ_fred()
+    return run
+
+
+def _econ_inputs():
+    _fetch_econ_fred()
+    fred_data = {}
+    for key, rows in un.assemble_econ_fred().items():
+        if rows:
+            vals = [v for _, v in rows]
+            fred_data[key] = {'current': vals[-1], 'prev': vals[-2] if len(vals) > 1 else vals[-1]}
+    pmi = un.ECON_STATE.load()['indicators']
+    return fred_data, {k: pmi.get(k, {}) for k in un.PMI_KEYS}
+
+
+def stage_econ_analysis(sb):
+    fred_data, pmi = _econ_inputs()
+    return lambda: un.generate_econ_analysis(fred_data, pmi)
+
+
+def _volatility_inputs():
+    res, _ = un.run_fetch_graph(un.volatility_fetch_tasks()
+                                + [un.price_fetch_task(un.VOL_PRICE_TICKERS)]
+                                + un.fred_fetch_tasks(un.FRED_VOL_SERIES))
+    return un.assemble_volatility_macro(res)
+
+
+def stage_volatility_card(sb):
+    vm = _volatility_inputs()
+    return lambda: un.build_volatility_card_html(vm, '09:00')
+
+
+def stage_price_snapshot(sb):
+    tickers = un.VOL_PRICE_TICKERS + ['^DJI', '^GSPC', '^IXIC', '^RUT', '^SOX', 'XLF', 'XLI', 'XLK',
+                                      'XLV', 'MSFT', 'AAPL', 'NVDA', 'GOOGL', 'AMZN', 'TSLA', 'META']
+    # 평시(매시간) 실행처럼 ROLLING 52주 창이 이미 채워진 상태에서 측정 (첫 실행의 1년치 채우기 제외)
+    un.fetch_price_snapshot(tickers)
+    return lambda: un.fetch_price_snapshot(tickers)
+
+
+def stage_market_data(sb):
+    return un.get_latest_market_data
+
+
+def stage_update_index_html(sb):
+    data = un.get_latest_market_data()
+    data['is_morning_update'] = True
+    original = os.path.join(sb.dir, 'index.orig.html')
+    shutil.copy(un.INDEX_HTML_PATH, original)
+
+    def run():
+        # 변경 감지로 생략되지 않도록 매번 원본 페이지·빈 지문에서 시작
+        shutil.copy(original, un.INDEX_HTML_PATH)
+        if os.path.exists(un.RENDER_STATE.path):
+            os.remove(un.RENDER_STATE.path)
+        return un.update_index_html(data)
+    return run
+
+
+# (이름, 준비 함수, 회귀 허용 비율)
+STAGES = [
+    ('fetch_rss_news',             stage_fetch_rss_news,    REGRESSION_IO),
+    ('get_freezine_section_news',  stage_freezine,          REGRESSION_IO),
+    ('get_fred_history',           stage_fred_history,      REGRESSION_IO),
+    ('generate_econ_analysis',     stage_econ_analysis,     REGRESSION),
+    ('build_volatility_card_html', stage_volatility_card,   REGRESSION),
+    ('fetch_price_snapshot',       stage_price_snapshot,    REGRESSION),
+    ('get_latest_market_data',     stage_market_data,       REGRESSION_IO),
+    ('update_index_html',          stage_update_index_html, REGRESSION_IO),
+]
+
+
+def measure(setup, repeat):
+    """반복마다 새 Sandbox (콜드 캐시) 에서 setup 후 측정 함수만 시간 측정 → ms 목록"""
+    times = []
+    for _ in range(repeat):
+        sb = Sandbox()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn = setup(sb)
+                t0 = time.perf_counter()
+                fn()
+                times.append((time.perf_counter() - t0) * 1000)
+        finally:
+            sb.close()
+    return times
+
+
+UNCHANGED_RUNS = 4
+
+
+def check_unchanged(runs=UNCHANGED_RUNS):
+    """같은 입력으로 수집·렌더링을 연속 실행 → 종료 코드 목록 (기대값: 0, 3, 3, ...).
+    보관소(스파크라인)는 이전 실행 1회분이 쌓인 상태에서 시작 — 매 실행 행이 늘어도 값이 같으면 생략돼야 함.
+    """
+    sb = Sandbox()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            un.get_latest_market_data()
+            return [un.update_once(un.get_latest_market_data()) for _ in range(runs)]
+    finally:
+        sb.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--repeat', type=int, default=7)
+    ap.add_argument('--only', default='', help='쉼표로 구분한 단계 이름')
+    ap.add_argument('--update-baseline', action='store_true')
+    args = ap.parse_args()
+
+    if not un.yf or not un.pd:
+        print("yfinance/pandas 없음 → 가격 관련 단계는 데이터 없이 측정됨")
+    else:
+        patch_yfinance(load_yf_frame())
+    only = {s for s in args.only.split(',') if s}
+
+    try:
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {}
+
+    results, regressed = {}, []
+    with FixtureServer(un) as srv:
+        print(f"{'단계':<28} {'중앙값':>9} {'최소':>9} {'기준':>9} {'변화':>8}")
+        for name, setup, tolerance in STAGES:
+            if only and name not in only:
+                continue
+            times = measure(setup, args.repeat)
+            best = min(times)
+            results[name] = round(best, 2)
+            base = baseline.get(name)
+            delta = ''
+            if base:
+                change = (best - base) / base
+                delta = f"{change:+.0%}"
+                if change > tolerance and best - base > REGRESSION_MS:
+                    delta += ' !'
+                    regressed.append(f"{name} (+{tolerance:.0%} 초과)")
+            base_txt = f"{base:.2f}" if base else '-'
+            print(f"{name:<28} {statistics.median(times):8.2f}ms {best:8.2f}ms {base_txt:>9} {delta:>8}")
+        print(f"(대역 서버 요청 {srv.hits}건, 반복 {args.repeat}회)")
+        if not only or 'unchanged' in only:
+            codes = check_unchanged()
+            expected = [0] + [un.EXIT_UNCHANGED] * (len(codes) - 1)
+            print(f"연속 실행 종료 코드: {codes} (기대 {expected})")
+            if codes != expected:
+                regressed.append('unchanged (같은 입력 재실행이 변경 없음으로 생략되지 않음)')
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"기준값 저장: {os.path.relpath(BASELINE_PATH, ROOT)}")
+    if regressed:
+        print(f"회귀: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
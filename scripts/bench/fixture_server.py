@@ -0,0 +1,154 @@
+"""벤치마크용 로컬 대역 HTTP 서버
+fixtures/ 의 기록본을 원래 호스트 대신 응답. install() 후에는 update_news 의
+전송 계층(Transport)과 urllib 의 https 요청이 http://127.0.0.1:<port>/<host><path>
+로 바뀌어 이 서버로 옴. keep-alive, Accept-Encoding: gzip 지원.
+
+    매일경제 RSS     www.mk.co.kr/rss/<code>/            → mk_<code>.xml
+    프리진경제       www.freezine.co.kr/news/articleList → freezine_<sc_section_code>.html
+    FRED            fred.stlouisfed.org/graph/fredgraph.csv?id=..&cosd=..
+                                                        → fred/<id>.csv 를 wide CSV 로 합침
+    CBOE            www.cboe.com/.../datahouse/<file>   → cboe_<file>
+    CNN F&G         production.dataviz.cnn.io/index/fearandgreed/graphdata
+                                                        → cnn_fear_greed.json
+"""
+import os
+import re
+import gzip
+import functools
+import threading
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def _read(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def fred_csv(ids, cosd):
+    """시리즈별 CSV → fredgraph 다중 시리즈 wide CSV (시작일 cosd 는 시리즈별)"""
+    cols = {}
+    for i, sid in enumerate(ids):
+        start = cosd[i] if i < len(cosd) else (cosd[-1] if cosd else '')
+        rows = _read(os.path.join('fred', f'{sid}.csv')).decode('utf-8').splitlines()[1:]
+        cols[sid] = dict(line.split(',', 1) for line in rows if line[:10] >= start)
+    dates = sorted(set().union(*(c.keys() for c in cols.values())))
+    lines = ['observation_date,' + ','.join(ids)]
+    for d in dates:
+        lines.append(d + ',' + ','.join(cols[sid].get(d, '') for sid in ids))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def route(host, path, query):
+    """(host, path, query dict) → (content-type, body), 없으면 None"""
+    try:
+        if host == 'www.mk.co.kr':
+            m = re.match(r'/rss/(\d+)/?$', path)
+            return m and ('application/rss+xml', _read(f'mk_{m.group(1)}.xml'))
+        if host == 'www.freezine.co.kr':
+            code = query.get('sc_section_code', [''])[0]
+            return 'text/html; charset=utf-8', _read(f'freezine_{code}.html')
+        if host == 'fred.stlouisfed.org' and path == '/graph/fredgraph.csv':
+            ids  = query.get('id', [''])[0].split(',')
+            cosd = query.get('cosd', [''])[0].split(',')
+            return 'text/csv', fred_csv(ids, cosd)
+        if host == 'www.cboe.com':
+            return 'text/csv', _read('cboe_' + path.rsplit('/', 1)[-1])
+        if host == 'production.dataviz.cnn.io':
+            return 'application/json', _read('cnn_fear_greed.json')
+    except OSError:
+        return None
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def _gzipped(body):
+    """압축본 캐시 (실제 서버·CDN 처럼 응답마다 다시 압축하지 않음)"""
+    return gzip.compress(body, compresslevel=6)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True      # 헤더·본문 분할 전송 시 지연 ACK 대기 방지
+
+    def do_GET(self):
+        host, _, rest = self.path.lstrip('/').partition('/')
+        parsed = urllib.parse.urlsplit('/' + rest)
+        hit = route(host, parsed.path, urllib.parse.parse_qs(parsed.query))
+        if hit is None:
+            self.send_error(404)
+            return
+        ctype, body = hit
+        self.server.hits += 1
+        self.send_response(200)
+        self.send_header('Content-Type', ctype)
+        if 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            body = _gzipped(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _RedirectHandler(urllib.request.BaseHandler):
+    """https://host/path → http://127.0.0.1:port/host/path (요청 전처리)"""
+    handler_order = 100
+
+    def __init__(self, base):
+        self.base = base
+
+    def https_request(self, req):
+        parts = urllib.parse.urlsplit(req.full_url)
+        req.full_url = f"{self.base}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+        return req
+
+
+def local_transport(module, port):
+    """module.Transport 의 대상 주소만 로컬 서버로 바꾼 전송 계층 (연결 풀·gzip 등은 그대로)"""
+    class LocalTransport(module.Transport):
+        def _target(self, url):
+            parts = urllib.parse.urlsplit(url)
+            path = f"/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else '')
+            return ('http', '127.0.0.1', port), path
+    return LocalTransport()
+
+
+class FixtureServer:
+    """with FixtureServer(update_news) as srv: ... — 시작 + 전송 계층·urllib opener 교체, 종료 시 복원"""
+
+    def __init__(self, module=None):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.httpd.hits = 0
+        self.port = self.httpd.server_address[1]
+        self.base = f"http://127.0.0.1:{self.port}"
+        self.module = module
+        self._saved = None
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def hits(self):
+        return self.httpd.hits
+
+    def install(self):
+        urllib.request.install_opener(urllib.request.build_opener(_RedirectHandler(self.base)))
+        if self.module is not None and hasattr(self.module, 'Transport'):
+            self._saved = self.module.TRANSPORT
+            self.module.TRANSPORT = local_transport(self.module, self.port)
+
+    def __enter__(self):
+        self._thread.start()
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        urllib.request.install_opener(None)
+        if self._saved is not None:
+            self.module.TRANSPORT = self._saved
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -1,35 +1,76 @@
 import os
 import re
 import sys
+import time
+import queue
+import threading
+import codecs
 import html as html_lib
+from html.parser import HTMLParser
+import bisect
+from collections import deque, namedtuple
+import hashlib
 import datetime
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import io
+import ssl
+import zlib
+import socket
+import http.client
+import urllib.error
+import urllib.parse
 import urllib.request
 import xml.etree.ElementTree as ET
 import json
+import gzip
+import signal
+import mmap
+import importlib
 
-try:
-    from bs4 import BeautifulSoup
-    BS4_OK = True
-except ImportError:
-    BS4_OK = False
 
-try:
-    import yfinance as yf
-except ImportError:
-    yf = None
+class _LazyModule:
+    """선택 의존성 지연 import: 첫 속성 접근이나 bool() 판정 때 import.
+    설치되지 않았으면 bool() 이 False (기존 `모듈 = None` 대체), 속성 접근은 ImportError.
+    뉴스만 갱신하는 실행은 yfinance/pandas 등 무거운 모듈을 아예 불러오지 않음.
+    """
 
-try:
-    from deep_translator import GoogleTranslator
-    def translate_ko(text):
-        if not text:
-            return text
-        try:
-            return GoogleTranslator(source='auto', target='ko').translate(text[:500]) or text
-        except Exception:
-            return text
-except ImportError:
-    def translate_ko(text):
-        return text
+    def __init__(self, name):
+        self._name = name
+        self._mod = None            # None=아직 안 불러옴, False=설치 안 됨
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._mod is None:
+            with self._lock:
+                if self._mod is None:
+                    try:
+                        self._mod = importlib.import_module(self._name)
+                    except ImportError:
+                        self._mod = False
+        return self._mod
+
+    def is_loaded(self):
+        """이미 import 됐는지 (import 를 일으키지 않음)"""
+        return bool(self._mod)
+
+    def __bool__(self):
+        return bool(self._load())
+
+    def __getattr__(self, attr):
+        mod = self._load()
+        if not mod:
+            raise ImportError(f"{self._name} 없음")
+        return getattr(mod, attr)
+
+
+lxml_html       = _LazyModule('lxml.html')
+yf              = _LazyModule('yfinance')
+pd              = _LazyModule('pandas')
+np              = _LazyModule('numpy')
+curl_requests   = _LazyModule('curl_cffi.requests')     # yfinance 권장 세션
+brotli          = _LazyModule('brotli')
+deep_translator = _LazyModule('deep_translator')
 
 # --- 설정 ---
 INDEX_HTML_PATH = 'index.html'
@@ -52,6 +93,131 @@ MK_RSS_SECTIONS = {
     '산업·IT': 'https://www.mk.co.kr/rss/50200011/',
 }
 
+# HTTP 전송: 호스트별 동시 요청 상한 / 유휴 연결 보관 수 / DNS 캐시(초) / 리다이렉트 횟수
+# MARKET_HTTP_MODE=record → 응답을 MARKET_HTTP_TAPE 에 기록, replay → 네트워크 없이 기록본으로 재생
+TRANSPORT_MAX_PER_HOST  = 4
+TRANSPORT_IDLE_PER_HOST = 4
+TRANSPORT_DNS_TTL       = 300
+TRANSPORT_MAX_REDIRECTS = 5
+TRANSPORT_MODE          = os.environ.get('MARKET_HTTP_MODE', '')
+TRANSPORT_TAPE_DIR      = os.environ.get('MARKET_HTTP_TAPE', os.path.join('.cache', 'tape'))
+TAPE_IGNORE_PARAMS      = ('cosd',)      # 실행마다 달라지는 쿼리 (FRED 시작일) → 기록 키에서 제외
+
+# HTTP 조건부 GET 캐시: 저장 위치 / 최대 용량 / 소스별 TTL(초, 이 안이면 요청 생략)
+# FRED 는 TTL 없음: 요청 여부는 발표 일정(FredSchedule)이 정하고, 요청하면 항상 원 서버에 조건부 GET
+HTTP_CACHE_DIR       = os.path.join('.cache', 'http')
+HTTP_CACHE_MAX_BYTES = 32 * 1024 * 1024
+HTTP_CACHE_TTL = {
+    'rss':      5 * 60,
+    'freezine': 10 * 60,
+    'cboe':     60 * 60,
+}
+
+# FRED 로컬 시계열 저장소 / 재수집 겹침 구간(일, 최근 개정치 반영용)
+FRED_STORE_DIR             = os.path.join('.cache', 'fred')
+FRED_REVISION_OVERLAP_DAYS = 100
+
+# FRED 발표 일정: 다음 관측값이 나올 때가 된 시리즈만 수집.
+# 주기 'M'(월간: 관측월 + 개월 수, 그 달 최소 발표일) / 'D'(매일) / 'B'(영업일: 관측일 + 일수)
+# 발표 시각은 UTC (미 동부 서머타임 기준, 표준시엔 1시간 늦음 → 발표 창으로 흡수)
+FRED_RELEASES = {
+    'FEDFUNDS': ('M', 1, 1,  (15, 0)),     # 전월 평균, 매월 첫 영업일
+    'CPIAUCSL': ('M', 1, 10, (12, 30)),    # BLS CPI 08:30 ET
+    'CPILFESL': ('M', 1, 10, (12, 30)),
+    'PCEPILFE': ('M', 1, 24, (12, 30)),    # BEA 개인소득·지출 08:30 ET (월말)
+    'PAYEMS':   ('M', 1, 1,  (12, 30)),    # 고용보고서 08:30 ET (첫째 금요일 전후)
+    'UNRATE':   ('M', 1, 1,  (12, 30)),
+    'RSAFS':    ('M', 1, 13, (12, 30)),    # Census 소매판매 08:30 ET
+    'UMCSENT':  ('M', 1, 8,  (14, 0)),     # UMich 10:00 ET (FRED 는 한 달 늦게 공개)
+    'DFF':      ('D', 1, None, (13, 0)),   # 전일 실효 연방기금금리
+    'DGS10':    ('B', 1, None, (0, 0)),    # H.15 — 다음 날 새벽(UTC)이면 반영
+    'T10Y2Y':   ('B', 1, None, (0, 0)),
+}
+FRED_RELEASE_WINDOW = datetime.timedelta(hours=2, minutes=30)  # 발표 시각부터 이 안의 실행은 항상 수집
+FRED_RECHECK        = datetime.timedelta(hours=3)    # 발표 예정일이 지났는데 아직 새 값이 없을 때 재확인 간격
+FRED_MAX_SKIP       = datetime.timedelta(days=7)     # 일정과 무관하게 이보다 오래 확인 안 했으면 수집 (개정치·일정 오차)
+
+# 경제지표 대시보드 상태 (PMI 수동값·분석 문장 포함 → 저장소에 커밋, ECON_DATA 는 이 파일로 생성)
+ECON_STATE_PATH = os.path.join('data', 'econ_state.json')
+
+# 변경 감지: 카드별 입력 데이터 지문 저장 위치 / 변경 없을 때 종료 코드 (워크플로 커밋 생략용)
+RENDER_STATE_PATH = os.path.join('.cache', 'render_state.json')
+EXIT_UNCHANGED    = 3
+
+# 게시: index.html 옆 압축본 (.gz/.br) + 영역별 바이트 예산 (초과 시 종료 코드 EXIT_OVER_BUDGET)
+PUBLISH_COMPRESSED = True
+PAGE_BUDGET = {
+    'index.html':       256 * 1024,
+    'VOLATILITY_CARD':   12 * 1024,
+    'ECON_DATA':         16 * 1024,
+    'MARKET_NEWS_CARD':  16 * 1024,
+}
+EXIT_OVER_BUDGET = 4
+
+# 번역 메모: 저장 위치 / 최대 항목 수 / 초당 요청 수 / 동시 요청 수
+TRANSLATE_CACHE_PATH  = os.path.join('.cache', 'translate.json')
+TRANSLATE_CACHE_MAX   = 2000
+TRANSLATE_RATE        = 4.0
+TRANSLATE_MAX_WORKERS = 4
+
+# 병렬 수집: 동시 작업 수 / 전체 벽시계 예산(초) / 소스별 마감(초)
+FETCH_MAX_WORKERS = 8
+FETCH_RUN_BUDGET  = 90.0
+FETCH_TIMEOUTS = {
+    'yf':      30.0,
+    'options': 30.0,
+    'rss':     12.0,
+    'cboe':    18.0,
+    'cnn':     18.0,
+    'fred':    25.0,
+}
+
+# 최근 정상값 스냅샷: 수집 실패·마감 초과 시 이 기간 안의 마지막 정상값으로 대체 (초)
+SNAPSHOT_PATH = os.path.join('.cache', 'snapshots.json')
+SNAPSHOT_MAX_AGE = {
+    'yf':      3 * 86400,
+    'options': 1 * 86400,
+    'rss':     3 * 86400,
+    'cboe':    3 * 86400,
+    'cnn':     2 * 86400,
+}
+
+# SPY 옵션 P/C: 만기 구간(이름, 최소·최대 남은 일수)별 가까운 만기 N개 / 체인·만기 목록 캐시 TTL(초)
+SPY_OPTION_BUCKETS    = (('1주 이내', 0, 7), ('1개월 이내', 8, 30), ('3개월 이내', 31, 90))
+SPY_OPTION_PER_BUCKET = 3
+OPTION_CACHE_DIR      = os.path.join('.cache', 'options')
+OPTION_CHAIN_TTL      = 15 * 60
+OPTION_EXPIRY_TTL     = 6 * 60 * 60
+OPTION_MAX_WORKERS    = 4
+
+# 갱신 영역 (--sections): 왼쪽 시장 카드 / 뉴스 카드 / 변동성 & 매크로 / 경제지표
+SECTIONS = ('left', 'news', 'volatility', 'econ')
+
+# daemon 모드(--daemon): 소스 그룹별 갱신 주기(초)
+DAEMON_INTERVALS = {
+    'prices':    5 * 60,
+    'sentiment': 15 * 60,
+    'rss':       10 * 60,
+    'fred':      60 * 60,
+}
+
+# 실행 지표: 실행마다 한 줄(JSON) 추가 / 보관 실행 수 / 요약 시 회귀 판정 (최근 N회 p50 이 이전 p50 의 배수 이상)
+METRICS_PATH          = os.path.join('.cache', 'metrics.jsonl')
+METRICS_MAX_RUNS      = 2000
+METRICS_RECENT_RUNS   = 5
+METRICS_REGRESS_RATIO = 1.5
+METRICS_REGRESS_MIN_S = 0.5
+
+# 실행 기록 보관: 실행마다 그 실행이 받은 시세(지수·섹터·Mag7·변동성 카드 티커)·P/C·공포탐욕 값을
+# 지표별 float64 파일에 한 행씩 추가. 시간별 행은 ARCHIVE_HOURLY_DAYS 일이 지나면 KST 날짜별 1행으로 축약
+# 스파크라인 구간(시간)·최대 점 수. 왼쪽 카드 시세는 07·22시(KST) 실행에서만 받으므로 (하루 2점)
+# 왼쪽 카드 지수 스파크라인은 24시간 대신 시간별 보관 구간 전체 (ARCHIVE_LEFT_SPARK_HOURS)
+ARCHIVE_DIR              = os.path.join('.cache', 'archive')
+ARCHIVE_HOURLY_DAYS      = 14
+ARCHIVE_SPARK_HOURS      = 24
+ARCHIVE_LEFT_SPARK_HOURS = ARCHIVE_HOURLY_DAYS * 24
+ARCHIVE_SPARK_POINTS     = 48
+
 def esc(text):
     return html_lib.escape(str(text))
 
@@ -70,26 +236,1372 @@ def truncate(text, n=90):
     text = re.sub(r'\s+', ' ', text).strip()
     return (text[:n] + '...') if len(text) > n else text
 
+# ─── 실행 지표 (JSONL) ────────────────────────────────────────────────────────
+
+def _item_count(value):
+    """수집 결과 → 항목 수 (리스트·dict·DataFrame 은 길이, (값, 날짜) 튜플은 값 유무)"""
+    if value is None:
+        return 0
+    if isinstance(value, tuple):
+        return int(bool(value) and value[0] is not None)
+    try:
+        return len(value)
+    except TypeError:
+        return 1
+
+
+class RunMetrics:
+    """한 번의 실행 기록: 소스별 소요·상태·항목 수·바이트, 단계별 소요, 캐시·전송 통계.
+    바이트는 수집 작업 스레드(fetch-<이름>) 기준으로 소스에 귀속.
+    캐시·전송 통계는 프로세스 누적값이라 생성 시점 값을 빼서 이번 실행분만 기록 (daemon 주기별).
+    write() 가 METRICS_PATH 에 JSON 한 줄로 추가.
+    """
+
+    def __init__(self, path=METRICS_PATH):
+        self.path    = path
+        self.started = time.time()
+        self._t0     = time.monotonic()
+        self.sources: dict = {}     # 이름 → {seconds, status, items, bytes}
+        self.stages:  dict = {}     # 이름 → seconds
+        self._bytes:  dict = {}     # 이름 → 받은 바이트 (작업 종료 전 누적)
+        self._lock = threading.Lock()
+        self._base = self._counters()
+
+    @staticmethod
+    def _counters():
+        """HTTP_CACHE·TRANSPORT 누적 통계 사본 (모듈 로드 중 아직 없으면 빈 값)"""
+        g = globals()
+        return json.loads(json.dumps({
+            'cache':     g['HTTP_CACHE'].stats if 'HTTP_CACHE' in g else {},
+            'transport': g['TRANSPORT'].stats if 'TRANSPORT' in g else {},
+        }))
+
+    def count_bytes(self, n):
+        name = threading.current_thread().name
+        if name.startswith('fetch-'):
+            with self._lock:
+                self._bytes[name[6:]] = self._bytes.get(name[6:], 0) + n
+
+    def source(self, name, seconds, status, value):
+        with self._lock:
+            self.sources[name] = {'seconds': round(seconds, 3), 'status': status,
+                                  'items': _item_count(value) if status in ('ok', 'stale') else 0,
+                                  'bytes': self._bytes.get(name, 0)}
+
+    def stage(self, name):
+        """with METRICS.stage('render'): ... — 단계 소요 기록"""
+        metrics = self
+
+        class _Stage:
+            def __enter__(self):
+                self.t0 = time.monotonic()
+
+            def __exit__(self, *exc):
+                metrics.stages[name] = round(time.monotonic() - self.t0, 3)
+        return _Stage()
+
+    def record(self, **extra):
+        with self._lock:
+            for name, st in self.sources.items():
+                st['bytes'] = self._bytes.get(name, st['bytes'])
+        rec = {
+            'ts':      datetime.datetime.fromtimestamp(self.started, datetime.timezone.utc)
+                                        .strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'total':   round(time.monotonic() - self._t0, 3),
+            'stages':  self.stages,
+            'sources': self.sources,
+            **_counter_delta(self._counters(), self._base),
+        }
+        rec.update(extra)
+        return rec
+
+    def write(self, **extra):
+        """이번 실행 기록을 JSONL 에 추가 (METRICS_MAX_RUNS 초과분은 오래된 것부터 삭제)"""
+        line = json.dumps(self.record(**extra), ensure_ascii=False, separators=(',', ':'))
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+        if os.path.getsize(self.path) > METRICS_MAX_RUNS * len(line) * 1.5:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            if len(lines) > METRICS_MAX_RUNS:
+                write_atomic(self.path, ''.join(lines[-METRICS_MAX_RUNS:]))
+
+
+METRICS = RunMetrics()
+
+
+def _counter_delta(now, base):
+    """중첩 카운터 dict 의 차이 (now - base, base 에 없는 키는 0 기준)"""
+    if isinstance(now, dict):
+        return {k: _counter_delta(v, (base or {}).get(k)) for k, v in now.items()}
+    return now - (base or 0)
+
+
+def _percentile(values, q):
+    """최근접 순위 백분위 (values 는 정렬된 리스트): ceil(q/100·n) 번째 값 (정수 연산, 반올림 오차 없음)"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, -(-q * len(values) // 100) - 1))]
+
+
+def summarize_metrics(path=METRICS_PATH, last=50):
+    """최근 last 회 실행 요약: 소스별 p50/p95/최대, 실패·마감 초과 수, 지연 회귀 표시"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        print(f"[지표] 기록 없음: {path}")
+        return 1
+    runs = runs[-last:]
+    if not runs:
+        print(f"[지표] 기록 없음: {path}")
+        return 1
+
+    totals = sorted(r['total'] for r in runs)
+    print(f"[지표] 최근 {len(runs)}회 ({runs[0]['ts']} ~ {runs[-1]['ts']}) · "
+          f"전체 p50 {_percentile(totals, 50):.1f}s p95 {_percentile(totals, 95):.1f}s")
+
+    names = sorted({n for r in runs for n in r.get('sources', {})})
+    rows = []
+    for name in names:
+        hist = [r['sources'][name] for r in runs if name in r.get('sources', {})]
+        secs = [h['seconds'] for h in hist]
+        srt  = sorted(secs)
+        fails = sum(h['status'] != 'ok' for h in hist)
+        kb    = sum(h.get('bytes', 0) for h in hist) / len(hist) / 1024
+        recent, before = sorted(secs[-METRICS_RECENT_RUNS:]), sorted(secs[:-METRICS_RECENT_RUNS])
+        flag = ''
+        if before:
+            r50, b50 = _percentile(recent, 50), _percentile(before, 50)
+            if r50 > b50 * METRICS_REGRESS_RATIO and r50 - b50 > METRICS_REGRESS_MIN_S:
+                flag = f"회귀 {b50:.2f}→{r50:.2f}s"
+        rows.append((_percentile(srt, 50), name, len(hist), _percentile(srt, 95), srt[-1], fails, kb, flag))
+
+    print(f"  {'소스':<20} {'회':>4} {'p50':>7} {'p95':>7} {'최대':>7} {'실패':>4} {'평균KB':>7}")
+    for p50, name, n, p95, mx, fails, kb, flag in sorted(rows, reverse=True):
+        print(f"  {name:<20} {n:>4} {p50:6.2f}s {p95:6.2f}s {mx:6.2f}s {fails:>4} {kb:7.1f}  {flag}")
+
+    stage_names = sorted({n for r in runs for n in r.get('stages', {})})
+    if stage_names:
+        parts = []
+        for name in stage_names:
+            secs = sorted(r['stages'][name] for r in runs if name in r.get('stages', {}))
+            parts.append(f"{name} p50 {_percentile(secs, 50):.2f}s p95 {_percentile(secs, 95):.2f}s")
+        print("  단계: " + ' · '.join(parts))
+    return 0
+
+# ─── 최근 정상값 스냅샷 ───────────────────────────────────────────────────────
+
+class SnapshotStore:
+    """소스별 마지막 정상 수집값 + 수집 시각 (JSON 파일 하나).
+    {이름: {'ts': epoch초, 'kind': 'json'|'tuple'|'frame', 'value': ...}}
+    DataFrame(가격 스냅샷)은 index 기준 dict 로 저장.
+    served: 이번 실행에서 스냅샷으로 대체한 소스 → 그 값의 수집 시각
+    """
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = path
+        self.served: dict = {}
+        self._data = None
+        self._dirty = False
+
+    def _load(self):
+        if self._data is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def put(self, name, value):
+        if pd.is_loaded() and isinstance(value, pd.DataFrame):
+            entry = {'kind': 'frame', 'value': value.to_dict('index')}
+        elif isinstance(value, tuple):
+            entry = {'kind': 'tuple', 'value': list(value)}
+        else:
+            entry = {'kind': 'json', 'value': value}
+        entry['ts'] = time.time()
+        self._load()[name] = entry
+        self._dirty = True
+
+    def get(self, name, max_age):
+        """max_age 초 이내의 정상값 → (값, 수집 시각), 없으면 None"""
+        entry = self._load().get(name)
+        if not entry or time.time() - entry['ts'] > max_age:
+            return None
+        kind, value = entry['kind'], entry['value']
+        if kind == 'frame':
+            if not pd:
+                return None
+            value = pd.DataFrame.from_dict(value, orient='index')
+        elif kind == 'tuple':
+            value = tuple(value)
+        return value, entry['ts']
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            write_atomic(self.path, json.dumps(self._data, ensure_ascii=False, separators=(',', ':')))
+            self._dirty = False
+        except OSError as e:
+            print(f"[스냅샷] 저장 실패: {e}")
+
+
+SNAPSHOTS = SnapshotStore()
+
+
+def kst_label(ts):
+    """epoch 초 → 'MM.DD HH:MM' (KST)"""
+    kst = datetime.datetime.fromtimestamp(ts, datetime.timezone.utc) + datetime.timedelta(hours=9)
+    return kst.strftime('%m.%d %H:%M')
+
+
+def stale_mark(stale):
+    """스냅샷 대체 표시 {소스: 수집 시각} → '⏱ MM.DD HH:MM 기준' (가장 오래된 값 기준), 없으면 ''"""
+    if not stale:
+        return ''
+    names = ', '.join(sorted(stale))
+    return (f'<span class="stale-mark" title="수집 실패 - 마지막 정상값 사용: {esc(names)}"'
+            f' style="color:#f59e0b;font-size:0.72rem;margin-left:6px;">'
+            f'⏱ {kst_label(min(stale.values()))} 기준</span>')
+
+# ─── 병렬 수집 오케스트레이터 ─────────────────────────────────────────────────
+
+class FetchTask:
+    """수집 그래프의 작업 단위.
+    fn(*의존 작업 결과) 를 실행. 예외·마감 초과 시 결과는 default 로 대체.
+    max_stale > 0 이면 정상값을 SNAPSHOTS 에 저장하고, 실패·빈 결과 시
+    max_stale 초 이내의 마지막 정상값으로 대체 (상태 'stale', 재시도 없음).
+    """
+    __slots__ = ('name', 'fn', 'deps', 'timeout', 'default', 'max_stale')
+
+    def __init__(self, name, fn, deps=(), timeout=20.0, default=None, max_stale=0):
+        self.name      = name
+        self.fn        = fn
+        self.deps      = tuple(deps)
+        self.timeout   = timeout
+        self.default   = default
+        self.max_stale = max_stale
+
+
+_FETCH_LOCAL = threading.local()
+
+
+def fetch_deadline():
+    """현재 스레드가 실행 중인 수집 작업의 마감 시각 (monotonic), 그래프 밖이면 None"""
+    return getattr(_FETCH_LOCAL, 'deadline', None)
+
+
+def run_fetch_graph(tasks, max_workers=FETCH_MAX_WORKERS, budget=FETCH_RUN_BUDGET):
+    """FetchTask 의존성 그래프를 최대 max_workers 개 스레드로 실행.
+    - 작업별 마감(task.timeout)과 전체 예산(budget) 중 먼저 오는 시점에 작업을 포기
+    - 포기한 작업은 데몬 스레드로 남겨두고 결과는 무시 (프로세스 종료를 막지 않음)
+    - 작업 안에서 fetch_deadline() 으로 자기 마감 시각 조회 (다른 작업 대기 등 상한용)
+    - 의존 작업이 실패해도 default 값을 인자로 받아 계속 진행
+    - max_stale 작업은 실패·빈 결과 시 스냅샷 값으로 대체 (status 'stale', 수집 시각은 SNAPSHOTS.served)
+    returns (results, status)  status[name] ∈ 'ok' | 'stale' | 'error' | 'timeout' | 'skipped'
+    """
+    by_name = {t.name: t for t in tasks}
+    for t in tasks:
+        for d in t.deps:
+            if d not in by_name:
+                raise ValueError(f"[FETCH] 알 수 없는 의존 작업: {t.name} → {d}")
+
+    results: dict = {}
+    status:  dict = {}
+    running: dict = {}          # name → 마감 시각 (monotonic)
+    started: dict = {}          # name → 시작 시각 (monotonic, 실행 지표용)
+    pending = list(tasks)
+    done_q: queue.Queue = queue.Queue()
+    t0 = time.monotonic()
+    run_deadline = t0 + budget
+
+    def _worker(task, args, deadline):
+        _FETCH_LOCAL.deadline = deadline
+        try:
+            done_q.put((task.name, True, task.fn(*args)))
+        except Exception as e:
+            done_q.put((task.name, False, e))
+
+    def _finish(name, state, value):
+        running.pop(name, None)
+        task = by_name[name]
+        if task.max_stale:
+            if state == 'ok' and _item_count(value):
+                SNAPSHOTS.put(name, value)
+                SNAPSHOTS.served.pop(name, None)
+            else:
+                snap = SNAPSHOTS.get(name, task.max_stale)
+                if snap is not None:
+                    value, SNAPSHOTS.served[name] = snap
+                    state = 'stale'
+                    print(f"[{name}] 마지막 정상값 사용 ({kst_label(snap[1])} 수집)")
+        status[name]  = state
+        results[name] = value
+        METRICS.source(name, time.monotonic() - started.get(name, time.monotonic()), state, value)
+
+    while pending or running:
+        now = time.monotonic()
+
+        # 실행 가능한 작업 시작 (의존 작업이 모두 끝난 것만)
+        if now < run_deadline:
+            for task in list(pending):
+                if len(running) >= max_workers:
+                    break
+                if all(d in status for d in task.deps):
+                    pending.remove(task)
+                    running[task.name] = min(now + task.timeout, run_deadline)
+                    started[task.name] = now
+                    args = [results[d] for d in task.deps]
+                    threading.Thread(target=_worker, args=(task, args, running[task.name]),
+                                     name=f'fetch-{task.name}', daemon=True).start()
+
+        if not running:
+            # 예산 소진 또는 순환 의존 → 남은 작업은 건너뜀
+            for task in pending:
+                _finish(task.name, 'skipped', task.default)
+            if pending:
+                print(f"[FETCH] 건너뜀: {', '.join(t.name for t in pending)}")
+            break
+
+        wait = max(0.0, min(running.values()) - time.monotonic())
+        try:
+            name, ok, value = done_q.get(timeout=wait)
+        except queue.Empty:
+            name = None
+        if name is not None and name in running:
+            if ok:
+                _finish(name, 'ok', value)
+            else:
+                print(f"[{name}] 실패: {value}")
+                _finish(name, 'error', by_name[name].default)
+
+        now = time.monotonic()
+        for rname, deadline in list(running.items()):
+            if deadline <= now:
+                print(f"[{rname}] 마감 초과 ({by_name[rname].timeout:g}s) - 건너뜀")
+                _finish(rname, 'timeout', by_name[rname].default)
+
+    SNAPSHOTS.save()
+    counts: dict = {}
+    for st in status.values():
+        counts[st] = counts.get(st, 0) + 1
+    print(f"[FETCH] {len(tasks)}개 작업 · " +
+          ' '.join(f"{k}={v}" for k, v in sorted(counts.items())) +
+          f" · {time.monotonic() - t0:.1f}s")
+    return results, status
+
+# ─── HTTP 전송 (keep-alive 연결 풀 + record/replay) ──────────────────────────
+
+class _TransportResponse:
+    """풀 연결의 응답. read/readline/반복/with 지원, gzip 본문은 읽는 대로 해제.
+    끝까지 읽고 닫으면 연결을 풀에 반환, 중간에 닫으면 연결 폐기.
+    """
+    CHUNK = 16384
+
+    def __init__(self, transport, key, conn, resp, url, tape=None):
+        self.status, self.reason = resp.status, resp.reason
+        self.headers, self.url = resp.headers, url
+        self._transport, self._key, self._conn, self._resp = transport, key, conn, resp
+        gz = (resp.headers.get('Content-Encoding') or '').lower() == 'gzip'
+        self._gz  = zlib.decompressobj(16 + zlib.MAX_WBITS) if gz else None
+        self._buf = bytearray()     # 해제된 본문 중 아직 안 읽은 부분은 _buf[_pos:]
+        self._pos = 0
+        self._eof = False
+        self._tape = tape           # record 모드: (기록 키, 본문 임시 파일)
+
+    def _fill(self):
+        """원시 본문 한 조각을 읽어 (해제 후) 버퍼에 추가. 끝이면 False"""
+        if self._eof:
+            return False
+        raw = self._resp.read(self.CHUNK)
+        METRICS.count_bytes(len(raw))
+        if not raw:
+            self._eof = True
+            data = self._gz.flush() if self._gz else b''
+        else:
+            data = self._gz.decompress(raw) if self._gz else raw
+        if data:
+            if self._pos and self._pos * 2 >= len(self._buf):
+                del self._buf[:self._pos]
+                self._pos = 0
+            self._buf += data
+            if self._tape:
+                self._tape[1].write(data)
+        return bool(raw) or bool(data)
+
+    def _take(self, end):
+        data = bytes(self._buf[self._pos:end])
+        self._pos = end
+        return data
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            while self._fill():
+                pass
+            return self._take(len(self._buf))
+        while len(self._buf) - self._pos < n and self._fill():
+            pass
+        return self._take(min(self._pos + n, len(self._buf)))
+
+    def readline(self):
+        scanned = 0                 # _pos 이후 이미 줄바꿈이 없음을 확인한 바이트 수
+        while True:
+            i = self._buf.find(b'\n', self._pos + scanned)
+            if i >= 0:
+                return self._take(i + 1)
+            scanned = len(self._buf) - self._pos
+            if not self._fill():
+                return self._take(len(self._buf))
+
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+    def close(self):
+        if self._resp is None:
+            return
+        if self._tape:
+            while self._fill():     # 기록본은 항상 전체 본문
+                self._buf.clear()
+                self._pos = 0
+        resp, self._resp = self._resp, None
+        reusable = self._eof and not resp.will_close
+        resp.close()
+        if self._tape:
+            self._transport.tape.commit(self.url, self.status, self.headers, self._tape)
+        self._transport._release(self._key, self._conn if reusable else None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _Tape:
+    """record/replay 저장소: <dir>/index.json {키: {url, status, headers}} + <키>.body"""
+
+    def __init__(self, tape_dir):
+        self.dir   = tape_dir
+        self._lock = threading.Lock()
+        self._index = None
+
+    def key(self, url):
+        parts = urllib.parse.urlsplit(url)
+        query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+                 if k not in TAPE_IGNORE_PARAMS]
+        norm = urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+        return hashlib.sha1(norm.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        if self._index is None:
+            try:
+                with open(os.path.join(self.dir, 'index.json'), 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def writer(self, url):
+        os.makedirs(self.dir, exist_ok=True)
+        key = self.key(url)
+        part = os.path.join(self.dir, f"{key}.{threading.get_ident()}.part")
+        return key, open(part, 'wb')
+
+    def commit(self, url, status, headers, tape):
+        key, f = tape
+        f.close()
+        with self._lock:
+            os.replace(f.name, os.path.join(self.dir, key + '.body'))
+            self._load()[key] = {'url': url, 'status': status,
+                                 'headers': [[k, v] for k, v in headers.items()
+                                             if k.lower() not in ('content-encoding', 'content-length',
+                                                                  'transfer-encoding')]}
+            tmp = os.path.join(self.dir, 'index.json.tmp')
+            with open(tmp, 'w', encoding='utf-8') as out:
+                json.dump(self._index, out)
+            os.replace(tmp, os.path.join(self.dir, 'index.json'))
+
+    def play(self, url):
+        """기록된 응답 → (status, headers, 본문 파일). 기록 없으면 URLError"""
+        key = self.key(url)
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None:
+            raise urllib.error.URLError(f"replay: 기록 없음 {url}")
+        headers = http.client.HTTPMessage()
+        for k, v in entry['headers']:
+            headers[k] = v
+        return entry['status'], headers, open(os.path.join(self.dir, key + '.body'), 'rb')
+
+
+class _ReplayResponse(io.BufferedReader):
+    """기록본 파일 + status/headers (네트워크 응답과 같은 인터페이스)"""
+
+    def __init__(self, status, headers, f, url):
+        super().__init__(io.FileIO(f.fileno(), closefd=False))
+        self._file = f
+        self.status, self.headers, self.url = status, headers, url
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+
+class _PooledHTTPSConnection(http.client.HTTPSConnection):
+    """TLS 세션을 호스트별로 보관해 다음 연결에서 재개 (전체 핸드셰이크 생략)"""
+
+    def __init__(self, transport, host, port, **kwargs):
+        super().__init__(host, port, **kwargs)
+        self._transport = transport
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+        tls = self._transport._tls
+        self.sock = self._context.wrap_socket(self.sock, server_hostname=self.host,
+                                              session=tls.get(self.host))
+        tls[self.host] = self.sock.session
+
+
+class Transport:
+    """모든 수집 요청이 거치는 HTTP 전송 계층.
+    - (scheme, host, port) 별 keep-alive 연결 풀, DNS 결과·TLS 세션 재사용
+    - Accept-Encoding: gzip 요청 + 응답 자동 해제
+    - 호스트별 동시 요청 상한 (세마포어, 응답을 닫을 때 반환)
+    - 리다이렉트 추적, 2xx 외 상태는 urllib.error.HTTPError (기존 호출부 예외 처리 유지)
+    - mode='record' / 'replay': 응답 기록 / 기록본 재생 (_Tape)
+    프록시 환경변수가 있으면 urllib 로 위임.
+    """
+
+    def __init__(self, max_per_host=TRANSPORT_MAX_PER_HOST, idle_per_host=TRANSPORT_IDLE_PER_HOST,
+                 mode=TRANSPORT_MODE, tape_dir=TRANSPORT_TAPE_DIR):
+        self.max_per_host  = max_per_host
+        self.idle_per_host = idle_per_host
+        self.mode  = mode if mode in ('record', 'replay') else ''
+        self.tape  = _Tape(tape_dir) if self.mode else None
+        self.stats = {'requests': 0, 'reused': 0, 'connects': 0, 'gzip': 0, 'retries': 0}
+        self._idle: dict = {}       # (scheme, host, port) → [유휴 연결]
+        self._sems: dict = {}       # (scheme, host, port) → BoundedSemaphore
+        self._dns: dict = {}        # (host, port) → (만료 시각, [sockaddr])
+        self._tls: dict = {}        # host → ssl.SSLSession
+        self._ctx   = ssl.create_default_context()
+        self._lock  = threading.Lock()
+        self._proxies = urllib.request.getproxies()
+
+    # ── 연결 ──
+    def _target(self, url):
+        """url → ((scheme, host, port), 요청 경로)"""
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == 'https' else 80)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        return (scheme, parts.hostname, port), path
+
+    def _resolve(self, host, port):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._dns.get((host, port))
+        if hit and hit[0] > now:
+            return hit[1]
+        addrs = [ai[4] for ai in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)]
+        with self._lock:
+            self._dns[(host, port)] = (now + TRANSPORT_DNS_TTL, addrs)
+        return addrs
+
+    def _create_connection(self, address, timeout=None, source_address=None):
+        host, port = address
+        err = None
+        for sockaddr in self._resolve(host, port):
+            try:
+                return socket.create_connection(sockaddr[:2], timeout, source_address)
+            except OSError as e:
+                err = e
+        raise err or OSError(f"연결 실패: {host}")
+
+    def _new_conn(self, key, timeout):
+        scheme, host, port = key
+        if scheme == 'https':
+            conn = _PooledHTTPSConnection(self, host, port, timeout=timeout, context=self._ctx)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        conn._create_connection = self._create_connection
+        with self._lock:
+            self.stats['connects'] += 1
+        return conn
+
+    def _checkout(self, key, timeout):
+        """유휴 연결 재사용 (없으면 새 연결) → (conn, 재사용 여부)"""
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+            if conn is not None:
+                self.stats['reused'] += 1
+        if conn is None:
+            return self._new_conn(key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _release(self, key, conn):
+        """응답 종료: 재사용 가능한 연결은 풀에 보관, 호스트 슬롯 반환"""
+        if conn is not None:
+            session = getattr(conn.sock, 'session', None)
+            if session is not None:
+                self._tls[key[1]] = session     # TLS 1.3 세션 티켓은 응답을 읽은 뒤에 도착
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.idle_per_host:
+                    idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+        self._sems[key].release()
+
+    def _slot(self, key, timeout):
+        with self._lock:
+            sem = self._sems.get(key)
+            if sem is None:
+                sem = self._sems[key] = threading.BoundedSemaphore(self.max_per_host)
+        if not sem.acquire(timeout=timeout):
+            raise urllib.error.URLError(f"{key[1]} 동시 요청 대기 초과")
+
+    # ── 공개 API ──
+    def open(self, url, headers=None, timeout=15):
+        """GET url → 응답 스트림 (with 문 지원). 2xx 외 상태는 HTTPError, 연결 오류는 URLError"""
+        if self.mode == 'replay':
+            with self._lock:
+                self.stats['requests'] += 1
+            status, hdrs, f = self.tape.play(url)
+            if status >= 300:
+                f.close()
+                raise urllib.error.HTTPError(url, status, 'replay', hdrs, None)
+            return _ReplayResponse(status, hdrs, f, url)
+
+        headers = dict(HEADERS, **(headers or {}))
+        if self.mode == 'record':
+            headers.pop('If-None-Match', None)        # 기록본은 항상 전체 본문
+            headers.pop('If-Modified-Since', None)
+
+        for _ in range(TRANSPORT_MAX_REDIRECTS + 1):
+            scheme = urllib.parse.urlsplit(url).scheme.lower()
+            if self._proxies.get(scheme):
+                # urllib 은 gzip 본문을 풀지 않으므로 Accept-Encoding 없이 요청
+                return urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout)
+            headers['Accept-Encoding'] = 'gzip'     # 연결 풀 경로는 _TransportResponse 가 해제
+            key, path = self._target(url)
+            self._slot(key, timeout)
+            try:
+                resp, conn = self._send(key, path, headers, timeout)
+            except BaseException:
+                self._sems[key].release()
+                raise
+            with self._lock:
+                self.stats['requests'] += 1
+
+            location = resp.headers.get('Location')
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                resp.read()
+                self._release(key, None if resp.will_close else conn)
+                url = urllib.parse.urljoin(url, location)
+                continue
+
+            tape = self.tape.writer(url) if self.mode == 'record' and resp.status < 300 else None
+            wrapped = _TransportResponse(self, key, conn, resp, url, tape)
+            if wrapped._gz is not None:
+                with self._lock:
+                    self.stats['gzip'] += 1
+            if not 200 <= resp.status < 300:
+                body = wrapped.read()
+                wrapped.close()
+                raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers,
+                                             io.BytesIO(body))
+            return wrapped
+        raise urllib.error.URLError(f"리다이렉트 초과: {url}")
+
+    def _send(self, key, path, headers, timeout):
+        """요청 전송 → (응답, 연결). 재사용 연결이 끊겨 있으면 새 연결로 한 번 재시도"""
+        conn, reused = self._checkout(key, timeout)
+        while True:
+            try:
+                conn.request('GET', path, headers=headers)
+                return conn.getresponse(), conn
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if not reused:
+                    raise
+                with self._lock:
+                    self.stats['retries'] += 1
+                conn, reused = self._new_conn(key, timeout), False
+
+    def summary(self):
+        st = self.stats
+        mode = f" · {self.mode}" if self.mode else ''
+        return (f"[HTTP 전송] 요청 {st['requests']} · 연결 재사용 {st['reused']} · "
+                f"새 연결 {st['connects']} · gzip {st['gzip']}{mode}")
+
+
+TRANSPORT = Transport()
+
+# ─── HTTP 캐시 (조건부 GET) ──────────────────────────────────────────────────
+
+class HttpCache:
+    """ETag / Last-Modified 기반 디스크 HTTP 캐시.
+    - TTL 이내: 네트워크 요청 없이 저장 본문 반환 (hit)
+    - TTL 경과: If-None-Match / If-Modified-Since 조건부 요청 → 304 면 저장 본문 재사용 (revalidated)
+    - 200: 본문·검증자 저장 (miss), 총 용량 초과 시 가장 오래 안 쓴 항목부터 제거
+    스레드 안전 (병렬 수집 작업에서 공유).
+    """
+    INDEX_NAME = 'index.json'
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES, ttl=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl       = dict(HTTP_CACHE_TTL if ttl is None else ttl)
+        self.stats: dict = {}          # source → {hit, revalidated, miss, bytes}
+        self._lock  = threading.Lock()
+        self._index = None             # key → {url, etag, last_modified, fetched_at, used_at, size}
+
+    # ── 내부 ──
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def _load(self):
+        if self._index is None:
+            try:
+                with open(self._path(self.INDEX_NAME), 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self._path(self.INDEX_NAME + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self._path(self.INDEX_NAME))
+
+    def _count(self, source, kind, nbytes=0):
+        st = self.stats.setdefault(source, {'hit': 0, 'revalidated': 0, 'miss': 0, 'bytes': 0})
+        st[kind]   += 1
+        st['bytes'] += nbytes
+
+    def _evict(self):
+        total = sum(e['size'] for e in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]['used_at']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)['size']
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _commit(self, key, url, part_path, headers, size, now, partial=False):
+        """받은 임시 파일을 캐시 항목으로 등록 (lock 보유 상태에서 호출).
+        partial=True: 호출자가 앞부분만 읽고 멈춘 본문 (피드 증분 파싱 등)
+        """
+        os.replace(part_path, self._path(key))
+        self._load()[key] = {'url': url, 'etag': headers.get('ETag'),
+                             'last_modified': headers.get('Last-Modified'),
+                             'fetched_at': now, 'used_at': now, 'size': size,
+                             'partial': partial}
+        self._evict()
+        self._save()
+
+    # ── 공개 API ──
+    def open(self, url, source, timeout=15, conditional=True, ttl=None, partial_ok=False):
+        """url 본문을 읽는 바이너리 스트림 반환 (with 문 / 줄 단위 반복 지원).
+        캐시 적중·304 → 저장 파일, 200 → 응답을 읽는 대로 캐시에 복사하는 스트림.
+        conditional=False → 캐시를 보지 않고 새로 요청 (저장은 함).
+        ttl → 소스 TTL 대신 사용 (0 이면 TTL 적중 없이 항상 원 서버에 조건부 요청).
+        앞부분만 저장된(partial) 항목은 partial_ok=True 인 호출자(모자라면 스스로 재요청)만 사용,
+        그 외에는 없는 것으로 보고 검증자 없이 전체를 새로 요청.
+        네트워크 오류는 예외 그대로 전달.
+        """
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        now = time.time()
+        if TRANSPORT.mode:              # record/replay 는 항상 전송 계층을 거침
+            conditional = False
+        with self._lock:
+            entry = self._load().get(key) if conditional else None
+            if entry and not os.path.exists(self._path(key)):
+                entry = None
+            if entry and entry.get('partial') and not partial_ok:
+                entry = None
+
+        if ttl is None:
+            ttl = self.ttl.get(source, 0)
+        if entry and now - entry['fetched_at'] < ttl:
+            with self._lock:
+                entry['used_at'] = now
+                self._count(source, 'hit')
+            return open(self._path(key), 'rb')
+
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            resp = TRANSPORT.open(url, headers, timeout=timeout)
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or not entry:
+                raise
+            with self._lock:
+                entry['fetched_at'] = entry['used_at'] = now
+                self._count(source, 'revalidated')
+                self._save()
+            return open(self._path(key), 'rb')
+
+        cacheable = bool(resp.headers.get('ETag') or resp.headers.get('Last-Modified')
+                         or self.ttl.get(source, 0))
+        return _CachingStream(self, resp, source, key, url, now, cacheable)
+
+    def fetch(self, url, source, timeout=15):
+        """url 본문(bytes) 반환. 네트워크 오류는 예외 그대로 전달."""
+        with self.open(url, source, timeout) as f:
+            return f.read()
+
+    def summary(self):
+        """소스별 캐시 적중 현황 한 줄 요약"""
+        parts = [f"{src} hit={st['hit']} 304={st['revalidated']} miss={st['miss']} "
+                 f"{st['bytes'] / 1024:.0f}KB"
+                 for src, st in sorted(self.stats.items())]
+        return '[HTTP 캐시] ' + (' · '.join(parts) if parts else '요청 없음')
+
+
+class _CachingStream:
+    """HTTP 응답을 읽는 대로 캐시 임시 파일(.part)에 복사하는 스트림.
+    닫을 때 캐시에 등록. 중간에 멈춘 경우 읽은 앞부분만 partial 항목으로 저장
+    (open(partial_ok=True) 로 읽는 피드 호출자만 사용, 모자라면 호출자가 conditional=False 로 재요청).
+    """
+
+    def __init__(self, cache, resp, source, key, url, now, cacheable):
+        self._cache, self._resp, self._source = cache, resp, source
+        self._key, self._url, self._now = key, url, now
+        self._headers = resp.headers
+        self._size, self._eof = 0, False
+        self._part = None
+        if cacheable:
+            os.makedirs(cache.cache_dir, exist_ok=True)
+            self._part_path = cache._path(f"{key}.{threading.get_ident()}.part")
+            self._part = open(self._part_path, 'wb')
+
+    def _take(self, data, eof):
+        self._size += len(data)
+        if self._part is not None:
+            self._part.write(data)
+        if eof:
+            self._eof = True
+        return data
+
+    def read(self, n=-1):
+        data = self._resp.read() if n is None or n < 0 else self._resp.read(n)
+        return self._take(data, n is None or n < 0 or not data)
+
+    def readline(self):
+        line = self._resp.readline()
+        return self._take(line, not line)
+
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+    def close(self):
+        if self._resp is None:
+            return
+        self._resp.close()
+        self._resp = None
+        cache = self._cache
+        with cache._lock:
+            cache._count(self._source, 'miss', self._size)
+            if self._part is not None:
+                self._part.close()
+                if self._size:
+                    cache._commit(self._key, self._url, self._part_path, self._headers,
+                                  self._size, self._now, partial=not self._eof)
+                else:
+                    os.remove(self._part_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+HTTP_CACHE = HttpCache()
+
+# ─── 번역 (메모 + 속도 제한) ──────────────────────────────────────────────────
+
+class RateLimiter:
+    """초당 rate 회 호출 제한 (토큰 버킷, 스레드 안전)"""
+
+    def __init__(self, rate, burst=1):
+        self.rate, self.burst = rate, burst
+        self._tokens = float(burst)
+        self._stamp  = time.monotonic()
+        self._lock   = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp  = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class GoogleBackend:
+    """deep_translator GoogleTranslator 번역기"""
+    name = 'google'
+
+    def __init__(self, target='ko'):
+        self.target = target
+
+    def translate(self, text):
+        return deep_translator.GoogleTranslator(source='auto', target=self.target).translate(text)
+
+
+class IdentityBackend:
+    """원문 그대로 반환 (번역 라이브러리 없음 / 오프라인 실행용)"""
+    name = 'identity'
+
+    def translate(self, text):
+        return text
+
+
+class Translator:
+    """번역 메모(원문 해시 → 번역문)를 디스크에 유지하는 번역기.
+    - 메모 적중 시 네트워크 없이 반환, 최대 max_entries 개 (가장 오래 안 쓴 것부터 제거)
+    - 미적중 원문은 중복 제거 후 속도 제한(RateLimiter) 아래 병렬 번역
+    - backend 교체 가능 (translate(text) 메서드만 있으면 됨), None 이면 첫 사용 때
+      deep_translator 유무로 GoogleBackend / IdentityBackend 선택
+    """
+
+    def __init__(self, backend, path=TRANSLATE_CACHE_PATH, max_entries=TRANSLATE_CACHE_MAX,
+                 rate=TRANSLATE_RATE, max_workers=TRANSLATE_MAX_WORKERS):
+        self._backend    = backend
+        self.path        = path
+        self.max_entries = max_entries
+        self.max_workers = max_workers
+        self.limiter     = RateLimiter(rate, burst=max_workers)
+        self.stats       = {'hit': 0, 'miss': 0, 'error': 0}
+        self._memo  = None
+        self._lock  = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = GoogleBackend() if deep_translator else IdentityBackend()
+        return self._backend
+
+    def _key(self, text):
+        raw = f"{self.backend.name}:{getattr(self.backend, 'target', '')}:{text}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        if self._memo is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._memo = dict(json.load(f))
+            except (OSError, ValueError):
+                self._memo = {}
+        return self._memo
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._memo, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def _translate_one(self, text):
+        self.limiter.acquire()
+        try:
+            return self.backend.translate(text) or None
+        except Exception:
+            return None
+
+    def translate_many(self, texts):
+        """원문 리스트 → 번역문 리스트 (실패한 항목은 원문 그대로)"""
+        srcs = [t[:500] if t else t for t in texts]
+        out: dict = {}
+        todo: dict = {}                      # key → 원문 (중복 제거)
+        with self._lock:
+            memo = self._load()
+            for src in srcs:
+                if not src:
+                    continue
+                key = self._key(src)
+                if key in memo:
+                    memo[key] = memo.pop(key)        # 최근 사용 → 끝으로
+                    out[src] = memo[key]
+                    self.stats['hit'] += 1
+                else:
+                    todo[key] = src
+
+        if todo:
+            items = list(todo.items())
+            if len(items) == 1 or self.max_workers <= 1:
+                results = [self._translate_one(src) for _, src in items]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as ex:
+                    results = list(ex.map(self._translate_one, [src for _, src in items]))
+            with self._lock:
+                memo = self._load()
+                for (key, src), res in zip(items, results):
+                    if res is None:
+                        self.stats['error'] += 1
+                        continue
+                    self.stats['miss'] += 1
+                    memo[key] = out[src] = res
+                while len(memo) > self.max_entries:
+                    memo.pop(next(iter(memo)))
+                try:
+                    self._save()
+                except OSError as e:
+                    print(f"[번역] 메모 저장 실패: {e}")
+
+        return [out.get(src, t) for src, t in zip(srcs, texts)]
+
+    def translate(self, text):
+        return self.translate_many([text])[0]
+
+
+TRANSLATOR = Translator(None)
+
+
+def translate_ko(text):
+    """한국어 번역 (메모 적중 시 네트워크 요청 없음, 실패 시 원문)"""
+    return TRANSLATOR.translate(text)
+
+# ─── 피드 파서 (RSS 2.0 / RSS 1.0 / Atom, 증분) ──────────────────────────────
+
+FEED_CHUNK = 8192
+
+
+def _local(tag):
+    """'{namespace}name' → 'name'"""
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _feed_record(elem):
+    """<item>/<entry> 요소 → {title, link, desc, date} (네임스페이스 무시)"""
+    title = link = desc = date = ''
+    for child in elem:
+        name = _local(child.tag)
+        text = (child.text or '').strip()
+        if name == 'title':
+            title = text
+        elif name == 'link':
+            href = child.get('href')
+            if href is None:                                   # RSS: <link>URL</link>
+                link = link or text
+            elif child.get('rel', 'alternate') == 'alternate':  # Atom: <link href=.../>
+                link = href
+            elif not link:
+                link = href
+        elif name in ('description', 'summary') or (name == 'content' and not desc):
+            desc = text
+        elif name == 'pubDate':
+            date = parse_rfc2822_date(text)
+        elif name in ('published', 'updated', 'date') and not date:
+            date = text[:10]                                   # ISO 8601 (Atom, dc:date)
+    return {'title': title, 'link': link, 'desc': desc, 'date': date}
+
+
+def parse_feed_stream(stream, count):
+    """바이너리 스트림을 XMLPullParser 로 증분 파싱해 기사 레코드를 count 개까지 생성.
+    count 개가 모이면 더 읽지 않음. 제목·링크 없는 항목은 건너뜀.
+    returns (records, complete)  complete=False → 문서 끝을 못 보고 본문이 끊김
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    records: list = []
+    complete = False
+
+    def drain():
+        for _, elem in parser.read_events():
+            if _local(elem.tag) in ('item', 'entry'):
+                rec = _feed_record(elem)
+                elem.clear()
+                if rec['title'] and rec['link'] and len(records) < count:
+                    records.append(rec)
+
+    with stream:
+        while len(records) < count:
+            chunk = stream.read(FEED_CHUNK)
+            if not chunk:
+                try:
+                    parser.close()
+                    complete = True
+                except ET.ParseError:
+                    pass
+                drain()
+                break
+            parser.feed(chunk)
+            drain()
+        else:
+            complete = True          # 필요한 만큼 채움
+    return records, complete
+
+
+def read_feed(url, count, source='rss', timeout=10):
+    """피드 URL → 정규화된 기사 레코드 리스트 (최대 count개, 증분 파싱)"""
+    records, complete = parse_feed_stream(HTTP_CACHE.open(url, source, timeout, partial_ok=True), count)
+    if not complete:
+        # 캐시에 앞부분만 저장돼 있던 본문 → 새로 전체 요청
+        records, _ = parse_feed_stream(
+            HTTP_CACHE.open(url, source, timeout, conditional=False), count)
+    return records
+
+# ─── HTML 기사 목록 추출 (사이트 프로필) ──────────────────────────────────────
+
+class SiteProfile:
+    """사이트별 기사 목록 추출 규칙. 정규식은 생성 시 한 번만 컴파일.
+    containers: 우선순위순 [(태그 or None, 속성, 정규식)] — 섹션 기사 목록 컨테이너
+    link_pattern: 기사 링크 href 정규식, date_pattern: 날짜(YYYY.MM.DD 등) 정규식
+    """
+
+    def __init__(self, base_url, containers, link_pattern,
+                 date_pattern=r'(\d{4})[.\-](\d{1,2})[.\-](\d{1,2})', min_title=8):
+        self.base_url   = base_url.rstrip('/')
+        self.containers = [(tag, attr, re.compile(pat, re.I)) for tag, attr, pat in containers]
+        self.link_re    = re.compile(link_pattern)
+        self.date_re    = re.compile(date_pattern)
+        self.min_title  = min_title
+
+    def is_container(self, tag, attrs):
+        """(tag, {속성}) 가 컨테이너 규칙 중 하나에 맞으면 그 우선순위(0~), 아니면 None"""
+        for rank, (ctag, attr, rx) in enumerate(self.containers):
+            if (ctag is None or ctag == tag) and rx.search(attrs.get(attr) or ''):
+                return rank
+        return None
+
+    def absolute(self, href):
+        if href.startswith('/'):
+            return self.base_url + href
+        if not href.startswith('http'):
+            return self.base_url + '/' + href.lstrip('/')
+        return href
+
+    def date_of(self, text):
+        m = self.date_re.search(text)
+        return f"{m.group(1)}-{m.group(2).zfill(2)}-{m.group(3).zfill(2)}" if m else ''
+
+    def collect(self, candidates, count):
+        """(title, href, date) 후보 → 제목 길이·중복 필터 후 최대 count개"""
+        out, seen = [], set()
+        for title, href, date in candidates:
+            if not title or len(title) < self.min_title:
+                continue
+            href = self.absolute(href)
+            if href in seen:
+                continue
+            seen.add(href)
+            out.append((title, href, date))
+            if len(out) >= count:
+                break
+        return out
+
+
+FREEZINE_PROFILE = SiteProfile(
+    base_url='https://www.freezine.co.kr',
+    # 한국 뉴스 CMS 공통 패턴: #section-list, .list-block, .article-list 등
+    containers=[
+        (None,  'id',    r'^section-list$'),
+        (None,  'id',    r'^article-list$'),
+        ('div', 'class', r'(article|news)[_\-]?list|list[_\-]?body'),
+        ('ul',  'class', r'(article|news)[_\-]?list'),
+    ],
+    link_pattern=r'articleView\.html\?idxno=',
+)
+
+
+def extract_listing_lxml(profile, html, count):
+    """lxml(C 파서)로 전체 문서 파싱 → [(title, href, date)], 컨테이너 발견 여부"""
+    doc = lxml_html.fromstring(html)
+    container = None
+    for rank in range(len(profile.containers)):
+        for el in doc.iter():
+            if isinstance(el.tag, str) and profile.is_container(el.tag, el.attrib) == rank:
+                container = el
+                break
+        if container is not None:
+            break
+
+    def links(root):
+        return [a for a in root.iter('a') if profile.link_re.search(a.get('href', ''))]
+
+    if container is not None:
+        a_tags = links(container)
+    else:
+        a_tags = [a for li in doc.iter('li') for a in links(li)]
+        if not a_tags:
+            a_tags = links(doc)
+
+    def candidates():
+        for a in a_tags:
+            title = ''.join(t.strip() for t in a.itertext())
+            parent = next(a.iterancestors('li'), None)
+            if parent is None:
+                parent = next(a.iterancestors('div'), None)
+            date = profile.date_of(' '.join(parent.itertext())) if parent is not None else ''
+            yield title, a.get('href', ''), date
+
+    return profile.collect(candidates(), count), container is not None
+
+
+class _ListingParser(HTMLParser):
+    """표준 라이브러리 HTMLParser 기반 증분 추출기.
+    컨테이너 안에서 중복 없는 기사 링크 count개(날짜 포함)를 찾으면 done=True.
+    컨테이너가 없으면 문서 끝에서 <li> 안 링크 → 전체 링크 순으로 대체.
+    """
+    VOID = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+            'link', 'meta', 'param', 'source', 'track', 'wbr'}
+
+    def __init__(self, profile, count):
+        super().__init__(convert_charrefs=True)
+        self.profile, self.count = profile, count
+        self.stack: list = []        # [tag, 컨테이너 우선순위 or None, 텍스트 조각 리스트 or None]
+        self.records: list = []      # {title, href, date, done, container, in_li}
+        self.anchor = None
+        self.best_rank = None        # 지금까지 본 가장 우선순위 높은 컨테이너
+        self.done = False
+
+    def _close_top(self):
+        tag, _, buf = self.stack.pop()
+        if buf is not None:
+            text = ' '.join(buf)
+            for rec in self.records:
+                if rec['owner'] is buf:
+                    rec['date'], rec['owner'] = self.profile.date_of(text), None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID:
+            return
+        if tag == 'li':
+            # 닫히지 않은 <li> 는 같은 목록의 다음 <li> 에서 닫힘
+            for i in range(len(self.stack) - 1, -1, -1):
+                if self.stack[i][0] in ('ul', 'ol'):
+                    break
+                if self.stack[i][0] == 'li':
+                    while len(self.stack) > i:
+                        self._close_top()
+                    break
+        attr_map = dict(attrs)
+        rank = self.profile.is_container(tag, attr_map)
+        if rank is not None and (self.best_rank is None or rank < self.best_rank):
+            self.best_rank = rank
+        self.stack.append([tag, rank, [] if tag in ('li', 'div') else None])
+        if tag == 'a' and self.profile.link_re.search(attr_map.get('href') or ''):
+            self.anchor = {'href': attr_map.get('href') or '', 'title': []}
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self.anchor is not None:
+            owner = next((e[2] for e in reversed(self.stack) if e[0] == 'li'), None)
+            if owner is None:
+                owner = next((e[2] for e in reversed(self.stack) if e[0] == 'div'), None)
+            self.records.append({
+                'title': ''.join(self.anchor['title']), 'href': self.anchor['href'],
+                'date': '', 'owner': owner,
+                'container': min((e[1] for e in self.stack if e[1] is not None), default=None),
+                'in_li': any(e[0] == 'li' for e in self.stack),
+            })
+            self.anchor = None
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                while len(self.stack) > i:
+                    self._close_top()
+                break
+        if tag in ('li', 'div') and self.best_rank == 0:
+            self.done = self._enough()
+
+    def handle_data(self, data):
+        text = data.strip()
+        if not text:
+            return
+        if self.anchor is not None:
+            self.anchor['title'].append(text)
+        for e in self.stack:
+            if e[2] is not None:
+                e[2].append(data)
+
+    def _enough(self):
+        """최우선 컨테이너 안에서 날짜까지 확정된 기사가 count개 모였는지"""
+        got = self.profile.collect(
+            ((r['title'], r['href'], r['date']) for r in self.records
+             if r['container'] == 0 and r['owner'] is None), self.count)
+        return len(got) >= self.count
+
+    def result(self):
+        """(title, href, date) 목록, 컨테이너 발견 여부"""
+        while self.stack:
+            self._close_top()
+        recs = self.records
+        if self.best_rank is not None:
+            recs = [r for r in recs if r['container'] == self.best_rank]
+        else:
+            recs = [r for r in recs if r['in_li']] or recs
+        return (self.profile.collect(((r['title'], r['href'], r['date']) for r in recs), self.count),
+                self.best_rank is not None)
+
+
+def extract_listing_incremental(profile, stream, count, chunk=FEED_CHUNK):
+    """바이너리 스트림을 조각씩 HTMLParser 에 넣다가 기사 count개가 확정되면 읽기 중단"""
+    parser = _ListingParser(profile, count)
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with stream:
+        while not parser.done:
+            data = stream.read(chunk)
+            if not data:
+                parser.feed(decoder.decode(b'', final=True))
+                break
+            parser.feed(decoder.decode(data))
+    return parser.result()
+
+
+def extract_listing(profile, stream, count):
+    """lxml 있으면 C 파서로 한 번에, 없으면 증분 파서로 필요한 만큼만 읽어 추출"""
+    if lxml_html:
+        with stream:
+            html = stream.read().decode('utf-8', errors='replace')
+        return extract_listing_lxml(profile, html, count)
+    return extract_listing_incremental(profile, stream, count)
+
 # ─── 뉴스 수집 ────────────────────────────────────────────────────────────────
 
 def fetch_rss_news(url, count, source_name, source_url, do_translate=False):
-    """범용 RSS 뉴스 수집 함수"""
+    """범용 피드(RSS 2.0 / Atom) 뉴스 수집 함수"""
     arts = []
     try:
-        req = urllib.request.Request(url, headers=HEADERS)
-        with urllib.request.urlopen(req, timeout=10) as r:
-            root = ET.fromstring(r.read())
-        for item in root.findall('.//item')[:count]:
-            title = (item.findtext('title') or '').strip()
-            link  = (item.findtext('link')  or '').strip()
-            desc  = truncate((item.findtext('description') or '').strip())
-            date  = parse_rfc2822_date(item.findtext('pubDate') or '')
-            if title and link:
-                arts.append({
-                    'title': translate_ko(title) if do_translate else title,
-                    'link': link, 'desc': desc, 'date': date,
-                    'source': source_name, 'source_url': source_url
-                })
+        for rec in read_feed(url, count, 'rss', timeout=10):
+            arts.append({
+                'title': rec['title'],
+                'link': rec['link'], 'desc': truncate(rec['desc']), 'date': rec['date'],
+                'source': source_name, 'source_url': source_url
+            })
+        if do_translate and arts:
+            # 제목을 한 번에 번역 (메모 적중분은 요청 없음)
+            for a, ko in zip(arts, TRANSLATOR.translate_many([a['title'] for a in arts])):
+                a['title'] = ko
         print(f"[{source_name}] {len(arts)}건 로드")
     except Exception as e:
         print(f"[{source_name}] 실패: {e}")
@@ -105,7 +1617,7 @@ def get_yahoo_finance_news(count=3):
 
 
 def get_freezine_section_news(section_code, count=3, source_name='프리진경제'):
-    """프리진경제 섹션 HTML 스크래핑 (BeautifulSoup)
+    """프리진경제 섹션 기사 목록 추출 (FREEZINE_PROFILE, lxml 또는 증분 파서)
     URL: https://www.freezine.co.kr/news/articleList.html?sc_section_code=S1N1&view_type=sm
     섹션 전용 기사 목록만 추출 (상단 featured/인기 기사 제외)
     """
@@ -113,68 +1625,11 @@ def get_freezine_section_news(section_code, count=3, source_name='프리진경
            f"?sc_section_code={section_code}&view_type=sm")
     source_url = "https://www.freezine.co.kr"
     arts = []
-    seen_links = set()
-
-    if not BS4_OK:
-        print(f"[{source_name}] BeautifulSoup 없음, 건너뜀")
-        return arts
 
     try:
-        req = urllib.request.Request(url, headers=HEADERS)
-        with urllib.request.urlopen(req, timeout=15) as r:
-            html = r.read().decode('utf-8', errors='replace')
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # ── 섹션 전용 기사 목록 컨테이너 탐색 ──────────────────────────────
-        # 한국 뉴스 CMS 공통 패턴: #section-list, .list-block, .article-list 등
-        # featured/인기 기사는 보통 다른 div에 있고 <li> 목록이 섹션 기사
-        container = (
-            soup.find(id='section-list') or          # <section id="section-list"> 포함
-            soup.find(id='article-list') or
-            soup.find('div', class_=re.compile(r'(article|news)[_\-]?list|list[_\-]?body', re.I)) or
-            soup.find('ul',  class_=re.compile(r'(article|news)[_\-]?list', re.I))
-        )
-
-        # 컨테이너 내 <li> 기사 링크 우선 (섹션 목록은 보통 <li> 구조)
-        if container:
-            a_tags = container.find_all('a', href=re.compile(r'articleView\.html\?idxno='))
-        else:
-            # 컨테이너를 못 찾으면 전체 <li> 안의 링크만 추출
-            a_tags = []
-            for li in soup.find_all('li'):
-                for a in li.find_all('a', href=re.compile(r'articleView\.html\?idxno=')):
-                    a_tags.append(a)
-            # 그래도 없으면 전체 페이지 (마지막 fallback)
-            if not a_tags:
-                a_tags = soup.find_all('a', href=re.compile(r'articleView\.html\?idxno='))
-
-        for a_tag in a_tags:
-            title = a_tag.get_text(strip=True)
-            href  = a_tag.get('href', '')
-
-            # 너무 짧은 텍스트(네비·버튼 등) 제외
-            if not title or len(title) < 8:
-                continue
-
-            # 절대 URL 변환
-            if href.startswith('/'):
-                href = 'https://www.freezine.co.kr' + href
-            elif not href.startswith('http'):
-                href = 'https://www.freezine.co.kr/' + href.lstrip('/')
-
-            if href in seen_links:
-                continue
-            seen_links.add(href)
-
-            # 날짜: 부모 <li> 또는 <div> 안에서 YYYY.MM.DD / YYYY-MM-DD 패턴
-            date = ''
-            parent = a_tag.find_parent('li') or a_tag.find_parent('div')
-            if parent:
-                m = re.search(r'(\d{4})[.\-](\d{1,2})[.\-](\d{1,2})', parent.get_text(' '))
-                if m:
-                    date = f"{m.group(1)}-{m.group(2).zfill(2)}-{m.group(3).zfill(2)}"
-
+        found, has_container = extract_listing(
+            FREEZINE_PROFILE, HTTP_CACHE.open(url, 'freezine', timeout=15), count)
+        for title, href, date in found:
             arts.append({
                 'title': title,
                 'link':  href,
@@ -183,10 +1638,7 @@ def get_freezine_section_news(section_code, count=3, source_name='프리진경
                 'source': source_name,
                 'source_url': source_url
             })
-            if len(arts) >= count:
-                break
-
-        print(f"[{source_name}] {len(arts)}건 로드 (container={'found' if container else 'fallback'})")
+        print(f"[{source_name}] {len(arts)}건 로드 (container={'found' if has_container else 'fallback'})")
     except Exception as e:
         print(f"[{source_name}] 실패: {e}")
 
@@ -204,9 +1656,7 @@ def get_cboe_pc_ratio(filename):
     """CBOE Put/Call 비율 CSV (공개 데이터, 무료)"""
     url = f"https://www.cboe.com/publishing/scheduledtask/mktdata/datahouse/{filename}"
     try:
-        req = urllib.request.Request(url, headers=HEADERS)
-        with urllib.request.urlopen(req, timeout=15) as r:
-            content = r.read().decode('utf-8', errors='replace')
+        content = HTTP_CACHE.fetch(url, 'cboe', timeout=15).decode('utf-8', errors='replace')
         lines = [l.strip() for l in content.strip().split('\n') if l.strip()]
         for line in reversed(lines):
             parts = line.split(',')
@@ -224,124 +1674,472 @@ def get_cboe_pc_ratio(filename):
     return None, None
 
 
-def get_fred_latest(series_id, units=None):
-    """FRED 공개 CSV에서 최신값 (API 키 불필요)
-    예: DFF(Fed금리), CPIAUCSL(CPI), UNRATE(실업률)
-    units='pc1' → YoY % 수동 계산 (FRED URL 파라미터 무시됨)
-    units='ch1' → MoM 절대 변화 수동 계산
-    """
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
-    try:
-        req = urllib.request.Request(url, headers=HEADERS)
-        with urllib.request.urlopen(req, timeout=15) as r:
-            content = r.read().decode('utf-8', errors='replace')
-        lines: list = [l.strip() for l in content.strip().split('\n') if l.strip()]
-
-        # 원시값 파싱 (날짜별 dict, 첫줄 헤더 스킵)
-        monthly: dict = {}
-        for i, line in enumerate(lines):
-            if i == 0:
-                continue  # 헤더 스킵
-            parts = line.split(',')
-            if len(parts) >= 2 and parts[1].strip() not in ('', '.'):
-                try:
-                    date_str = parts[0].strip()[:7]  # YYYY-MM
-                    monthly[date_str] = float(parts[1].strip())
-                except ValueError:
-                    continue
+FRED_CSV_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv?id={ids}"
 
-        if not monthly:
-            return None, None
+# ── 시계열 변환 엔진 (NumPy) ──
+# 월 번호 = 1970-01 기준 개월 수 (datetime64[M] 정수값). 모든 연산은 배열 단위.
 
-        sorted_months = sorted(monthly.keys())
-        latest_mo     = sorted_months[-1]
-        latest_val    = monthly[latest_mo]
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
 
-        if units == 'pc1':
-            # YoY % = (현재 / 1년전 - 1) * 100
-            yr_ago = f"{int(latest_mo[:4]) - 1}{latest_mo[4:]}"
-            if yr_ago in monthly and monthly[yr_ago] != 0:
-                yoy = (latest_val / monthly[yr_ago] - 1) * 100
-                return float(f"{yoy:.2f}"), latest_mo
-            return None, None
 
-        elif units == 'ch1':
-            # MoM 절대 변화
-            if len(sorted_months) >= 2:
-                prev_val = monthly[sorted_months[-2]]
-                chg = latest_val - prev_val
-                return float(f"{chg:.2f}"), latest_mo
-            return None, None
+def month_label(m):
+    """월 번호 → 'YYYY-MM'"""
+    y, mo = divmod(int(m), 12)
+    return f"{1970 + y:04d}-{mo + 1:02d}"
 
-        else:
-            return latest_val, latest_mo
 
-    except Exception as e:
-        print(f"[FRED {series_id}] 실패: {e}")
-    return None, None
+def units_pad(units):
+    """변환에 필요한 앞쪽 여유 개월 수 (pc1 은 1년전 동월, ch1/pch 는 전월, maN 은 N-1개월)"""
+    if units == 'pc1':
+        return 13
+    if units in ('pch', 'ch1'):
+        return 1
+    if units and units.startswith('ma'):
+        return int(units[2:]) - 1
+    return 0
 
 
-def get_fred_history(series_id, months=24, units=None):
-    """FRED 공개 CSV에서 히스토리 데이터 (API 키 불필요).
-    FRED CSV URL의 units 파라미터는 무시될 수 있으므로 수동 계산:
-      units='pc1': YoY 퍼센트 변화 = (현재/1년전 - 1) * 100
-      units='ch1': MoM 절대 변화  = 현재 - 전월  (비농업고용 등)
-      units=None : 원시값 그대로
-    returns list of (YYYY-MM, float) tuples, 최근 months개월
+def resample_monthly(dates, vals, how='last'):
+    """날짜순 관측값(서수일 배열, 값 배열) → 월별 집계 (months, values).
+    how: 'last'(월말값) | 'mean'(월평균) | 'first'(월초값)
     """
-    # pc1 계산을 위해 12개월치 여분 수집
-    fetch_extra = 13 if units == 'pc1' else 2 if units == 'ch1' else 0
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
-    try:
-        req = urllib.request.Request(url, headers=HEADERS)
-        with urllib.request.urlopen(req, timeout=20) as r:
-            content = r.read().decode('utf-8', errors='replace')
-        monthly: dict = {}
-        for line in content.strip().split('\n')[1:]:   # 헤더 스킵
-            parts = line.strip().split(',')
-            if len(parts) >= 2 and parts[1].strip() not in ('', '.'):
-                try:
-                    month = parts[0].strip()[:7]       # YYYY-MM
-                    monthly[month] = float(parts[1].strip())
-                except ValueError:
-                    pass
+    d = np.asarray(dates, dtype=np.int64) - _EPOCH_ORDINAL
+    v = np.asarray(vals, dtype=np.float64)
+    months = d.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    if not len(months):
+        return months, v
+    starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    ends   = np.r_[starts[1:], len(v)]
+    if how == 'mean':
+        out = np.add.reduceat(v, starts) / (ends - starts)
+    elif how == 'first':
+        out = v[starts]
+    elif how == 'last':
+        out = v[ends - 1]
+    else:
+        raise ValueError(f"알 수 없는 월 집계 방식: {how}")
+    return months[starts], out
+
+
+def transform_series(months, values, units=None):
+    """월별 배열 변환 → (months, values)
+    'pc1': YoY % = (현재/1년전 동월 - 1)*100   (1년전 동월 없는 달은 제외)
+    'pch': MoM % = (현재/전월 - 1)*100        (직전 달이 비어 있으면 제외)
+    'ch1': 직전 관측월 대비 절대 변화 (비농업고용 등 월간 순변화)
+    'maN': N개월 이동평균
+    None : 원시값
+    """
+    if units in ('pc1', 'pch'):
+        lag  = 12 if units == 'pc1' else 1
+        n    = len(months)
+        idx  = np.searchsorted(months, months - lag)
+        idxc = np.minimum(idx, max(n - 1, 0))
+        base = values[idxc]
+        ok   = (idx < n) & (months[idxc] == months - lag) & (base != 0)
+        return months[ok], (values[ok] / base[ok] - 1) * 100
+    if units == 'ch1':
+        return months[1:], np.diff(values)
+    if units and units.startswith('ma'):
+        w = int(units[2:])
+        if len(values) < w:
+            return months[:0], values[:0]
+        c = np.cumsum(np.r_[0.0, values])
+        return months[w - 1:], (c[w:] - c[:-w]) / w
+    if units:
+        raise ValueError(f"알 수 없는 변환: {units}")
+    return months, values
+
+
+# 일간 시리즈 (월간 시리즈와 같은 wide CSV 로 받으면 빈 칸만 늘어나므로 따로 묶음)
+FRED_DAILY_SERIES = {'DFF', 'DGS10', 'T10Y2Y'}
+
+# 호출자별 필요 관측 개월 수 (FRED_SERIES_CFG 외 시리즈). 없으면 전체 기간 요청
+FRED_EXTRA_WINDOWS = {'DFF': 2, 'CPIAUCSL': 14, 'UNRATE': 2}
+FRED_RELEASE_LAG   = 3                         # 최신 관측월은 발표 지연으로 오늘보다 1~2개월 전
+FRED_FULL_START    = '1900-01-01'
+
+
+def fred_window_months(series_id):
+    """시리즈 수집 시 필요한 관측 개월 수 (변환 여유분 포함), 모르면 None"""
+    need = [months + units_pad(units)
+            for _, sid, units, months, _ in FRED_SERIES_CFG if sid == series_id]
+    if series_id in FRED_EXTRA_WINDOWS:
+        need.append(FRED_EXTRA_WINDOWS[series_id])
+    return max(need) if need else None
+
+
+def iter_csv_rows(stream, encoding='utf-8'):
+    """바이너리 스트림에서 CSV 를 한 줄씩 읽어 필드 리스트로 반환 (본문 전체를 줄 리스트로 만들지 않음)"""
+    for raw in stream:
+        line = raw.decode(encoding, errors='replace').strip()
+        if line:
+            yield line.split(',')
+
+
+class FredStore:
+    """시리즈별 array 파일 저장소 (<SID>.dates: int32 서수일, <SID>.vals: float64).
+    새 관측값은 파일 끝에 덧붙이고, 겹치는 구간(개정치)은 그 지점부터 잘라낸 뒤 다시 쓴다.
+    두 파일을 다 쓴 뒤 <SID>.sum 에 {n, crc} 를 기록 — 불러올 때 맞지 않으면 (두 파일 사이에서
+    중단되어 날짜·값 짝이 어긋났을 수 있음) 둘 다 버리고 전체를 다시 받음.
+    """
+    DATE_TYPE, VAL_TYPE = 'i', 'd'
+
+    def __init__(self, store_dir=FRED_STORE_DIR):
+        self.store_dir = store_dir
+        self._mem: dict = {}        # series_id → (dates array, vals array)
+
+    def _paths(self, series_id):
+        base = os.path.join(self.store_dir, series_id)
+        return base + '.dates', base + '.vals'
+
+    def _sum_path(self, series_id):
+        return os.path.join(self.store_dir, series_id + '.sum')
 
-        sorted_months = list(sorted(monthly.keys()))
-
-        if units == 'pc1':
-            # YoY 퍼센트 변화: (현재값 / 1년전값 - 1) * 100
-            result: list = []
-            for mo in sorted_months:
-                yr_ago = f"{int(mo[:4]) - 1}{mo[4:]}"   # 1년전 동월
-                if yr_ago in monthly and monthly[yr_ago] != 0:
-                    yoy = (monthly[mo] / monthly[yr_ago] - 1) * 100
-                    result.append((mo, float(f"{yoy:.2f}")))
-            n = len(result)
-            start = max(0, n - months) if months else 0
-            return [result[i] for i in range(start, n)]
-
-        elif units == 'ch1':
-            # MoM 절대 변화: 현재 - 전월 (비농업고용 등 월간 순변화)
-            result2: list = []
-            for i in range(1, len(sorted_months)):
-                mo   = sorted_months[i]
-                prev = sorted_months[i - 1]
-                chg  = monthly[mo] - monthly[prev]
-                result2.append((mo, float(f"{chg:.2f}")))
-            n2 = len(result2)
-            start2 = max(0, n2 - months) if months else 0
-            return [result2[i] for i in range(start2, n2)]
+    @staticmethod
+    def _checksum(dates, vals):
+        return {'n': len(dates), 'crc': zlib.crc32(vals.tobytes(), zlib.crc32(dates.tobytes()))}
 
+    def load(self, series_id):
+        """(dates, vals) array 쌍. 저장된 것이 없으면 빈 배열"""
+        if series_id in self._mem:
+            return self._mem[series_id]
+        dates, vals = array(self.DATE_TYPE), array(self.VAL_TYPE)
+        dpath, vpath = self._paths(series_id)
+        try:
+            with open(dpath, 'rb') as f:
+                dates.frombytes(f.read())
+            with open(vpath, 'rb') as f:
+                vals.frombytes(f.read())
+        except (OSError, ValueError):
+            dates, vals = array(self.DATE_TYPE), array(self.VAL_TYPE)
+        try:
+            with open(self._sum_path(series_id), 'r', encoding='utf-8') as f:
+                ok = json.load(f) == self._checksum(dates, vals)
+        except (OSError, ValueError):
+            ok = len(dates) == len(vals)       # 체크섬 이전에 만든 저장소: 길이만 확인
+        if not ok:
+            if dates or vals:
+                print(f"[FRED] {series_id}: 저장소 날짜·값 불일치 → 버리고 전체 재수집")
+            dates, vals = array(self.DATE_TYPE), array(self.VAL_TYPE)
+        self._mem[series_id] = (dates, vals)
+        return dates, vals
+
+    def last_date(self, series_id):
+        dates, _ = self.load(series_id)
+        return datetime.date.fromordinal(dates[-1]) if dates else None
+
+    def merge(self, series_id, obs):
+        """날짜순 [(YYYY-MM-DD, float), ...] 를 저장소에 반영 (겹치는 꼬리는 교체)"""
+        if not obs:
+            return
+        dates, vals = self.load(series_id)
+        new_d = array(self.DATE_TYPE, (datetime.date.fromisoformat(d).toordinal() for d, _ in obs))
+        new_v = array(self.VAL_TYPE, (v for _, v in obs))
+        cut = bisect.bisect_left(dates, new_d[0])
+        os.makedirs(self.store_dir, exist_ok=True)
+        for path, arr, new in zip(self._paths(series_id), (dates, vals), (new_d, new_v)):
+            mode = 'r+b' if os.path.exists(path) else 'wb'
+            with open(path, mode) as f:
+                f.truncate(cut * arr.itemsize)
+                f.seek(cut * arr.itemsize)
+                new.tofile(f)
+            del arr[cut:]
+            arr.extend(new)
+        write_atomic(self._sum_path(series_id), json.dumps(self._checksum(dates, vals)))
+
+
+def _add_months(d, n, day=1):
+    y, m = divmod(d.year * 12 + d.month - 1 + n, 12)
+    return datetime.date(y, m + 1, day)
+
+
+class FredSchedule:
+    """FRED_RELEASES 발표 일정 + 시리즈별 마지막 확인 시각 (<저장소>/schedule.json).
+    다음 관측값의 최소 발표 시각이 지난 시리즈만 수집 대상:
+      - 오늘 발표 창(FRED_RELEASE_WINDOW) 안이면 항상
+      - 예정 시각이 지났는데 아직 새 값이 없으면 FRED_RECHECK 간격으로
+      - 일정이 없거나, 저장값이 없거나, FRED_MAX_SKIP 동안 확인 안 했으면 항상
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._checked = None        # series_id → 마지막 수집 시각 (epoch)
+
+    def _load(self):
+        if self._checked is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._checked = json.load(f)
+            except (OSError, ValueError):
+                self._checked = {}
+        return self._checked
+
+    @staticmethod
+    def next_release(series_id, last_obs):
+        """마지막 관측일 다음 관측값의 최소 발표 시각 (UTC datetime), 일정 없으면 None"""
+        cfg = FRED_RELEASES.get(series_id)
+        if cfg is None or last_obs is None:
+            return None
+        freq, lag, day, (hh, mm) = cfg
+        if freq == 'M':
+            when = _add_months(last_obs, 1 + lag, day)
         else:
-            # 원시값
-            n = len(sorted_months)
-            start = max(0, n - (months + fetch_extra)) if months else 0
-            recent = [sorted_months[i] for i in range(start, n)]
-            return [(mo, float(f"{monthly[mo]:.2f}")) for mo in recent]
+            nxt = last_obs + datetime.timedelta(days=1)
+            while freq == 'B' and nxt.weekday() >= 5:
+                nxt += datetime.timedelta(days=1)
+            when = nxt + datetime.timedelta(days=lag)
+        return datetime.datetime(when.year, when.month, when.day, hh, mm, tzinfo=datetime.timezone.utc)
+
+    def due(self, series_id, last_obs, now):
+        """(수집 여부, 사유)"""
+        release = self.next_release(series_id, last_obs)
+        checked = self._load().get(series_id)
+        if release is None or checked is None:
+            return True, '일정·저장값 없음'
+        checked = datetime.datetime.fromtimestamp(checked, datetime.timezone.utc)
+        if now - checked >= FRED_MAX_SKIP:
+            return True, '장기 미확인'
+        if now < release:
+            return False, f"다음 {release:%m-%d %H:%M}"
+        hh, mm = FRED_RELEASES[series_id][3]
+        today = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        if today <= now < today + FRED_RELEASE_WINDOW and checked < today:
+            return True, '발표 창'
+        if now - checked >= FRED_RECHECK:
+            return True, '발표 지남'
+        return False, f"재확인 {checked + FRED_RECHECK:%H:%M}"
+
+    def mark(self, series_ids, now):
+        checked = self._load()
+        for sid in series_ids:
+            checked[sid] = now.timestamp()
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            write_atomic(self.path, json.dumps(checked, sort_keys=True))
+        except OSError as e:
+            print(f"[FRED] 일정 저장 실패: {e}")
+
+
+class FredClient:
+    """실행 1회 동안 공유하는 FRED 클라이언트 (API 키 불필요, 공개 CSV).
+    - 시리즈별 다운로드는 실행당 최대 1회 (실패도 기억 → 재요청 없음)
+    - prefetch(ids): 여러 시리즈를 wide CSV(id=A,B,C) 한 번으로 수집 (수집 작업에서만 호출)
+    - 발표 일정(FredSchedule)상 새 값이 나올 때가 아닌 시리즈는 저장값 그대로 사용
+    - 로컬 저장소(FredStore)에 있는 시리즈는 마지막 관측일 이후(+개정 겹침 구간)만 요청
+    - latest / history: 저장소 배열에서 필요한 기간만 잘라 최신값·기간·pc1/ch1 변환 제공 (요청 없음)
+    """
 
-    except Exception as e:
-        print(f"[FRED history {series_id}] 실패: {e}")
-        return []
+    def __init__(self, cache=None, store=None, schedule=None):
+        self.cache = cache or HTTP_CACHE
+        self.store = store or FredStore()
+        self.schedule = schedule or FredSchedule(os.path.join(self.store.store_dir, 'schedule.json'))
+        self._ok: dict = {}         # series_id → True(사용 가능) | False(실패, 저장값도 없음)
+        self._inflight: dict = {}   # series_id → threading.Event
+        self._lock = threading.Lock()
+
+    # ── 다운로드 ──
+    def _start_date(self, series_id, today):
+        """요청 시작일: 저장소 마지막 관측일(-개정 겹침) 과 필요 기간 시작 중 늦은 날.
+        저장소가 필요 기간 앞부분을 덮지 못하면(설정 변경 등) 필요 기간 전체를 다시 받음.
+        """
+        window_start = None
+        window = fred_window_months(series_id)
+        if window:
+            y, m = divmod(today.year * 12 + today.month - 1 - window - FRED_RELEASE_LAG, 12)
+            window_start = datetime.date(y, m + 1, 1)
+        dates, _ = self.store.load(series_id)
+        covered = dates and (window_start is None or
+                             dates[0] <= window_start.toordinal() + 7)   # 주말·휴일 여유
+        if covered:
+            last = datetime.date.fromordinal(dates[-1])
+            resume = last - datetime.timedelta(days=FRED_REVISION_OVERLAP_DAYS)
+            return max(resume, window_start or resume).isoformat()
+        return window_start.isoformat() if window_start else FRED_FULL_START
+
+    def _download(self, ids, timeout):
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        # fredgraph 다중 시리즈 파라미터는 시리즈별 콤마 구분
+        url = (FRED_CSV_URL.format(ids=','.join(ids))
+               + '&cosd=' + ','.join(self._start_date(sid, today) for sid in ids))
+        obs: dict = {}
+        # 일정상 수집할 때가 된 시리즈 → 캐시 TTL 로 건너뛰지 않고 항상 원 서버 재검증
+        with self.cache.open(url, 'fred', timeout=timeout, ttl=0) as stream:
+            rows = iter_csv_rows(stream)
+            header = [h.strip() for h in next(rows, [])]
+            cols = [(sid, header.index(sid)) for sid in ids if sid in header]
+            obs = {sid: [] for sid, _ in cols}
+            for parts in rows:
+                date = parts[0].strip()
+                for sid, ci in cols:
+                    if ci < len(parts):
+                        v = parts[ci].strip()
+                        if v not in ('', '.'):
+                            try:
+                                obs[sid].append((date, float(v)))
+                            except ValueError:
+                                continue
+        return obs
+
+    def prefetch(self, series_ids, timeout=20, deadline=None):
+        """아직 없는 시리즈 중 발표 일정상 수집할 것만 한 번의 wide CSV 요청으로 (batch 실패 시 개별 요청).
+        deadline(monotonic, 미지정 시 수집 작업 마감): 요청 timeout 과 다른 스레드가 받는 중인
+        시리즈 대기의 상한 — 넘기면 기다리지 않고 반환 (그 시리즈는 이번 실행에 없는 것으로).
+        반환: 이번 호출에서 원 서버로부터 받은 시리즈 id 목록 (실행 지표의 항목 수)
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if deadline is None:
+            deadline = fetch_deadline()
+        if deadline is not None:
+            timeout = max(min(timeout, deadline - time.monotonic()), 1.0)
+        with self._lock:
+            todo, held = [], []
+            for sid in dict.fromkeys(series_ids):
+                if sid in self._ok or sid in self._inflight:
+                    continue
+                due, why = self.schedule.due(sid, self.store.last_date(sid), now)
+                if due:
+                    todo.append(sid)
+                else:
+                    self._ok[sid] = True
+                    held.append(f"{sid}({why})")
+            waits = {sid: self._inflight[sid] for sid in series_ids if sid in self._inflight}
+            done = threading.Event()
+            for sid in todo:
+                self._inflight[sid] = done
+        if held:
+            print(f"[FRED] 일정상 생략 {len(held)}개: {', '.join(held)}")
+        got: dict = {}
+        try:
+            if todo:
+                try:
+                    got = self._download(sorted(todo), timeout)
+                except urllib.error.HTTPError as e:
+                    # 잘못된 id 하나 때문에 묶음 전체가 거부된 경우 → 개별 요청
+                    if len(todo) == 1:
+                        raise
+                    print(f"[FRED {','.join(sorted(todo))}] 일괄 수집 실패, 개별 재시도: {e}")
+                    for sid in todo:
+                        try:
+                            got.update(self._download([sid], timeout))
+                        except Exception as e1:
+                            print(f"[FRED {sid}] 실패: {e1}")
+                print(f"[FRED] {len(got)}/{len(todo)}개 시리즈 수집 ({','.join(sorted(todo))})")
+        except Exception as e:
+            print(f"[FRED {','.join(sorted(todo))}] 실패: {e}")
+        finally:
+            with self._lock:
+                for sid in todo:
+                    try:
+                        self.store.merge(sid, got.get(sid))
+                    except OSError as e:
+                        print(f"[FRED {sid}] 저장 실패: {e}")
+                    self._ok[sid] = bool(self.store.load(sid)[0])
+                    self._inflight.pop(sid, None)
+                if got:     # 원 서버 응답(200/304)을 받은 시리즈만 확인 처리
+                    self.schedule.mark(got, now)
+            done.set()
+        late = [sid for sid, ev in waits.items()
+                if not ev.wait(None if deadline is None else max(deadline - time.monotonic(), 0.0))]
+        if late:
+            # 받는 중인 작업은 그대로 두고, 이번 호출자에겐 저장값(있으면)만
+            with self._lock:
+                for sid in late:
+                    if sid not in self._ok:
+                        self._ok[sid] = bool(self.store.load(sid)[0])
+            print(f"[FRED] 다른 작업이 받는 중인 시리즈 대기 마감 초과 - 저장값 사용: {', '.join(late)}")
+        return sorted(got)
+
+    def _window(self, series_id, months_back=None):
+        """저장소 관측값 중 최신 월 기준 months_back 개월 구간 (dates, vals) 배열. 실패 시 None.
+        저장소만 읽음 (수집은 prefetch — 수집 작업의 마감·예산 안에서만).
+        이번 실행 수집 작업이 결과 없이 끝난 시리즈(마감 초과·건너뜀)는 마지막 저장값으로.
+        """
+        if series_id not in self._ok:
+            with self._lock:
+                if series_id not in self._ok:
+                    self._ok[series_id] = bool(self.store.load(series_id)[0])
+        if not self._ok.get(series_id):
+            return None
+        dates, vals = self.store.load(series_id)
+        start = 0
+        if months_back:
+            last = datetime.date.fromordinal(dates[-1])
+            y, m = divmod(last.year * 12 + last.month - 1 - months_back, 12)
+            start = bisect.bisect_left(dates, datetime.date(y, m + 1, 1).toordinal())
+        return dates[start:], vals[start:]
+
+    def _monthly_series(self, series_id, months_back, units, agg):
+        """(월 번호, 원시 월값, 변환값) 배열 — 변환 엔진 입력/출력"""
+        if not np:
+            print(f"[FRED {series_id}] numpy 없음, 건너뜀")
+            return None
+        win = self._window(series_id, months_back)
+        if win is None:
+            return None
+        raw_m, raw_v = resample_monthly(*win, how=agg)
+        out_m, out_v = transform_series(raw_m, raw_v, units)
+        return raw_m, out_m, out_v
+
+    # ── 조회 ──
+    def latest(self, series_id, units=None, agg='last'):
+        """최신 월값 → (값, YYYY-MM)  /  최신 월 변환값이 없거나 실패 시 (None, None)
+        units='pc1' → YoY %, 'ch1' → MoM 절대 변화 등 (transform_series 참고)
+        """
+        res = self._monthly_series(series_id, 13 + units_pad(units), units, agg)
+        if res is None:
+            return None, None
+        raw_m, out_m, out_v = res
+        if not len(out_m) or out_m[-1] != raw_m[-1]:
+            return None, None
+        mo = month_label(out_m[-1])
+        if units:
+            return float(f"{out_v[-1]:.2f}"), mo
+        return float(out_v[-1]), mo
+
+    def history(self, series_id, months=24, units=None, agg='last'):
+        """최근 months개월 [(YYYY-MM, float), ...]  /  실패 시 []
+        agg  : 월 집계 'last' | 'mean' | 'first' (일간 시리즈 → 월값)
+        units: None(원시값) | 'pc1' | 'pch' | 'ch1' | 'maN'  (transform_series)
+        """
+        # 빠진 달이 있어도 months개를 채우도록 1년치 여유를 더 잘라옴
+        res = self._monthly_series(series_id, months + units_pad(units) + 12 if months else None,
+                                   units, agg)
+        if res is None:
+            return []
+        _, out_m, out_v = res
+        if months:
+            out_m, out_v = out_m[-months:], out_v[-months:]
+        return [(month_label(m), float(f"{v:.2f}")) for m, v in zip(out_m.tolist(), out_v.tolist())]
+
+    def reset(self):
+        """실행당 1회 기억을 비움 (daemon 모드의 다음 FRED 주기에서 일정 재판단)"""
+        with self._lock:
+            self._ok.clear()
+
+
+FRED = FredClient()
+
+
+def fred_fetch_tasks(series_ids):
+    """FRED 시리즈를 월간/일간 두 묶음의 wide CSV 요청으로 수집하는 작업 목록"""
+    ids = list(dict.fromkeys(series_ids))
+    groups = [('FRED 월간', [i for i in ids if i not in FRED_DAILY_SERIES]),
+              ('FRED 일간', [i for i in ids if i in FRED_DAILY_SERIES])]
+    return [FetchTask(name, lambda g=g: FRED.prefetch(g), timeout=FETCH_TIMEOUTS['fred'])
+            for name, g in groups if g]
+
+
+def get_fred_latest(series_id, units=None, agg='last'):
+    """FRED 공개 CSV에서 최신값 (API 키 불필요)
+    예: DFF(Fed금리), CPIAUCSL(CPI), UNRATE(실업률)
+    units='pc1' → YoY %, units='ch1' → MoM 절대 변화  (FredClient.latest)
+    """
+    return FRED.latest(series_id, units, agg)
+
+
+def get_fred_history(series_id, months=24, units=None, agg='last'):
+    """FRED 히스토리 (FredClient.history) — list of (YYYY-MM, float), 최근 months개월"""
+    return FRED.history(series_id, months, units, agg)
 
 
 # ── 경제지표 메타 (정적 정보) ──────────────────────────────────────────────────
@@ -372,18 +2170,18 @@ ECON_META = {
                  'isHighGood':True,  'threshold':80,  'thresholdLabel':'낙관 기준',    'color':'#f472b6'},
 }
 
-# FRED 수집 설정 (key, series_id, units, months)
+# FRED 수집 설정 (key, series_id, units, months, 월 집계: last|mean|first)
 FRED_SERIES_CFG = [
-    ('fedfunds', 'FEDFUNDS',  None,  24),
-    ('cpi',      'CPIAUCSL',  'pc1', 24),
-    ('core_cpi', 'CPILFESL',  'pc1', 24),
-    ('core_pce', 'PCEPILFE',  'pc1', 24),
-    ('payems',   'PAYEMS',    'ch1', 24),
-    ('unrate',   'UNRATE',    None,  24),
-    ('dgs10',    'DGS10',     None,  36),
-    ('spread',   'T10Y2Y',    None,  36),
-    ('retail',   'RSAFS',     'pc1', 24),
-    ('umcsent',  'UMCSENT',   None,  24),
+    ('fedfunds', 'FEDFUNDS',  None,  24, 'last'),
+    ('cpi',      'CPIAUCSL',  'pc1', 24, 'last'),
+    ('core_cpi', 'CPILFESL',  'pc1', 24, 'last'),
+    ('core_pce', 'PCEPILFE',  'pc1', 24, 'last'),
+    ('payems',   'PAYEMS',    'ch1', 24, 'last'),
+    ('unrate',   'UNRATE',    None,  24, 'last'),
+    ('dgs10',    'DGS10',     None,  36, 'mean'),   # 일간 → 월평균 (ECON_META freq)
+    ('spread',   'T10Y2Y',    None,  36, 'last'),
+    ('retail',   'RSAFS',     'pc1', 24, 'last'),
+    ('umcsent',  'UMCSENT',   None,  24, 'last'),
     # mfg_pmi / svc_pmi: ISM PMI는 FRED 미제공 → 기존 HTML 값 유지
 ]
 
@@ -391,6 +2189,12 @@ ORDER_KEYS = ['fedfunds','cpi','core_cpi','core_pce','payems','unrate',
               'dgs10','spread','mfg_pmi','svc_pmi','retail','umcsent']
 
 
+def assemble_econ_fred():
+    """FRED_SERIES_CFG 히스토리 → {key: [(YYYY-MM, float), ...]} (FRED 클라이언트 캐시에서)"""
+    return {key: get_fred_history(sid, months, units, agg)
+            for key, sid, units, months, agg in FRED_SERIES_CFG}
+
+
 def generate_econ_analysis(fred_data, pmi_preserve):
     """12개 경제지표를 종합해 1문장 요약 + 2~3문장 분석 반환 (규칙 기반).
     returns dict: {summary, detail, situation, score, color}
@@ -571,37 +2375,105 @@ def generate_econ_analysis(fred_data, pmi_preserve):
     }
 
 
-def build_econ_dashboard_script(existing_html):
-    """ECON_DATA_START/END 사이의 기존 스크립트에서 PMI 값을 보존하면서
-    FRED 최신 데이터로 덮어쓴 전체 <script> 블록 반환.
-    FRED 수집 실패 시 기존 HTML의 값을 그대로 유지.
-    분석 문장은 월 1회만 재생성.
+PMI_KEYS = ('mfg_pmi', 'svc_pmi')     # FRED 미제공 → 상태 파일 값 유지 (수동 갱신)
+
+
+class EconState:
+    """경제지표 대시보드 상태 파일 (JSON).
+    {version, lastUpdated, analysis:{month, summary, detail, situation, color, score},
+     indicators:{key: {current, prev, change, dates, values}}}
+    쓰기는 임시 파일 → os.replace 로 원자적.
+    """
+    VERSION = 1
+
+    def __init__(self, path=ECON_STATE_PATH):
+        self.path = path
+
+    def load(self):
+        """상태 dict, 없거나 손상·버전 불일치면 None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return state if isinstance(state, dict) and state.get('version') == self.VERSION else None
+
+    def save(self, state):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=1)
+            f.write('\n')
+        os.replace(tmp, self.path)
+
+
+ECON_STATE = EconState()
+
+_ECON_HEADER_RE = re.compile(r'^\s*(lastUpdated|analysis\w+):\s*(.*?),?\s*$', re.M)
+_ECON_IND_RE    = re.compile(r'^\s*(\w+): \{(.*)\}\s*,?\s*$', re.M)
+_ECON_FIELD_RE  = re.compile(r'(current|prev|change):(null|-?[\d.]+)')
+_ECON_ARR_RE    = re.compile(r'(dates|values):(\[[^\]]*\])')
+
+
+def parse_econ_block(block):
+    """기존 ECON_DATA <script> 블록 → 상태 dict (상태 파일이 없을 때 1회 이전용).
+    헤더는 줄 단위, 지표 필드는 해당 지표 줄 안에서만 찾음.
+    """
+    state = {'version': EconState.VERSION, 'lastUpdated': '', 'analysis': {}, 'indicators': {}}
+    names = {'analysisMonth': 'month', 'analysisSummary': 'summary', 'analysisDetail': 'detail',
+             'analysisSituation': 'situation', 'analysisColor': 'color', 'analysisScore': 'score'}
+    for m in _ECON_HEADER_RE.finditer(block):
+        try:
+            value = json.loads(m.group(2))
+        except ValueError:
+            continue
+        if m.group(1) == 'lastUpdated':
+            state['lastUpdated'] = value
+        elif m.group(1) in names:
+            state['analysis'][names[m.group(1)]] = value
+    for m in _ECON_IND_RE.finditer(block):
+        key, body = m.group(1), m.group(2)
+        if key not in ECON_META:
+            continue
+        ind = {f: (None if v == 'null' else float(v)) for f, v in _ECON_FIELD_RE.findall(body)}
+        for f, arr in _ECON_ARR_RE.findall(body):
+            try:
+                ind[f] = json.loads(arr)
+            except ValueError:
+                ind[f] = []
+        state['indicators'][key] = ind
+    return state
+
+
+def build_econ_state(prev_state, fred_rows=None):
+    """이전 상태 + FRED 최신 데이터 → 새 상태 dict.
+    PMI 는 이전 상태 값 유지, FRED 수집 실패 지표도 이전 값 유지.
+    분석 문장은 월 1회만 재생성 (같은 달이라도 점수 변화 1.5pt 이상이면 재생성).
+    fred_rows: 미리 수집한 {key: rows} (없으면 FRED 저장소의 마지막 값)
     """
-    import re as _re
     today_str  = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d')
     this_month = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m')
+    prev_inds  = prev_state.get('indicators', {})
+    prev_ana   = prev_state.get('analysis', {})
 
-    # 기존 HTML에서 PMI 값 추출 (FRED에 없으므로 보존)
     pmi_preserve = {}
-    for pmi_key in ('mfg_pmi', 'svc_pmi'):
-        m_cur  = _re.search(rf'{pmi_key}.*?current:([\d.\-]+)', existing_html, _re.DOTALL)
-        m_prev = _re.search(rf'{pmi_key}.*?prev:([\d.\-]+)', existing_html, _re.DOTALL)
-        m_chg  = _re.search(rf'{pmi_key}.*?change:([\d.\-]+)', existing_html, _re.DOTALL)
-        # dates/values 배열 추출
-        m_dates = _re.search(rf'{pmi_key}.*?dates:(\[.*?\])', existing_html, _re.DOTALL)
-        m_vals  = _re.search(rf'{pmi_key}.*?values:(\[.*?\])', existing_html, _re.DOTALL)
+    for pmi_key in PMI_KEYS:
+        pp = prev_inds.get(pmi_key, {})
         pmi_preserve[pmi_key] = {
-            'current': float(m_cur.group(1))  if m_cur  else None,
-            'prev':    float(m_prev.group(1)) if m_prev else None,
-            'change':  float(m_chg.group(1))  if m_chg  else 0,
-            'dates':   m_dates.group(1) if m_dates else '[]',
-            'values':  m_vals.group(1)  if m_vals  else '[]',
+            'current': pp.get('current'),
+            'prev':    pp.get('prev'),
+            'change':  pp.get('change') if pp.get('change') is not None else 0,
+            'dates':   pp.get('dates', []),
+            'values':  pp.get('values', []),
         }
 
     # FRED 데이터 수집
     fred_data = {}
-    for key, sid, units, months in FRED_SERIES_CFG:
-        rows = get_fred_history(sid, months, units)
+    for key, sid, units, months, agg in FRED_SERIES_CFG:
+        if fred_rows is not None:
+            rows = fred_rows.get(key) or []
+        else:
+            rows = get_fred_history(sid, months, units, agg)
         if rows:
             dates  = [r[0] for r in rows]
             values = [r[1] for r in rows]
@@ -611,47 +2483,67 @@ def build_econ_dashboard_script(existing_html):
             fred_data[key] = {'current': current, 'prev': prev, 'change': change,
                               'dates': dates, 'values': values}
             print(f"[ECON] {key}: 현재={current} ({len(rows)}개월)")
+
+    indicators = {}
+    for key in ORDER_KEYS:
+        if key in PMI_KEYS:
+            indicators[key] = pmi_preserve[key]
+        elif key in fred_data:
+            indicators[key] = fred_data[key]
         else:
-            pass   # 실패 → 기존값 유지 (fred_data.get(key)는 None 반환)
+            # FRED 실패 → 이전 값 유지
+            pp = prev_inds.get(key, {})
+            indicators[key] = {
+                'current': pp.get('current') if pp.get('current') is not None else 0,
+                'prev':    pp.get('prev')    if pp.get('prev')    is not None else 0,
+                'change':  pp.get('change')  if pp.get('change')  is not None else 0,
+                'dates':   pp.get('dates', []),
+                'values':  pp.get('values', []),
+            }
+
+    # ── 월별 분석 생성 (월 1회만 재생성, 나머지는 기존 보존) ───────────
+    existing_month = prev_ana.get('month', '')
+    existing_score = prev_ana.get('score')
 
-    # 기존 HTML에서 기존값 추출 (FRED 실패 시 폴백)
-    def extract_existing(key, field, default):
-        pat = rf'{_re.escape(key)}.*?{field}:([\d.\-]+)'
-        m = _re.search(pat, existing_html, _re.DOTALL)
-        return float(m.group(1)) if m else default
+    # 항상 신규 점수 계산 (시황 변화 감지용)
+    new_analysis = generate_econ_analysis(fred_data, pmi_preserve)
+    new_score    = float(new_analysis['score'])
+    score_delta  = abs(new_score - existing_score) if existing_score is not None else 99.0
+
+    if existing_month == this_month and score_delta < 1.5:
+        # 같은 달 + 점수 변화 없음 → 기존 텍스트 보존
+        analysis = {
+            'summary':   prev_ana.get('summary', ''),
+            'detail':    prev_ana.get('detail', ''),
+            'situation': prev_ana.get('situation', ''),
+            'color':     prev_ana.get('color', '#84cc16'),
+            'score':     existing_score,
+        }
+        print(f"[ECON] 분석 보존 ({this_month}, 점수변화 {score_delta:.2f}pt < 1.5)")
+    else:
+        # 새 달 OR 점수 변화 큼 → 새 분석 채택
+        analysis = new_analysis
+        reason   = f"새달({this_month})" if existing_month != this_month else f"점수변화 {score_delta:.2f}pt"
+        print(f"[ECON] 분석 재생성 ({reason}): {analysis['situation']} (점수={analysis['score']})")
+
+    return {
+        'version':     EconState.VERSION,
+        'lastUpdated': today_str,
+        'analysis':    dict(analysis, month=this_month),
+        'indicators':  indicators,
+    }
+
+
+def _js_num(v):
+    return 'null' if v is None else str(v)
 
-    def extract_arr(key, field):
-        pat = rf'{_re.escape(key)}.*?{field}:(\[.*?\])'
-        m = _re.search(pat, existing_html, _re.DOTALL)
-        return m.group(1) if m else '[]'
 
-    # 각 지표별 JS 객체 생성
+def render_econ_script(state):
+    """상태 dict → ECON_DATA <script> 블록 (ECON_META 정적 정보와 합침)"""
     ind_parts: list = []
     for key in ORDER_KEYS:
         meta = ECON_META.get(key, {})
-        dyn  = fred_data.get(key)
-
-        if key in ('mfg_pmi', 'svc_pmi'):
-            # PMI: 기존 보존값 사용
-            pp = pmi_preserve.get(key, {})
-            cur_js    = str(pp['current']) if pp['current'] is not None else 'null'
-            prev_js   = str(pp['prev'])    if pp['prev']    is not None else 'null'
-            chg_js    = str(pp['change'])
-            dates_js  = pp['dates']
-            values_js = pp['values']
-        elif dyn:
-            cur_js    = str(dyn['current'])
-            prev_js   = str(dyn['prev'])
-            chg_js    = str(dyn['change'])
-            dates_js  = json.dumps(dyn['dates'],  ensure_ascii=False)
-            values_js = json.dumps(dyn['values'], ensure_ascii=False)
-        else:
-            # FRED 실패 → 기존 HTML값 유지
-            cur_js    = str(extract_existing(key, 'current', 0))
-            prev_js   = str(extract_existing(key, 'prev',    0))
-            chg_js    = str(extract_existing(key, 'change',  0))
-            dates_js  = extract_arr(key, 'dates')
-            values_js = extract_arr(key, 'values')
+        ind  = state['indicators'].get(key, {})
 
         ihg = meta.get('isHighGood')
         ihg_js  = 'null' if ihg is None else ('true' if ihg else 'false')
@@ -663,59 +2555,31 @@ def build_econ_dashboard_script(existing_html):
         freq    = json.dumps(meta.get('freq',  ''),            ensure_ascii=False)
         thrLbl  = json.dumps(meta.get('thresholdLabel', ''),   ensure_ascii=False)
         color   = json.dumps(meta.get('color', '#3b82f6'),     ensure_ascii=False)
+        dates_js  = json.dumps(ind.get('dates', []),  ensure_ascii=False)
+        values_js = json.dumps(ind.get('values', []), ensure_ascii=False)
 
         ind_parts.append(
             f'    {key}: {{label:{label},icon:{icon},unit:{unit},freq:{freq},'
             f'isHighGood:{ihg_js},threshold:{thr_js},thresholdLabel:{thrLbl},color:{color},'
-            f'current:{cur_js},prev:{prev_js},change:{chg_js},'
+            f'current:{_js_num(ind.get("current"))},prev:{_js_num(ind.get("prev"))},'
+            f'change:{_js_num(ind.get("change", 0))},'
             f'dates:{dates_js},values:{values_js}}}'
         )
 
-    # ── 월별 분석 생성 (월 1회만 재생성, 나머지는 기존 보존) ───────────
-    existing_month_m = _re.search(r'analysisMonth:\s*"([^"]*)"', existing_html)
-    existing_month   = existing_month_m.group(1) if existing_month_m else ''
-
-    ex_scr_m      = _re.search(r'analysisScore:\s*([\d.\-]+)', existing_html)
-    existing_score = float(ex_scr_m.group(1)) if ex_scr_m else None
-
-    # 항상 신규 점수 계산 (시황 변화 감지용)
-    new_analysis = generate_econ_analysis(fred_data, pmi_preserve)
-    new_score    = float(new_analysis['score'])
-    score_delta  = abs(new_score - existing_score) if existing_score is not None else 99.0
-
-    if existing_month == this_month and score_delta < 1.5:
-        # 같은 달 + 점수 변화 없음 → 기존 텍스트 보존
-        ex_sum = _re.search(r'analysisSummary:\s*"((?:[^"\\]|\\.)*)"', existing_html)
-        ex_det = _re.search(r'analysisDetail:\s*"((?:[^"\\]|\\.)*)"', existing_html)
-        ex_sit = _re.search(r'analysisSituation:\s*"([^"]*)"',         existing_html)
-        ex_col = _re.search(r'analysisColor:\s*"([^"]*)"',             existing_html)
-        analysis = {
-            'summary':   ex_sum.group(1) if ex_sum else '',
-            'detail':    ex_det.group(1) if ex_det else '',
-            'situation': ex_sit.group(1) if ex_sit else '',
-            'color':     ex_col.group(1) if ex_col else '#84cc16',
-            'score':     existing_score if existing_score is not None else 0.0,
-        }
-        print(f"[ECON] 분석 보존 ({this_month}, 점수변화 {score_delta:.2f}pt < 1.5)")
-    else:
-        # 새 달 OR 점수 변화 큼 → 새 분석 채택
-        analysis = new_analysis
-        reason   = f"새달({this_month})" if existing_month != this_month else f"점수변화 {score_delta:.2f}pt"
-        print(f"[ECON] 분석 재생성 ({reason}): {analysis['situation']} (점수={analysis['score']})")
-
-    # JSON 직렬화로 특수문자 안전 처리
-    ana_summary   = json.dumps(analysis['summary'],   ensure_ascii=False)
-    ana_detail    = json.dumps(analysis['detail'],    ensure_ascii=False)
-    ana_situation = json.dumps(analysis['situation'], ensure_ascii=False)
-    ana_color     = json.dumps(analysis['color'],     ensure_ascii=False)
-    ana_score     = analysis['score']
+    # JSON 직렬화로 특수문자 안전 처리
+    analysis      = state['analysis']
+    ana_summary   = json.dumps(analysis.get('summary', ''),   ensure_ascii=False)
+    ana_detail    = json.dumps(analysis.get('detail', ''),    ensure_ascii=False)
+    ana_situation = json.dumps(analysis.get('situation', ''), ensure_ascii=False)
+    ana_color     = json.dumps(analysis.get('color', ''),     ensure_ascii=False)
+    ana_score     = analysis.get('score', 0.0)
 
     ind_block = ',\n'.join(ind_parts)
     script = (
         '<script>\n'
         'var ECON_DATA = {\n'
-        f'  lastUpdated: "{today_str}",\n'
-        f'  analysisMonth: "{this_month}",\n'
+        f'  lastUpdated: "{state["lastUpdated"]}",\n'
+        f'  analysisMonth: "{analysis.get("month", "")}",\n'
         f'  analysisSummary: {ana_summary},\n'
         f'  analysisDetail: {ana_detail},\n'
         f'  analysisSituation: {ana_situation},\n'
@@ -730,19 +2594,25 @@ def build_econ_dashboard_script(existing_html):
     return script
 
 
-def update_econ_dashboard(content):
-    """<!-- ECON_DATA_START -->...<!-- ECON_DATA_END --> 블록을 FRED 최신값으로 교체"""
-    pattern = r'(<!-- ECON_DATA_START -->)(.*?)(<!-- ECON_DATA_END -->)'
-    m = re.search(pattern, content, re.DOTALL)
-    if not m:
+def prepare_econ_state(page, fred_rows=None):
+    """econ 상태 파일(없으면 기존 ECON_DATA 블록에서 1회 이전) + FRED → 새 상태, 마커 없으면 None"""
+    if 'ECON_DATA' not in page:
         print("[ECON] 마커 없음 - 스킵")
-        return content
-    existing_block = m.group(2)
-    new_script = build_econ_dashboard_script(existing_block)
-    new_block = m.group(1) + '\n' + new_script + '\n            ' + m.group(3)
-    updated = content[:m.start()] + new_block + content[m.end():]
+        return None
+    prev_state = ECON_STATE.load()
+    if prev_state is None:
+        print(f"[ECON] 상태 파일 없음 → 기존 ECON_DATA 에서 이전 ({ECON_STATE.path})")
+        prev_state = parse_econ_block(page.region('ECON_DATA'))
+    return build_econ_state(prev_state, fred_rows)
+
+
+def update_econ_dashboard(page, state):
+    """econ 상태 저장 후 MarkerPage 의 ECON_DATA 영역을 상태에서 생성한 스크립트로 교체"""
+    if state is None:
+        return
+    ECON_STATE.save(state)
+    page.replace('ECON_DATA', '\n' + render_econ_script(state) + '\n            ')
     print("[ECON] 경제지표 대시보드 업데이트 완료")
-    return updated
 
 
 def get_cnn_fear_greed():
@@ -751,8 +2621,7 @@ def get_cnn_fear_greed():
     """
     url = "https://production.dataviz.cnn.io/index/fearandgreed/graphdata"
     try:
-        req = urllib.request.Request(url, headers=HEADERS)
-        with urllib.request.urlopen(req, timeout=15) as r:
+        with TRANSPORT.open(url, timeout=15) as r:
             data = json.loads(r.read().decode('utf-8'))
         fg = data.get('fear_and_greed', {})
         score = fg.get('score')
@@ -769,79 +2638,504 @@ def get_cnn_fear_greed():
     return {}
 
 
-def get_spy_options_pcr():
-    """SPY 옵션 데이터에서 실시간 Put/Call 비율 계산 (yfinance)"""
+# ─── SPY 옵션 P/C 분석 ────────────────────────────────────────────────────────
+
+class OptionChainCache:
+    """옵션 만기 목록·만기별 체인 배열을 짧은 TTL 로 디스크에 보관 (<dir>/<심볼>_<키>.json).
+    실행 중 처음 저장할 때 만기가 지난 항목과 max_age 보다 오래된 항목을 지움.
+    """
+
+    def __init__(self, cache_dir=OPTION_CACHE_DIR, ttl=OPTION_CHAIN_TTL, max_age=OPTION_EXPIRY_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_age = max_age      # 가장 긴 TTL (만기 목록) — 이보다 오래된 항목은 다시 쓰이지 않음
+        self._pruned = False
+
+    def _path(self, symbol, key):
+        return os.path.join(self.cache_dir, f"{symbol}_{key}.json")
+
+    def get(self, symbol, key, ttl=None):
+        """TTL 이내면 저장값, 아니면 None"""
+        try:
+            with open(self._path(symbol, key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('ts', 0) > (self.ttl if ttl is None else ttl):
+            return None
+        return entry.get('value')
+
+    def prune(self, today=None):
+        """만기일(키가 날짜)이 지났거나 max_age 보다 오래된 항목 삭제 → 지운 개수"""
+        today = (today or datetime.date.today()).isoformat()
+        cutoff = time.time() - self.max_age
+        removed = 0
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return 0
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            key = name[:-5].rpartition('_')[2]
+            path = os.path.join(self.cache_dir, name)
+            try:
+                # ISO 날짜 문자열은 사전순 = 날짜순 ('expiries' 등 날짜 아닌 키는 시각으로만 판단)
+                expired = key[:1].isdigit() and key < today
+                if expired or os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def put(self, symbol, key, value):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            write_atomic(self._path(symbol, key), json.dumps({'ts': time.time(), 'value': value}))
+        except OSError as e:
+            print(f"[옵션 캐시] 저장 실패: {e}")
+        if not self._pruned:
+            self._pruned = True
+            removed = self.prune()
+            if removed:
+                print(f"[옵션 캐시] 만료 항목 {removed}개 삭제")
+
+
+OPTION_CACHE = OptionChainCache()
+
+
+def get_spy_option_expiries():
+    """SPY 옵션 만기 목록 → (Ticker, expiries) (yfinance, 목록은 OPTION_EXPIRY_TTL 동안 캐시)"""
     if not yf:
         return None
+    spy = yf.Ticker("SPY", session=get_yf_session())
+    exps = OPTION_CACHE.get('SPY', 'expiries', OPTION_EXPIRY_TTL)
+    if exps is None:
+        exps = list(spy.options)
+        if exps:
+            OPTION_CACHE.put('SPY', 'expiries', exps)
+    return (spy, exps) if exps else None
+
+
+def select_expiries(exps, today):
+    """만기 목록 → [(만기, 남은 일수, 구간 번호)] — SPY_OPTION_BUCKETS 구간마다 가까운 것부터 최대 N개"""
+    picks, taken = [], [0] * len(SPY_OPTION_BUCKETS)
+    for exp in exps:
+        try:
+            days = (datetime.date.fromisoformat(exp) - today).days
+        except ValueError:
+            continue
+        for i, (_, lo, hi) in enumerate(SPY_OPTION_BUCKETS):
+            if lo <= days <= hi and taken[i] < SPY_OPTION_PER_BUCKET:
+                picks.append((exp, days, i))
+                taken[i] += 1
+                break
+    return picks
+
+
+def _chain_arrays(chain):
+    """yfinance option_chain → {'calls'|'puts': {'volume': [...], 'oi': [...]}} (JSON 캐시용 배열)"""
+    return {side: {'volume': df['volume'].to_numpy(dtype=float).tolist(),
+                   'oi':     df['openInterest'].to_numpy(dtype=float).tolist()}
+            for side, df in (('calls', chain.calls), ('puts', chain.puts))}
+
+
+def fetch_option_chains(ticker, symbol, expiries):
+    """만기별 체인 배열 {만기: 배열} — 캐시에 없는 만기만 동시에 수집 (실패한 만기는 제외)"""
+    chains = {}
+    missing = []
+    for exp in expiries:
+        cached = OPTION_CACHE.get(symbol, exp)
+        if cached is not None:
+            chains[exp] = cached
+        else:
+            missing.append(exp)
+
+    def _one(exp):
+        try:
+            return exp, _chain_arrays(ticker.option_chain(exp))
+        except Exception as e:
+            print(f"[{symbol} {exp}] 옵션 체인 실패: {e}")
+            return exp, None
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(OPTION_MAX_WORKERS, len(missing))) as pool:
+            for exp, arrays in pool.map(_one, missing):
+                if arrays is not None:
+                    OPTION_CACHE.put(symbol, exp, arrays)
+                    chains[exp] = arrays
+    print(f"[{symbol} 옵션] 만기 {len(chains)}/{len(expiries)}개 (캐시 {len(expiries) - len(missing)})")
+    return chains
+
+
+def option_pcr_analytics(chains, picks):
+    """만기별 체인 → 전체·구간별 거래량/미결제약정 가중 P/C 비율.
+    만기마다 [풋 거래량, 콜 거래량, 풋 OI, 콜 OI] 합계 행렬을 만들고 구간 합계·비율은 배열 연산으로.
+    returns {'pcr_vol', 'pcr_oi', 'expiries', 'buckets': [{'label', 'pcr_vol', 'pcr_oi', 'n'}]}  /  없으면 None
+    """
+    rows = [(exp, b) for exp, _, b in picks if exp in chains]
+    if not rows:
+        return None
+    m = np.array([[np.nansum(chains[exp]['puts']['volume']), np.nansum(chains[exp]['calls']['volume']),
+                   np.nansum(chains[exp]['puts']['oi']),     np.nansum(chains[exp]['calls']['oi'])]
+                  for exp, _ in rows])
+    bucket = np.array([b for _, b in rows])
+    per = np.zeros((len(SPY_OPTION_BUCKETS), 4))
+    np.add.at(per, bucket, m)
+    counts = np.bincount(bucket, minlength=len(SPY_OPTION_BUCKETS))
+    sums = np.vstack([per, m.sum(axis=0)])           # 마지막 행 = 전체
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.where(sums[:, [1, 3]] > 0, sums[:, [0, 2]] / sums[:, [1, 3]], np.nan)
+
+    def _r(v):
+        return None if np.isnan(v) else round(float(v), 2)
+
+    return {
+        'pcr_vol':  _r(ratios[-1, 0]),
+        'pcr_oi':   _r(ratios[-1, 1]),
+        'expiries': len(rows),
+        'buckets':  [{'label': SPY_OPTION_BUCKETS[i][0], 'pcr_vol': _r(ratios[i, 0]),
+                      'pcr_oi': _r(ratios[i, 1]), 'n': int(counts[i])}
+                     for i in range(len(SPY_OPTION_BUCKETS)) if counts[i]],
+    }
+
+
+def spy_option_analytics(spy_exps):
+    """SPY 여러 만기 옵션 체인 → option_pcr_analytics 결과 (수집 작업 'SPY PCR')"""
+    if not spy_exps:
+        return None
+    spy, exps = spy_exps
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    picks = select_expiries(exps, today)
+    return option_pcr_analytics(fetch_option_chains(spy, 'SPY', [e for e, _, _ in picks]), picks)
+
+
+def calc_spy_pcr(spy_exps):
+    """SPY 옵션 거래량 가중 Put/Call 비율 (SPY_OPTION_BUCKETS 만기 묶음 전체)"""
+    return (spy_option_analytics(spy_exps) or {}).get('pcr_vol')
+
+
+def get_spy_options_pcr():
+    """SPY 옵션 데이터에서 실시간 Put/Call 비율 계산 (yfinance)"""
     try:
-        spy = yf.Ticker("SPY")
-        exps = spy.options
-        if not exps:
-            return None
-        chain = spy.option_chain(exps[0])
-        call_vol = float(chain.calls['volume'].fillna(0).sum())
-        put_vol  = float(chain.puts['volume'].fillna(0).sum())
-        if call_vol > 0:
-            return round(put_vol / call_vol, 2)
+        return calc_spy_pcr(get_spy_option_expiries())
     except Exception as e:
         print(f"[SPY PCR] 실패: {e}")
     return None
 
-def get_volatility_macro_data():
-    """변동성(VIX), P/C 비율(CBOE), 매크로(FRED/yfinance) 통합 수집"""
+
+# 변동성 카드용 FRED 시리즈
+FRED_VOL_SERIES = ['DFF', 'CPIAUCSL', 'UNRATE']
+
+# 변동성 카드용 yfinance 티커 (vm 키, 티커)
+VOL_TICKERS = [("tnx", "^TNX"), ("irx", "^IRX"), ("dxy", "DX-Y.NYB"), ("gold", "GC=F")]
+VOL_PRICE_TICKERS = ["^VIX"] + [tk for _, tk in VOL_TICKERS]
+VOL_SOURCES = ('yf prices', 'SPY PCR', 'CBOE ', 'CNN F&G')    # 카드 스냅샷 대체 표시 대상 (작업 이름 접두어)
+
+PRICE_PERIOD          = "5d"   # 평시: 최근 일봉만 (52주 통계는 ROLLING 저장소가 누적)
+PRICE_PERIOD_BACKFILL = "1y"   # ROLLING 창이 비었거나 끊겼을 때 1년치로 다시 채움
+
+# 52주 밴드 통계 대상 티커 / 창 길이(일) / 저장소 / 마지막 확정 일봉이 이보다 오래되면 1년치 재수집
+ROLLING_TICKERS      = ('^VIX', '^TNX', 'DX-Y.NYB')
+ROLLING_WINDOW_DAYS  = 365
+ROLLING_PATH         = os.path.join('.cache', 'rolling.json')
+ROLLING_MAX_GAP_DAYS = 5
+
+
+class RollingWindow:
+    """날짜순 확정 종가의 기간 창(기본 52주) 통계를 값이 들어올 때마다 갱신.
+    최대·최소는 단조 deque (분할 상환 O(1)), 백분위는 정렬 리스트(bisect),
+    평균·표준편차는 누적 합·제곱합. 진행 중인 당일 값은 창에 넣지 않고 stats(current) 로 비교.
+    """
+
+    def __init__(self, days=ROLLING_WINDOW_DAYS):
+        self.days  = days
+        self.dates = deque()        # 서수일
+        self.vals  = deque()
+        self._max  = deque()        # (서수일, 값) 값 단조 감소
+        self._min  = deque()        # (서수일, 값) 값 단조 증가
+        self._sorted = []
+        self._sum = self._sumsq = 0.0
+
+    def __len__(self):
+        return len(self.vals)
+
+    @property
+    def last_date(self):
+        return self.dates[-1] if self.dates else None
+
+    def push(self, date, value):
+        """확정 일봉 추가 (마지막 날짜 이후만, 아니면 False). 창 밖으로 밀려난 값은 제거"""
+        if self.dates and date <= self.dates[-1]:
+            return False
+        self.dates.append(date)
+        self.vals.append(value)
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((date, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((date, value))
+        bisect.insort(self._sorted, value)
+        self._sum   += value
+        self._sumsq += value * value
+        self._evict(date - self.days)
+        return True
+
+    def _evict(self, cutoff):
+        while self.dates and self.dates[0] <= cutoff:
+            d, v = self.dates.popleft(), self.vals.popleft()
+            if self._max[0][0] == d:
+                self._max.popleft()
+            if self._min[0][0] == d:
+                self._min.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, v)]
+            self._sum   -= v
+            self._sumsq -= v * v
+
+    def stats(self, current, as_of):
+        """as_of(서수일) 기준 창과 current 비교 → {high, low, rank(백분위 0~100), z}"""
+        self._evict(as_of - self.days)
+        n = len(self.vals)
+        if not n:
+            return {'high': current, 'low': current, 'rank': None, 'z': None}
+        mean = self._sum / n
+        var  = max(self._sumsq / n - mean * mean, 0.0)
+        return {
+            'high': max(self._max[0][1], current),
+            'low':  min(self._min[0][1], current),
+            'rank': bisect.bisect_right(self._sorted, current) / n * 100,
+            'z':    (current - mean) / var ** 0.5 if var > 0 else None,
+        }
+
+    def to_json(self):
+        return {'dates': list(self.dates), 'vals': list(self.vals)}
+
+    @classmethod
+    def from_json(cls, obj, days=ROLLING_WINDOW_DAYS):
+        w = cls(days)
+        for d, v in zip(obj.get('dates', []), obj.get('vals', [])):
+            w.push(d, v)
+        return w
+
+
+class RollingStore:
+    """티커별 RollingWindow 를 JSON 파일 하나에 보관 (창 값만 저장, deque 등은 불러올 때 재구성)"""
+
+    def __init__(self, path=ROLLING_PATH):
+        self.path = path
+        self._windows = None
+
+    def _load(self):
+        if self._windows is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    raw = json.load(f)
+                self._windows = {tk: RollingWindow.from_json(obj) for tk, obj in raw.items()}
+            except (OSError, ValueError, AttributeError):
+                self._windows = {}
+        return self._windows
+
+    def needs_backfill(self, tickers, today):
+        """대상 티커 중 창이 비었거나 마지막 확정 일봉이 ROLLING_MAX_GAP_DAYS 보다 오래된 것이 있으면 True"""
+        windows = self._load()
+        for tk in tickers:
+            w = windows.get(tk)
+            if w is None or not len(w) or today.toordinal() - w.last_date > ROLLING_MAX_GAP_DAYS:
+                return True
+        return False
+
+    def update(self, closes):
+        """일봉 종가 표(index=날짜, columns=티커) → {티커: stats}.
+        마지막 행(진행 중일 수 있는 당일)을 뺀 값만 창에 넣고, 마지막 값은 현재값으로 비교.
+        """
+        windows = self._load()
+        out, changed = {}, False
+        idx = closes.index
+        if getattr(idx, 'tz', None) is not None:
+            idx = idx.tz_localize(None)
+        # 서수일 (1970-01-01 = 719163) 을 한 번에 계산
+        all_ords = idx.values.astype('datetime64[D]').astype(np.int64) + 719163
+        for tk in ROLLING_TICKERS:
+            if tk not in closes.columns:
+                continue
+            col  = closes[tk].to_numpy(dtype=float)
+            mask = ~np.isnan(col)
+            if not mask.any():
+                continue
+            ords, vals = all_ords[mask], col[mask]
+            w = windows.setdefault(tk, RollingWindow())
+            # 이미 창에 있는 날짜는 건너뛰고 새 확정 일봉만 추가
+            start = 0 if w.last_date is None else int(np.searchsorted(ords, w.last_date, side='right'))
+            for d, v in zip(ords[start:-1].tolist(), vals[start:-1].tolist()):
+                changed |= w.push(d, v)
+            out[tk] = w.stats(float(vals[-1]), int(ords[-1]))
+        if changed:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                write_atomic(self.path, json.dumps({tk: w.to_json() for tk, w in windows.items()},
+                                                   separators=(',', ':')))
+            except OSError as e:
+                print(f"[52주 통계] 저장 실패: {e}")
+        return out
+
+
+ROLLING = RollingStore()
+
+_YF_SESSION = None
+
+
+def get_yf_session():
+    """yfinance 호출이 공유하는 커넥션 풀 세션 (curl_cffi 없으면 None → yfinance 기본 세션)"""
+    global _YF_SESSION
+    if _YF_SESSION is None and curl_requests:
+        _YF_SESSION = curl_requests.Session(impersonate="chrome")
+    return _YF_SESSION
+
+
+def fetch_price_snapshot(tickers, period=None):
+    """모든 티커 일봉을 yf.download 배치 한 번으로 받아 가격 스냅샷 DataFrame 반환.
+    index=티커, columns=[last, prev, pct, high, low, rank, z]  (한 번의 벡터 연산으로 계산)
+    거래일이 다른 티커(선물·지수)가 섞여 생기는 NaN 은 티커별 마지막 유효값 기준.
+    ROLLING_TICKERS 의 high/low/rank/z 는 ROLLING 저장소의 52주 창 기준 (그 외 high/low 는 받은 기간).
+    period 미지정 시 평소엔 최근 일봉(PRICE_PERIOD)만, 52주 창을 채워야 하면 PRICE_PERIOD_BACKFILL.
+    """
+    if not yf:
+        return None
+    tickers = list(dict.fromkeys(tickers))   # 중복 제거 (^VIX 등)
+    if period is None:
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        band = [tk for tk in ROLLING_TICKERS if tk in tickers]
+        period = PRICE_PERIOD_BACKFILL if ROLLING.needs_backfill(band, today) else PRICE_PERIOD
+    df = yf.download(tickers, period=period, interval="1d", auto_adjust=True,
+                     group_by='column', progress=False, threads=True,
+                     session=get_yf_session())
+    if df is None or df.empty:
+        return None
+    closes = df['Close']
+    if isinstance(closes, pd.Series):                 # 단일 티커 → 열 하나짜리 표
+        closes = closes.to_frame(tickers[0])
+    valid  = closes.notna()
+    filled = closes.ffill()
+    last   = filled.iloc[-1]
+    prev   = filled.shift(1).where(valid).ffill().iloc[-1]   # 마지막 유효일 직전 종가
+    # 52주 밴드 대상은 ROLLING 창 통계로 (열 배열을 직접 채움 — 행별 .loc 대입은 느림)
+    high, low = closes.max().to_numpy(copy=True), closes.min().to_numpy(copy=True)
+    rank, z   = np.full(len(high), np.nan), np.full(len(high), np.nan)
+    band = ROLLING.update(closes)
+    for i, tk in enumerate(closes.columns):
+        st = band.get(tk)
+        if st:
+            high[i], low[i] = st['high'], st['low']
+            rank[i] = np.nan if st['rank'] is None else st['rank']
+            z[i]    = np.nan if st['z'] is None else st['z']
+    snap = pd.DataFrame({
+        'last': last,
+        'prev': prev,
+        'pct':  (last - prev) / prev * 100,
+        'high': high,
+        'low':  low,
+        'rank': rank,
+        'z':    z,
+    })
+    snap = snap[snap['last'].notna()]
+    print(f"[yfinance] {len(snap)}/{len(tickers)}개 티커 로드 ({period})")
+    return snap
+
+
+def price_fetch_task(tickers):
+    """가격 스냅샷 배치 수집 작업 (결과 이름: 'yf prices')"""
+    return FetchTask('yf prices', lambda: fetch_price_snapshot(tickers),
+                     timeout=FETCH_TIMEOUTS['yf'], max_stale=SNAPSHOT_MAX_AGE['yf'])
+
+
+def snapshot_row(prices, ticker):
+    """스냅샷에서 티커 한 줄 (없으면 None)"""
+    if prices is None or ticker not in prices.index:
+        return None
+    return prices.loc[ticker]
+
+
+def volatility_fetch_tasks():
+    """변동성 & 매크로 카드에 필요한 수집 작업 목록"""
+    to = FETCH_TIMEOUTS
+    tasks = []
+    if yf:
+        tasks.append(FetchTask('SPY options', get_spy_option_expiries, timeout=to['options']))
+        tasks.append(FetchTask('SPY PCR', spy_option_analytics, deps=('SPY options',), timeout=to['options'],
+                               max_stale=SNAPSHOT_MAX_AGE['options']))
+    for fname in ('totalpc.csv', 'equitypc.csv', 'indexpc.csv'):
+        tasks.append(FetchTask(f'CBOE {fname}', lambda f=fname: get_cboe_pc_ratio(f),
+                               timeout=to['cboe'], default=(None, None),
+                               max_stale=SNAPSHOT_MAX_AGE['cboe']))
+    tasks.append(FetchTask('CNN F&G', get_cnn_fear_greed, timeout=to['cnn'], default={},
+                           max_stale=SNAPSHOT_MAX_AGE['cnn']))
+    return tasks
+
+
+def assemble_volatility_macro(res):
+    """volatility_fetch_tasks() + 'yf prices' 결과 → 변동성 카드 dict"""
     vm: dict = {
         'vix': None, 'vix_prev': None, 'vix_52h': None, 'vix_52l': None,
+        'vix_pctile': None, 'vix_z': None,
         'total_pcr': None, 'equity_pcr': None, 'index_pcr': None, 'pcr_date': None,
-        'spy_pcr': None,
+        'spy_pcr': None, 'spy_pcr_oi': None, 'spy_buckets': [],
         'tnx': None, 'irx': None, 'spread': None,
         'dff': None, 'cpi_yoy': None, 'unrate': None,
         'dxy': None, 'gold': None,
         'fg_score': None, 'fg_rating': '', 'fg_prev': None,
+        'stale': {n: t for n, t in SNAPSHOTS.served.items() if n in res and n.startswith(VOL_SOURCES)},
+        # 보관소의 최근 ARCHIVE_SPARK_HOURS 시간 추이 (스파크라인·변화량, 점 2개 이상인 것만)
+        'history': {k: h for k, h in (('vix', archive_history('^VIX')),
+                                      ('fg', archive_history('fear_greed')),
+                                      ('total_pcr', archive_history('pcr_total'))) if h},
     }
 
     # VIX & 금리 / 자산가격 (yfinance)
-    if yf:
-        try:
-            hist = yf.Ticker("^VIX").history(period="1y")
-            if not hist.empty:
-                vm['vix'] = round(float(hist['Close'].iloc[-1]), 2)
-                if len(hist) >= 2:
-                    vm['vix_prev'] = round(float(hist['Close'].iloc[-2]), 2)
-                vm['vix_52h'] = round(float(hist['Close'].max()), 2)
-                vm['vix_52l'] = round(float(hist['Close'].min()), 2)
-        except Exception as e:
-            print(f"[VIX] 실패: {e}")
-
-        for ticker, key in [("^TNX", "tnx"), ("^IRX", "irx"),
-                            ("DX-Y.NYB", "dxy"), ("GC=F", "gold")]:
-            try:
-                h = yf.Ticker(ticker).history(period="5d")
-                if not h.empty:
-                    vm[key] = round(float(h['Close'].iloc[-1]), 2)
-            except Exception as e:
-                print(f"[{ticker}] 실패: {e}")
-
-        if vm['tnx'] is not None and vm['irx'] is not None:
-            vm['spread'] = round(vm['tnx'] - vm['irx'], 2)
+    prices = res.get('yf prices')
+    row = snapshot_row(prices, "^VIX")
+    if row is not None:
+        vm['vix'] = round(float(row['last']), 2)
+        if pd.notna(row['prev']):
+            vm['vix_prev'] = round(float(row['prev']), 2)
+        vm['vix_52h'] = round(float(row['high']), 2)
+        vm['vix_52l'] = round(float(row['low']), 2)
+        if pd.notna(row.get('rank')):
+            vm['vix_pctile'] = round(float(row['rank']), 1)
+        if pd.notna(row.get('z')):
+            vm['vix_z'] = round(float(row['z']), 2)
+
+    for key, tk in VOL_TICKERS:
+        row = snapshot_row(prices, tk)
+        if row is not None:
+            vm[key] = round(float(row['last']), 2)
+
+    if vm['tnx'] is not None and vm['irx'] is not None:
+        vm['spread'] = round(vm['tnx'] - vm['irx'], 2)
 
     # CBOE P/C 비율 (실패 시 SPY 옵션으로 대체)
-    vm['total_pcr'],  vm['pcr_date'] = get_cboe_pc_ratio("totalpc.csv")
-    vm['equity_pcr'], _              = get_cboe_pc_ratio("equitypc.csv")
-    vm['index_pcr'],  _              = get_cboe_pc_ratio("indexpc.csv")
+    vm['total_pcr'],  vm['pcr_date'] = res.get('CBOE totalpc.csv')  or (None, None)
+    vm['equity_pcr'], _              = res.get('CBOE equitypc.csv') or (None, None)
+    vm['index_pcr'],  _              = res.get('CBOE indexpc.csv')  or (None, None)
 
     # SPY 옵션 P/C (CBOE 실패 시 fallback)
-    spy_pcr = get_spy_options_pcr()
+    spy = res.get('SPY PCR')
+    spy = spy if isinstance(spy, dict) else {}       # 이전 형식(단일 만기 float) 스냅샷은 무시
+    spy_pcr = spy.get('pcr_vol')
     if vm['total_pcr'] is None:
         vm['total_pcr'] = spy_pcr
-    vm['spy_pcr'] = spy_pcr
+    vm['spy_pcr']     = spy_pcr
+    vm['spy_pcr_oi']  = spy.get('pcr_oi')
+    vm['spy_buckets'] = spy.get('buckets', [])
 
     # CNN Fear & Greed Index
-    fg = get_cnn_fear_greed()
+    fg = res.get('CNN F&G') or {}
     vm['fg_score']  = fg.get('score')
     vm['fg_rating'] = fg.get('rating', '')
     vm['fg_prev']   = fg.get('prev')
 
-    # FRED 매크로 (공개 CSV)
+    # FRED 매크로 (공개 CSV, fred_fetch_tasks 로 미리 수집된 값)
     vm['dff'],     _ = get_fred_latest("DFF")              # Fed 기준금리
     vm['cpi_yoy'], _ = get_fred_latest("CPIAUCSL", "pc1")  # CPI YoY %
     vm['unrate'],  _ = get_fred_latest("UNRATE")           # 실업률
@@ -851,6 +3145,83 @@ def get_volatility_macro_data():
     return vm
 
 
+def get_volatility_macro_data():
+    """변동성(VIX), P/C 비율(CBOE), 매크로(FRED/yfinance) 통합 수집"""
+    tasks = volatility_fetch_tasks() + fred_fetch_tasks(FRED_VOL_SERIES)
+    if yf:
+        tasks.append(price_fetch_task(VOL_PRICE_TICKERS))
+    res, _ = run_fetch_graph(tasks)
+    return assemble_volatility_macro(res)
+
+
+# ─── HTML 템플릿 ──────────────────────────────────────────────────────────────
+
+class Template:
+    """카드 HTML 템플릿. 생성 시 한 번 파이썬 함수로 컴파일하고, render(view) 는 조각을 모아 한 번에 join.
+        {필드}        값을 str() 후 HTML 이스케이프 (기본 — 특수문자가 없으면 그대로)
+        {필드|raw}    이미 만든 HTML 조각 그대로 (배지·SVG·코드에 정의된 표시 이름 등)
+        {필드|parts}  다른 템플릿 parts() 의 조각 목록을 이어 붙임 (반복 행 — 중간 join 없음)
+        {{ / }}       중괄호 문자
+    view 는 뷰 타입(namedtuple) 인스턴스. 자리표시자 이름은 컴파일 시 뷰 필드와 대조.
+    컴파일 결과는 필드를 풀어 리스트 하나를 만드는 함수:
+        def _parts(v): f_a, f_b = v; return [_l0, f_a if ... else _esc(f_a), *f_b, _l1]
+    """
+    _TOKEN_RE   = re.compile(r'\{\{|\}\}|\{(\w+)(?:\|(raw|parts))?\}')
+    _SPECIAL_RE = re.compile(r'[&<>"\']')
+
+    def __init__(self, source, view):
+        self.view = view
+        ns = {'_esc': esc, '_special': self._SPECIAL_RE.search}
+        items = []
+
+        def literal(text):
+            if text:
+                key = f'_l{len(ns)}'
+                ns[key] = text
+                items.append(key)
+
+        def chunk(raw):
+            if '{' in raw or '}' in raw:
+                raise ValueError(f"템플릿 {view.__name__}: 해석할 수 없는 중괄호 (문자는 {{{{ }}}}): {raw[:40]!r}")
+            return raw
+
+        pos, text = 0, []
+        for m in self._TOKEN_RE.finditer(source):
+            text.append(chunk(source[pos:m.start()]))
+            pos = m.end()
+            if m.group(1) is None:
+                text.append(m.group(0)[0])
+                continue
+            name, flt = m.group(1), m.group(2)
+            if name not in view._fields:
+                raise ValueError(f"템플릿 필드 없음: {view.__name__}.{name}")
+            literal(''.join(text))
+            text = []
+            f = f'f_{name}'
+            if flt == 'parts':
+                items.append(f'*{f}')
+            elif flt == 'raw':
+                items.append(f)
+            else:
+                items.append(f'({f} if type({f}) is str and not _special({f}) else _esc({f}))')
+        text.append(chunk(source[pos:]))
+        literal(''.join(text))
+        code = (f"def _parts(v):\n"
+                f"    {''.join(f'f_{n}, ' for n in view._fields)}= v\n"
+                f"    return [{', '.join(items)}]\n")
+        exec(compile(code, f'<template {view.__name__}>', 'exec'), ns)
+        self._parts = ns['_parts']
+
+    def parts(self, view):
+        """조각 목록 (다른 템플릿의 |parts 필드에 넣을 때)"""
+        if type(view) is not self.view:
+            raise TypeError(f"{self.view.__name__} 가 필요함: {type(view).__name__}")
+        return self._parts(view)
+
+    def render(self, view):
+        return ''.join(self.parts(view))
+
+
 def _vbadge(label, cls):
     return f'<span class="vol-badge vol-badge-{cls}">{label}</span>'
 
@@ -898,95 +3269,43 @@ def _fmtv(v, suffix='', prefix='', dec=2):
     return f"{prefix}{v:.{dec}f}{suffix}"
 
 
-def build_volatility_card_html(vm, updated_time):
-    """변동성 & 매크로 위젯 HTML 생성"""
-
-    # ── CNN F&G ──
-    fg_s   = vm.get('fg_score')
-    fg_r   = vm.get('fg_rating', '')
-    fg_p   = vm.get('fg_prev')
-    if fg_s is None:
-        fg_display = 'N/A'
-        fg_badge   = ''
-    else:
-        fg_display = f'{fg_s:.0f}/100'
-        if   fg_s <= 24: fg_badge = _vbadge('극도공포', 'red')
-        elif fg_s <= 44: fg_badge = _vbadge('공포', 'orange')
-        elif fg_s <= 55: fg_badge = _vbadge('중립', 'yellow')
-        elif fg_s <= 75: fg_badge = _vbadge('탐욕', 'lgreen')
-        else:            fg_badge = _vbadge('극도탐욕', 'green')
-
-    fg_delta = ''
-    if fg_s is not None and fg_p is not None:
-        d = fg_s - fg_p
-        col_fg = '#4ade80' if d >= 0 else '#f87171'
-        fg_delta = f'<span style="color:{col_fg};font-size:0.68rem;margin-left:2px;">{"▲" if d>=0 else "▼"}{abs(d):.1f}</span>'
-
-    fg_rating_ko = {'Extreme Fear':'극도공포', 'Fear':'공포', 'Neutral':'중립',
-                    'Greed':'탐욕', 'Extreme Greed':'극도탐욕'}.get(fg_r, fg_r)
-
-    # ── VIX 관련 사전 계산 ──
-    vix_str   = _fmtv(vm['vix'])
-    vix_badge = _vix_badge(vm['vix'])
-
-    if vm['vix'] is not None and vm['vix_prev'] is not None:
-        delta = vm['vix'] - vm['vix_prev']
-        arrow = '▲' if delta > 0 else '▼'
-        col   = '#f87171' if delta > 0 else '#4ade80'
-        vix_delta = (f'<span style="color:{col};font-size:0.68rem;margin-left:2px;">'
-                     f'{arrow}{abs(delta):.2f}</span>')
-    else:
-        vix_delta = ''
-
-    if (vm['vix'] is not None and vm['vix_52h'] is not None
-            and vm['vix_52l'] is not None):
-        rng = vm['vix_52h'] - vm['vix_52l']
-        pct_pos = ((vm['vix'] - vm['vix_52l']) / rng * 100) if rng > 0 else 50
-        vix_rank = f'상위 {100 - pct_pos:.0f}%'
-    else:
-        vix_rank = 'N/A'
-
-    vix_52_str  = f"{_fmtv(vm['vix_52l'])} ~ {_fmtv(vm['vix_52h'])}"
-
-    # ── P/C 관련 ──
-    spy_pcr_str = _fmtv(vm.get('spy_pcr'))
-    spy_pcr_b   = _pcr_badge(vm.get('spy_pcr'))
-    total_pcr_str  = _fmtv(vm['total_pcr'])
-    total_pcr_b    = _pcr_badge(vm['total_pcr'])
-    equity_pcr_str = _fmtv(vm['equity_pcr'])
-    equity_pcr_b   = _pcr_badge(vm['equity_pcr'])
-    index_pcr_str  = _fmtv(vm['index_pcr'])
-    index_pcr_b    = _pcr_badge(vm['index_pcr'])
-
-    tpcr = vm['total_pcr'] if vm['total_pcr'] is not None else 0.85
-    pcr_signal = ('풋 우세 · 하락 헤지' if vm['index_pcr'] is not None
-                  and vm['index_pcr'] > 1.0 else '콜 우세 · 낙관')
-
-    # ── 금리 / 자산 ──
-    tnx_str    = _fmtv(vm['tnx'], '%')
-    irx_str    = _fmtv(vm['irx'], '%')
-    spread_str = _fmtv(vm['spread'], '%')
-    spread_b   = _spread_badge(vm['spread'])
-    spread_col = '#4ade80' if (vm['spread'] or 0) >= 0 else '#f87171'
-    dxy_str    = _fmtv(vm['dxy'], dec=1)
-    gold_str   = _fmtv(vm['gold'], prefix='$', dec=0)
-
-    # ── FRED 매크로 ──
-    dff_str     = _fmtv(vm['dff'])
-    dff_badge   = _dff_badge(vm['dff'])
-    cpi_str     = _fmtv(vm['cpi_yoy'])
-    cpi_badge   = _cpi_badge(vm['cpi_yoy'])
-    unrate_str  = _fmtv(vm['unrate'])
-
-    pcr_date_str = vm['pcr_date'] or ''
-
-    return f"""            <div class="vol-macro-card">
+def _history_html(points, dec=2, rising='#4ade80', falling='#f87171'):
+    """보관소 추이 → 스파크라인 + 구간 변화량 (점이 없으면 '')"""
+    if not points:
+        return ''
+    d   = points[-1][1] - points[0][1]
+    col = rising if d >= 0 else falling
+    return (sparkline_svg(points, col) +
+            f'<span style="color:#64748b;font-size:0.64rem;margin-left:3px;">'
+            f'{ARCHIVE_SPARK_HOURS}h {"▲" if d >= 0 else "▼"}{abs(d):.{dec}f}</span>')
+
+
+# 변동성 & 매크로 카드: 뷰 타입 + 템플릿 (값 계산은 build_volatility_card_html)
+VolatilityCard = namedtuple('VolatilityCard', (
+    'updated_time stale fg_display fg_delta fg_badge fg_hist fg_rating_ko vix_str '
+    'vix_delta vix_badge vix_hist vix_52_str vix_rank total_pcr_str total_pcr_b tpcr_hist '
+    'equity_pcr_str equity_pcr_b index_pcr_str index_pcr_b spy_pcr_str spy_pcr_b spy_rows '
+    'pcr_date_str tnx_str irx_str spread_col spread_str spread_b pcr_signal dxy_str gold_str '
+    'dff_str dff_badge cpi_str cpi_badge unrate_str'
+))
+SpyOiRow     = namedtuple('SpyOiRow', 'value badge')
+SpyBucketRow = namedtuple('SpyBucketRow', 'label n pcr_vol pcr_oi')
+
+SPY_OI_ROW_TPL = Template(
+    '<div class="vol-metric-row"><span class="vol-metric-label">SPY P/C (미결제약정)</span>'
+    '<span class="vol-metric-value">{value} {badge|raw}</span></div>', SpyOiRow)
+SPY_BUCKET_ROW_TPL = Template(
+    '<div class="vol-metric-row">'
+    '<span class="vol-metric-label" style="color:#64748b;font-size:0.71rem;">└ {label} ({n}개 만기)</span>'
+    '<span class="vol-metric-value" style="color:#94a3b8;font-size:0.71rem;">'
+    '거래량 {pcr_vol} · OI {pcr_oi}</span></div>', SpyBucketRow)
+VOLATILITY_CARD_TPL = Template("""            <div class="vol-macro-card">
                 <div class="vol-macro-header" onclick="toggleVolMacro()">
                     <span class="vol-macro-title">📊 시장 심리 &amp; 매크로 현황
                         <span style="font-size:0.63em;color:#64748b;font-weight:400;margin-left:6px;">아래 경제지표 대시보드와 일부 중복 · 상세 확인 시 펼치기</span>
                     </span>
                     <span style="display:flex;align-items:center;gap:8px;">
-                        <span style="font-size:0.7rem;color:#475569;">Updated: {updated_time} KST · 매시 자동갱신 · CBOE / FRED / yfinance</span>
+                        <span style="font-size:0.7rem;color:#475569;">Updated: {updated_time} KST · 매시 자동갱신 · CBOE / FRED / yfinance</span>{stale|raw}
                         <button class="vol-acc-btn" id="volAccBtn" onclick="event.stopPropagation();toggleVolMacro()">▾ 펼치기</button>
                     </span>
                 </div>
@@ -998,7 +3317,7 @@ def build_volatility_card_html(vm, updated_time):
                         <div class="vol-section-title">😱 변동성 &amp; 공포 지표</div>
                         <div class="vol-metric-row" style="margin-bottom:6px;padding-bottom:6px;border-bottom:1px solid rgba(255,255,255,0.07);">
                             <span class="vol-metric-label">CNN 공포탐욕지수</span>
-                            <span class="vol-metric-value" style="font-size:0.9rem;">{fg_display} {fg_delta} {fg_badge}</span>
+                            <span class="vol-metric-value" style="font-size:0.9rem;">{fg_display} {fg_delta|raw} {fg_badge|raw}{fg_hist|raw}</span>
                         </div>
                         <div class="vol-metric-row" style="margin-bottom:6px;">
                             <span class="vol-metric-label" style="color:#64748b;font-size:0.71rem;">분류</span>
@@ -1006,7 +3325,7 @@ def build_volatility_card_html(vm, updated_time):
                         </div>
                         <div class="vol-metric-row">
                             <span class="vol-metric-label">VIX 공포지수</span>
-                            <span class="vol-metric-value">{vix_str} {vix_delta} {vix_badge}</span>
+                            <span class="vol-metric-value">{vix_str} {vix_delta|raw} {vix_badge|raw}{vix_hist|raw}</span>
                         </div>
                         <div class="vol-metric-row">
                             <span class="vol-metric-label">52주 범위</span>
@@ -1018,20 +3337,20 @@ def build_volatility_card_html(vm, updated_time):
                         </div>
                         <div class="vol-metric-row" style="margin-top:7px;padding-top:6px;border-top:1px solid rgba(255,255,255,0.05);">
                             <span class="vol-metric-label">Total P/C 비율</span>
-                            <span class="vol-metric-value">{total_pcr_str} {total_pcr_b}</span>
+                            <span class="vol-metric-value">{total_pcr_str} {total_pcr_b|raw}{tpcr_hist|raw}</span>
                         </div>
                         <div class="vol-metric-row">
                             <span class="vol-metric-label">Equity P/C</span>
-                            <span class="vol-metric-value">{equity_pcr_str} {equity_pcr_b}</span>
+                            <span class="vol-metric-value">{equity_pcr_str} {equity_pcr_b|raw}</span>
                         </div>
                         <div class="vol-metric-row">
                             <span class="vol-metric-label">Index P/C</span>
-                            <span class="vol-metric-value">{index_pcr_str} {index_pcr_b}</span>
+                            <span class="vol-metric-value">{index_pcr_str} {index_pcr_b|raw}</span>
                         </div>
                         <div class="vol-metric-row">
                             <span class="vol-metric-label">SPY P/C (실시간)</span>
-                            <span class="vol-metric-value">{spy_pcr_str} {spy_pcr_b}</span>
-                        </div>
+                            <span class="vol-metric-value">{spy_pcr_str} {spy_pcr_b|raw}</span>
+                        </div>{spy_rows|parts}
                         <div style="margin-top:5px;font-size:0.64rem;color:#64748b;">{pcr_date_str} CBOE / yfinance</div>
                     </div>
 
@@ -1048,7 +3367,7 @@ def build_volatility_card_html(vm, updated_time):
                         </div>
                         <div class="vol-metric-row">
                             <span class="vol-metric-label">장단기 스프레드</span>
-                            <span class="vol-metric-value" style="color:{spread_col};">{spread_str} {spread_b}</span>
+                            <span class="vol-metric-value" style="color:{spread_col};">{spread_str} {spread_b|raw}</span>
                         </div>
                         <div class="vol-metric-row" style="margin-top:7px;padding-top:6px;border-top:1px solid rgba(255,255,255,0.05);">
                             <span class="vol-metric-label">Index P/C 신호</span>
@@ -1069,11 +3388,11 @@ def build_volatility_card_html(vm, updated_time):
                         <div class="vol-section-title">🏦 월별 매크로 요약</div>
                         <div class="vol-metric-row">
                             <span class="vol-metric-label">Fed 기준금리</span>
-                            <span class="vol-metric-value">{dff_str}% {dff_badge}</span>
+                            <span class="vol-metric-value">{dff_str}% {dff_badge|raw}</span>
                         </div>
                         <div class="vol-metric-row">
                             <span class="vol-metric-label">CPI 물가 YoY</span>
-                            <span class="vol-metric-value">{cpi_str}% {cpi_badge}</span>
+                            <span class="vol-metric-value">{cpi_str}% {cpi_badge|raw}</span>
                         </div>
                         <div class="vol-metric-row">
                             <span class="vol-metric-label">실업률</span>
@@ -1095,27 +3414,168 @@ def build_volatility_card_html(vm, updated_time):
 
                 </div>
                 </div>
-            </div>"""
+            </div>""", VolatilityCard)
 
 
+def build_volatility_card_html(vm, updated_time):
+    """변동성 & 매크로 위젯 HTML 생성"""
 
+    # ── CNN F&G ──
+    fg_s   = vm.get('fg_score')
+    fg_r   = vm.get('fg_rating', '')
+    fg_p   = vm.get('fg_prev')
+    if fg_s is None:
+        fg_display = 'N/A'
+        fg_badge   = ''
+    else:
+        fg_display = f'{fg_s:.0f}/100'
+        if   fg_s <= 24: fg_badge = _vbadge('극도공포', 'red')
+        elif fg_s <= 44: fg_badge = _vbadge('공포', 'orange')
+        elif fg_s <= 55: fg_badge = _vbadge('중립', 'yellow')
+        elif fg_s <= 75: fg_badge = _vbadge('탐욕', 'lgreen')
+        else:            fg_badge = _vbadge('극도탐욕', 'green')
 
-def get_mk_rss_all_sections(count=3):
-    """매일경제 RSS 섹션별 기사 수집 (드롭다운용)"""
+    fg_delta = ''
+    if fg_s is not None and fg_p is not None:
+        d = fg_s - fg_p
+        col_fg = '#4ade80' if d >= 0 else '#f87171'
+        fg_delta = f'<span style="color:{col_fg};font-size:0.68rem;margin-left:2px;">{"▲" if d>=0 else "▼"}{abs(d):.1f}</span>'
+
+    fg_rating_ko = {'Extreme Fear':'극도공포', 'Fear':'공포', 'Neutral':'중립',
+                    'Greed':'탐욕', 'Extreme Greed':'극도탐욕'}.get(fg_r, fg_r)
+
+    # ── VIX 관련 사전 계산 ──
+    vix_str   = _fmtv(vm['vix'])
+    vix_badge = _vix_badge(vm['vix'])
+
+    if vm['vix'] is not None and vm['vix_prev'] is not None:
+        delta = vm['vix'] - vm['vix_prev']
+        arrow = '▲' if delta > 0 else '▼'
+        col   = '#f87171' if delta > 0 else '#4ade80'
+        vix_delta = (f'<span style="color:{col};font-size:0.68rem;margin-left:2px;">'
+                     f'{arrow}{abs(delta):.2f}</span>')
+    else:
+        vix_delta = ''
+
+    if (vm['vix'] is not None and vm['vix_52h'] is not None
+            and vm['vix_52l'] is not None):
+        rng = vm['vix_52h'] - vm['vix_52l']
+        pct_pos = ((vm['vix'] - vm['vix_52l']) / rng * 100) if rng > 0 else 50
+        vix_rank = f'상위 {100 - pct_pos:.0f}%'
+        if vm.get('vix_pctile') is not None and vm.get('vix_z') is not None:
+            vix_rank += f" · 백분위 {vm['vix_pctile']:.0f} · z {vm['vix_z']:+.1f}"
+    else:
+        vix_rank = 'N/A'
+
+    vix_52_str  = f"{_fmtv(vm['vix_52l'])} ~ {_fmtv(vm['vix_52h'])}"
+
+    # ── P/C 관련 ──
+    spy_pcr_str = _fmtv(vm.get('spy_pcr'))
+    spy_pcr_b   = _pcr_badge(vm.get('spy_pcr'))
+    spy_rows    = []
+    if vm.get('spy_pcr_oi') is not None:
+        spy_rows += SPY_OI_ROW_TPL.parts(SpyOiRow(_fmtv(vm['spy_pcr_oi']), _pcr_badge(vm['spy_pcr_oi'])))
+    for b in vm.get('spy_buckets') or []:
+        spy_rows += SPY_BUCKET_ROW_TPL.parts(
+            SpyBucketRow(b['label'], b['n'], _fmtv(b['pcr_vol']), _fmtv(b['pcr_oi'])))
+    total_pcr_str  = _fmtv(vm['total_pcr'])
+    total_pcr_b    = _pcr_badge(vm['total_pcr'])
+    equity_pcr_str = _fmtv(vm['equity_pcr'])
+    equity_pcr_b   = _pcr_badge(vm['equity_pcr'])
+    index_pcr_str  = _fmtv(vm['index_pcr'])
+    index_pcr_b    = _pcr_badge(vm['index_pcr'])
+
+    tpcr = vm['total_pcr'] if vm['total_pcr'] is not None else 0.85
+    pcr_signal = ('풋 우세 · 하락 헤지' if vm['index_pcr'] is not None
+                  and vm['index_pcr'] > 1.0 else '콜 우세 · 낙관')
+
+    # ── 금리 / 자산 ──
+    tnx_str    = _fmtv(vm['tnx'], '%')
+    irx_str    = _fmtv(vm['irx'], '%')
+    spread_str = _fmtv(vm['spread'], '%')
+    spread_b   = _spread_badge(vm['spread'])
+    spread_col = '#4ade80' if (vm['spread'] or 0) >= 0 else '#f87171'
+    dxy_str    = _fmtv(vm['dxy'], dec=1)
+    gold_str   = _fmtv(vm['gold'], prefix='$', dec=0)
+
+    # ── FRED 매크로 ──
+    dff_str     = _fmtv(vm['dff'])
+    dff_badge   = _dff_badge(vm['dff'])
+    cpi_str     = _fmtv(vm['cpi_yoy'])
+    cpi_badge   = _cpi_badge(vm['cpi_yoy'])
+    unrate_str  = _fmtv(vm['unrate'])
+
+    pcr_date_str = vm['pcr_date'] or ''
+
+    # ── 보관소 추이 (VIX 는 상승이 위험 신호) ──
+    hist      = vm.get('history') or {}
+    fg_hist   = _history_html(hist.get('fg'), dec=1)
+    vix_hist  = _history_html(hist.get('vix'), rising='#f87171', falling='#4ade80')
+    tpcr_hist = _history_html(hist.get('total_pcr'))
+
+    return VOLATILITY_CARD_TPL.render(VolatilityCard(
+        updated_time=updated_time, stale=stale_mark(vm.get('stale')), fg_display=fg_display,
+        fg_delta=fg_delta, fg_badge=fg_badge, fg_hist=fg_hist, fg_rating_ko=fg_rating_ko,
+        vix_str=vix_str, vix_delta=vix_delta, vix_badge=vix_badge, vix_hist=vix_hist,
+        vix_52_str=vix_52_str, vix_rank=vix_rank, total_pcr_str=total_pcr_str,
+        total_pcr_b=total_pcr_b, tpcr_hist=tpcr_hist, equity_pcr_str=equity_pcr_str,
+        equity_pcr_b=equity_pcr_b, index_pcr_str=index_pcr_str, index_pcr_b=index_pcr_b,
+        spy_pcr_str=spy_pcr_str, spy_pcr_b=spy_pcr_b, spy_rows=spy_rows, pcr_date_str=pcr_date_str,
+        tnx_str=tnx_str, irx_str=irx_str, spread_col=spread_col, spread_str=spread_str,
+        spread_b=spread_b, pcr_signal=pcr_signal, dxy_str=dxy_str, gold_str=gold_str,
+        dff_str=dff_str, dff_badge=dff_badge, cpi_str=cpi_str, cpi_badge=cpi_badge,
+        unrate_str=unrate_str))
+
+
+
+
+def mk_fetch_tasks(count=3):
+    """매일경제 RSS 섹션별 수집 작업 목록"""
+    return [
+        FetchTask(f'MK {section}',
+                  lambda url=url, section=section: fetch_rss_news(
+                      url, count, f'매일경제({section})', 'https://www.mk.co.kr', do_translate=False),
+                  timeout=FETCH_TIMEOUTS['rss'], default=[], max_stale=SNAPSHOT_MAX_AGE['rss'])
+        for section, url in MK_RSS_SECTIONS.items()
+    ]
+
+
+def assemble_mk_sections(res):
+    """mk_fetch_tasks() 결과 → {섹션: 기사 리스트} (MK_RSS_SECTIONS 순서 유지)"""
     result = {}
-    for section, url in MK_RSS_SECTIONS.items():
-        arts = fetch_rss_news(url, count, f'매일경제({section})',
-                              'https://www.mk.co.kr', do_translate=False)
+    for section in MK_RSS_SECTIONS:
+        arts = res.get(f'MK {section}') or []
         result[section] = arts
         print(f"[MK {section}] {len(arts)}건")
     return result
 
 
-def build_mk_dropdown_html(mk_data):
-    """MK RSS 드롭다운 HTML.
-    mkShow() 함수는 index.html 정적 <script>에 정의됨.
-    여기서는 데이터 JSON + 셀렉트 박스 + 결과 div만 생성.
-    """
+def get_mk_rss_all_sections(count=3):
+    """매일경제 RSS 섹션별 기사 수집 (드롭다운용)"""
+    res, _ = run_fetch_graph(mk_fetch_tasks(count))
+    return assemble_mk_sections(res)
+
+
+# MK 드롭다운: 섹션 JSON(스크립트 안이라 이스케이프 대신 '</' 치환) + 셀렉트 박스 + 결과 div
+MkDropdown = namedtuple('MkDropdown', 'data_json options')
+MkOption   = namedtuple('MkOption', 'section selected')
+
+MK_OPTION_TPL   = Template('<option value="{section}" {selected}>{section}</option>', MkOption)
+MK_DROPDOWN_TPL = Template(
+    '<script>var _MKD={data_json|raw};</script>'
+    '<div style="display:flex;align-items:center;gap:8px;margin-bottom:8px;">'
+    '<strong style="color:#fbbf24;font-size:0.82em;letter-spacing:0.03em;">📰 매일경제</strong>'
+    '<select id="mk-cat-sel" onchange="mkShow(this.value)"'
+    ' style="background:#1e2535;color:#f8fafc;border:1px solid rgba(255,255,255,0.15);'
+    'border-radius:6px;padding:2px 10px;font-size:0.75rem;cursor:pointer;">'
+    '{options|parts}'
+    '</select></div>'
+    '<div id="mk-articles-box"></div>'
+    '<script>if(typeof mkShow==="function"){{mkShow("증권");}}</script>', MkDropdown)
+
+
+def mk_dropdown_parts(mk_data):
+    """MK RSS 드롭다운 조각 목록 (오른쪽 카드에 바로 이어 붙임)"""
     sections_data = {}
     for sec, arts in mk_data.items():
         sections_data[sec] = [
@@ -1125,103 +3585,165 @@ def build_mk_dropdown_html(mk_data):
     # </script> 가 JSON 안에 있으면 HTML 파싱 종료 → \u003C 로 치환
     data_json = json.dumps(sections_data, ensure_ascii=False).replace('</', r'\u003C/')
 
-    options_html = ''.join(
-        '<option value="{s}" {sel}>{s}</option>'.format(
-            s=s, sel='selected' if s == '증권' else ''
-        )
-        for s in mk_data.keys()
-    )
+    options = []
+    for s in mk_data.keys():
+        options += MK_OPTION_TPL.parts(MkOption(s, 'selected' if s == '증권' else ''))
+    return MK_DROPDOWN_TPL.parts(MkDropdown(data_json, options))
 
-    parts = [
-        '<script>var _MKD=' + data_json + ';</script>',
-        '<div style="display:flex;align-items:center;gap:8px;margin-bottom:8px;">',
-        '<strong style="color:#fbbf24;font-size:0.82em;letter-spacing:0.03em;">📰 매일경제</strong>',
-        '<select id="mk-cat-sel" onchange="mkShow(this.value)"',
-        ' style="background:#1e2535;color:#f8fafc;border:1px solid rgba(255,255,255,0.15);',
-        'border-radius:6px;padding:2px 10px;font-size:0.75rem;cursor:pointer;">',
-        options_html,
-        '</select></div>',
-        '<div id="mk-articles-box"></div>',
-        '<script>if(typeof mkShow==="function"){mkShow("증권");}</script>',
-    ]
-    return ''.join(parts)
+
+def build_mk_dropdown_html(mk_data):
+    """MK RSS 드롭다운 HTML.
+    mkShow() 함수는 index.html 정적 <script>에 정의됨.
+    여기서는 데이터 JSON + 셀렉트 박스 + 결과 div만 생성.
+    """
+    return ''.join(mk_dropdown_parts(mk_data))
+
+
+# 기사 목록: 기사마다 카드 한 칸, 날짜·출처 줄과 요약은 있을 때만
+NewsItem   = namedtuple('NewsItem', 'border link title meta desc')
+NewsMeta   = namedtuple('NewsMeta', 'date sep source')
+NewsSource = namedtuple('NewsSource', 'url name')
+NewsDesc   = namedtuple('NewsDesc', 'text')
+
+NEWS_EMPTY_HTML = "<p style='color:#f87171;font-size:0.85em;margin:0;'>기사를 불러올 수 없습니다.</p>"
+NEWS_SOURCE_TPL = Template(
+    "출처: <a href='{url}' target='_blank' rel='noopener'"
+    " style='color:#94a3b8;text-decoration:underline;'>{name}</a>", NewsSource)
+NEWS_META_TPL = Template(
+    "<span style='color:#64748b;font-size:0.72em;display:block;margin-top:3px;'>"
+    "{date}{sep|raw}{source|parts}</span>", NewsMeta)
+NEWS_DESC_TPL = Template(
+    "<p style='color:#94a3b8;font-size:0.78em;margin:3px 0 0;line-height:1.5;'>{text}</p>", NewsDesc)
+NEWS_ITEM_TPL = Template(
+    "<div style='margin-bottom:9px;padding:9px 10px;"
+    "background:rgba(0,0,0,0.2);border-left:3px solid {border|raw};"
+    "border-radius:0 6px 6px 0;'>"
+    "<a href='{link}' target='_blank' rel='noopener'"
+    " style='color:#f8fafc;text-decoration:none;font-size:0.87em;"
+    "font-weight:600;line-height:1.4;display:block;'>{title}</a>"
+    "{meta|parts}{desc|parts}</div>", NewsItem)
 
 
 def build_news_items_html(arts, border='rgba(250,204,21,0.5)'):
     if not arts:
-        return "<p style='color:#f87171;font-size:0.85em;margin:0;'>기사를 불러올 수 없습니다.</p>"
-    out = ''
+        return NEWS_EMPTY_HTML
+    out = []
     for a in arts:
-        desc_html = (
-            f"<p style='color:#94a3b8;font-size:0.78em;margin:3px 0 0;line-height:1.5;'>{esc(a['desc'])}</p>"
-        ) if a.get('desc') else ''
-        meta_parts = []
-        if a.get('date'):
-            meta_parts.append(esc(a['date']))
-        if a.get('source'):
-            meta_parts.append(
-                f"출처: <a href='{esc(a.get('source_url', '#'))}' target='_blank' rel='noopener'"
-                f" style='color:#94a3b8;text-decoration:underline;'>{esc(a['source'])}</a>"
-            )
-        meta_html = (
-            f"<span style='color:#64748b;font-size:0.72em;display:block;margin-top:3px;'>"
-            f"{'  ·  '.join(meta_parts)}</span>"
-        ) if meta_parts else ''
-        out += (
-            f"<div style='margin-bottom:9px;padding:9px 10px;"
-            f"background:rgba(0,0,0,0.2);border-left:3px solid {border};"
-            f"border-radius:0 6px 6px 0;'>"
-            f"<a href='{esc(a['link'])}' target='_blank' rel='noopener'"
-            f" style='color:#f8fafc;text-decoration:none;font-size:0.87em;"
-            f"font-weight:600;line-height:1.4;display:block;'>{esc(a['title'])}</a>"
-            f"{meta_html}{desc_html}</div>"
-        )
-    return out
+        date   = a.get('date') or ''
+        source = (NEWS_SOURCE_TPL.parts(NewsSource(a.get('source_url', '#'), a['source']))
+                  if a.get('source') else [])
+        meta   = (NEWS_META_TPL.parts(NewsMeta(date, '  ·  ' if date and source else '', source))
+                  if date or source else [])
+        desc   = NEWS_DESC_TPL.parts(NewsDesc(a['desc'])) if a.get('desc') else []
+        out += NEWS_ITEM_TPL.parts(NewsItem(border, a['link'], a['title'], meta, desc))
+    return ''.join(out)
 
 # ─── 시장 데이터 수집 ─────────────────────────────────────────────────────────
 
-def get_latest_market_data():
-    now_utc = datetime.datetime.now(datetime.timezone.utc)
-    now_kst = now_utc + datetime.timedelta(hours=9)
-    date_str = now_kst.strftime("%Y.%m.%d")
-    weekdays = ["월", "화", "수", "목", "금", "토", "일"]
-    weekday_str = weekdays[now_kst.weekday()]
+INDICES_MAP = {
+    "DOW": "^DJI",
+    "S&P 500": "^GSPC",
+    "NASDAQ": "^IXIC",
+    "Russell 2K": "^RUT",
+    "Phil. Semi": "^SOX",
+    "VIX Index": "^VIX"
+}
+SECTORS_MAP = {
+    "Financials (XLF)": "XLF",
+    "Industrials (XLI)": "XLI",
+    "Technology (XLK)": "XLK",
+    "Health Care (XLV)": "XLV"
+}
+BIGTECH_TICKERS = ["MSFT", "AAPL", "NVDA", "GOOGL", "AMZN", "TSLA", "META"]
+
+
+def market_fetch_groups(sections=SECTIONS):
+    """소스 그룹 → 수집 작업 목록 (sections 영역에 필요한 것만).
+    1회 실행은 전체를 하나의 그래프로, daemon 모드는 그룹별 주기(DAEMON_INTERVALS)로 실행.
+    """
+    groups = {}
+    tickers = []
+    if 'left' in sections:
+        tickers += list(INDICES_MAP.values()) + list(SECTORS_MAP.values()) + BIGTECH_TICKERS
+    if 'volatility' in sections:
+        tickers += VOL_PRICE_TICKERS
+    if tickers and yf:
+        # 필요한 티커를 한 번에 (지수·섹터·Mag7 + 변동성 카드)
+        groups['prices'] = [price_fetch_task(tickers)]
+    if 'volatility' in sections:
+        groups['sentiment'] = volatility_fetch_tasks()
+    if 'news' in sections:
+        groups['rss'] = mk_fetch_tasks(10)          # MK RSS 섹션별 기사 (10건)
+    # FRED: 변동성 카드 + 경제지표 대시보드 시리즈를 월간/일간 묶음 요청으로
+    fred_ids = ((FRED_VOL_SERIES if 'volatility' in sections else [])
+                + ([sid for _, sid, _, _, _ in FRED_SERIES_CFG] if 'econ' in sections else []))
+    if fred_ids:
+        groups['fred'] = fred_fetch_tasks(fred_ids)
+    return groups
+
+
+def default_sections(force=False):
+    """--sections 미지정 시 갱신 영역: 왼쪽 시장 카드는 07·22시(KST)·--force·카드 없음일 때만"""
+    now_kst = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=9)
+    left = force or now_kst.hour in [7, 22]
+    if not left:
+        try:
+            with open(INDEX_HTML_PATH, 'r', encoding='utf-8') as f:
+                left = '<!-- LEFT_CARD_START -->' not in f.read()
+        except OSError:
+            pass
+    return [s for s in SECTIONS if s != 'left' or left]
+
+
+def parse_sections(arg):
+    """'news,volatility' → 영역 목록 (SECTIONS 순서), 알 수 없는 이름은 ValueError"""
+    names = {s.strip() for s in arg.split(',') if s.strip()}
+    unknown = names - set(SECTIONS)
+    if unknown or not names:
+        raise ValueError(f"알 수 없는 영역: {', '.join(sorted(unknown)) or '(없음)'} "
+                         f"(가능: {','.join(SECTIONS)})")
+    return [s for s in SECTIONS if s in names]
+
+
+def get_latest_market_data(sections=SECTIONS):
+    # ── 선택 영역에 필요한 원격 소스를 하나의 의존성 그래프로 병렬 수집 ──
+    res, _ = run_fetch_graph([t for tasks in market_fetch_groups(sections).values() for t in tasks])
+    archive_run(res)
+    return assemble_market_data(res, sections)
 
-    indices_map = {
-        "DOW": "^DJI",
-        "S&P 500": "^GSPC",
-        "NASDAQ": "^IXIC",
-        "Russell 2K": "^RUT",
-        "Phil. Semi": "^SOX",
-        "VIX Index": "^VIX"
-    }
-    sectors_map = {
-        "Financials (XLF)": "XLF",
-        "Industrials (XLI)": "XLI",
-        "Technology (XLK)": "XLK",
-        "Health Care (XLV)": "XLV"
-    }
-    bigtech_map = ["MSFT", "AAPL", "NVDA", "GOOGL", "AMZN", "TSLA", "META"]
+
+def assemble_left_market(res):
+    """'yf prices' 결과 → 왼쪽 시장 카드 dict (지수·섹터·Mag7)"""
+    indices_map = INDICES_MAP
+    sectors_map = SECTORS_MAP
+    bigtech_map = BIGTECH_TICKERS
+
+    prices = res.get('yf prices')
+
+    def day_change(tk):
+        row = snapshot_row(prices, tk)
+        if row is None or pd.isna(row['pct']):
+            raise KeyError(tk)
+        return row['last'], row['pct']
 
     indices_data, sectors_data, bigtech_data = [], [], []
 
     if yf:
         for name, tk in indices_map.items():
             try:
-                hist = yf.Ticker(tk).history(period="5d")
-                curr, prev = hist['Close'].iloc[-1], hist['Close'].iloc[-2]
-                pct = ((curr - prev) / prev) * 100
+                curr, pct = day_change(tk)
                 indices_data.append({
                     "name": name, "val": f"{curr:,.1f}",
                     "pct": f"{'+' if pct>=0 else ''}{pct:.2f}%", "up": pct >= 0
                 })
+                spark = archive_history(tk, ARCHIVE_LEFT_SPARK_HOURS)
+                if spark:
+                    indices_data[-1]["spark"] = spark
             except Exception:
                 indices_data.append({"name": name, "val": "N/A", "pct": "0.00%", "up": True})
         for name, tk in sectors_map.items():
             try:
-                hist = yf.Ticker(tk).history(period="5d")
-                curr, prev = hist['Close'].iloc[-1], hist['Close'].iloc[-2]
-                pct = ((curr - prev) / prev) * 100
+                _, pct = day_change(tk)
                 col = "#10b981" if pct >= 0 else "#f43f5e"
                 val_w = min(max(50 + pct * 10, 10), 90)
                 sectors_data.append({
@@ -1232,9 +3754,7 @@ def get_latest_market_data():
                 sectors_data.append({"name": name, "val": "50%", "color": "#10b981", "pct": "0.00%", "up": True})
         for tk in bigtech_map:
             try:
-                hist = yf.Ticker(tk).history(period="5d")
-                curr, prev = hist['Close'].iloc[-1], hist['Close'].iloc[-2]
-                pct = ((curr - prev) / prev) * 100
+                _, pct = day_change(tk)
                 bigtech_data.append({"name": tk, "pct": f"{'+' if pct>=0 else ''}{pct:.2f}%", "up": pct >= 0})
             except Exception:
                 bigtech_data.append({"name": tk, "pct": "0.00%", "up": True})
@@ -1243,165 +3763,723 @@ def get_latest_market_data():
         sectors_data = [{"name": n, "val": "50%", "color": "#10b981", "pct": "0.00%", "up": True} for n in sectors_map]
         bigtech_data = [{"name": n, "pct": "0.00%", "up": True} for n in bigtech_map]
 
-    # 변동성 & 매크로 수집
-    vm_data = get_volatility_macro_data()
+    return {
+        "title": "실시간 시장 지표 & 섹터 현황 📊",
+        "indices": indices_data,
+        "sectors": sectors_data,
+        "bigtech": bigtech_data,
+        "korea": "실시간 글로벌 시장 변동에 따른 투자 심리 변화가 감지되고 있습니다. 주도 섹터 및 기관 수급 유입 상황을 주의 깊게 살펴보세요."
+    }
 
-    # MK RSS 섹션별 기사 수집 (10건)
-    mk_data = get_mk_rss_all_sections(10)
+
+def assemble_market_data(res, sections=SECTIONS):
+    """수집 결과(작업 이름 → 값) → 카드 데이터 dict (sections 영역의 키만 포함)"""
+    now_utc = datetime.datetime.now(datetime.timezone.utc)
+    now_kst = now_utc + datetime.timedelta(hours=9)
+    date_str = now_kst.strftime("%Y.%m.%d")
+    weekdays = ["월", "화", "수", "목", "금", "토", "일"]
+    weekday_str = weekdays[now_kst.weekday()]
 
     data = {
         "is_morning_update": now_kst.hour in [7, 22],
+        "sections": list(sections),
         "date": date_str,
         "weekday": weekday_str,
-        "market": {
-            "title": "실시간 시장 지표 & 섹터 현황 📊",
-            "indices": indices_data,
-            "sectors": sectors_data,
-            "bigtech": bigtech_data,
-            "korea": "실시간 글로벌 시장 변동에 따른 투자 심리 변화가 감지되고 있습니다. 주도 섹터 및 기관 수급 유입 상황을 주의 깊게 살펴보세요."
-        },
-        "volatility": vm_data,
-        "mk_data": mk_data,
+        "stale": dict(SNAPSHOTS.served),      # 스냅샷으로 대체한 소스 → 수집 시각
         "news": {
             "updated_time": now_kst.strftime("%H:%M")
         }
     }
+    # 왼쪽 시장 카드 / 변동성 & 매크로 / MK RSS / 경제지표 결과 조립
+    if 'left' in sections:
+        data['market'] = assemble_left_market(res)
+    if 'volatility' in sections:
+        data['volatility'] = assemble_volatility_macro(res)
+    if 'news' in sections:
+        data['mk_data'] = assemble_mk_sections(res)
+    if 'econ' in sections:
+        data['econ_fred'] = assemble_econ_fred()
     return data
 
+# ─── 실행 기록 보관 ───────────────────────────────────────────────────────────
+
+ARCHIVE_TICKERS = list(dict.fromkeys([*INDICES_MAP.values(), *SECTORS_MAP.values(), *BIGTECH_TICKERS,
+                                      *VOL_PRICE_TICKERS]))
+# 심리 지표 열 → (수집 작업 이름, 결과에서 값 꺼내기)
+ARCHIVE_SENTIMENT = {
+    'pcr_total':  ('CBOE totalpc.csv',  lambda r: r[0]),
+    'pcr_equity': ('CBOE equitypc.csv', lambda r: r[0]),
+    'pcr_index':  ('CBOE indexpc.csv',  lambda r: r[0]),
+    'pcr_spy':    ('SPY PCR',           lambda r: r.get('pcr_vol')),
+    'fear_greed': ('CNN F&G',           lambda r: r.get('score')),
+}
+_KST_SECONDS = 9 * 3600
+
+
+class RunArchive:
+    """실행별 시장 값 보관소. 지표(열)마다 float64 array 파일 하나 (<dir>/<지표>.f64),
+    행 시각은 ts.f64 (epoch 초, 오름차순). 없는 값은 NaN.
+    행 추가는 각 파일 끝에 덧붙이기만 하고 (시각 열은 마지막에 — 중단되면 ts 길이가 기준),
+    읽기는 mmap 위의 memoryview 로 필요한 구간만 참조.
+    meta.json 의 compacted_until 이전 행은 이미 KST 날짜별 1행으로 축약된 것.
+    """
+    TS, VAL_TYPE = 'ts', 'd'
+
+    def __init__(self, store_dir=ARCHIVE_DIR):
+        self.store_dir = store_dir
+        self._maps: dict = {}       # 열 → (mmap, memoryview)
+
+    def _path(self, name):
+        return os.path.join(self.store_dir, urllib.parse.quote(name, safe='') + '.f64')
+
+    def _meta_path(self):
+        return os.path.join(self.store_dir, 'meta.json')
+
+    def _load_meta(self):
+        try:
+            with open(self._meta_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _release(self):
+        """열린 mmap 해제 (파일을 늘리거나 바꾸기 전에)"""
+        for mm, view in self._maps.values():
+            view.release()
+            mm.close()
+        self._maps.clear()
+
+    def metrics(self):
+        """저장된 지표 열 이름 목록"""
+        try:
+            names = os.listdir(self.store_dir)
+        except OSError:
+            return []
+        return sorted(urllib.parse.unquote(n[:-4]) for n in names
+                      if n.endswith('.f64') and n != self.TS + '.f64')
+
+    def column(self, name):
+        """열 값 memoryview('d'). 파일이 없거나 비었으면 빈 시퀀스"""
+        if name not in self._maps:
+            try:
+                with open(self._path(name), 'rb') as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):       # 없음 / 빈 파일
+                return memoryview(array(self.VAL_TYPE))
+            view = memoryview(mm)
+            self._maps[name] = (mm, view[:len(view) // 8 * 8].cast(self.VAL_TYPE))
+            view.release()
+        return self._maps[name][1]
+
+    def __len__(self):
+        return len(self.column(self.TS))
+
+    def window(self, name, hours, now=None):
+        """최근 hours 시간의 [(시각, 값), ...] (NaN 제외, 시각순)"""
+        now = time.time() if now is None else now
+        ts, col = self.column(self.TS), self.column(name)
+        start = bisect.bisect_left(ts, now - hours * 3600)
+        return [(ts[i], col[i]) for i in range(start, min(len(ts), len(col))) if col[i] == col[i]]
+
+    def append(self, values, ts=None):
+        """{지표: 값} 한 행 추가 (None·NaN 은 빈 칸). 새 지표는 기존 행 수만큼 NaN 으로 채워 만듦.
+        반환: 추가 여부 (값이 하나도 없거나 시각이 마지막 행 이전이면 추가하지 않음)
+        """
+        ts = time.time() if ts is None else ts
+        row = {k: float(v) for k, v in values.items() if v is not None and v == v}
+        last = self.column(self.TS)
+        if not row or (len(last) and ts <= last[-1]):
+            return False
+        self._release()
+        os.makedirs(self.store_dir, exist_ok=True)
+        try:
+            n = os.path.getsize(self._path(self.TS)) // 8
+        except OSError:
+            n = 0
+        nan = float('nan')
+        for name in sorted(set(self.metrics()) | set(row)):
+            path = self._path(name)
+            mode = 'r+b' if os.path.exists(path) else 'wb'
+            with open(path, mode) as f:
+                size = f.seek(0, os.SEEK_END) // 8
+                f.truncate(min(size, n) * 8)       # 중단된 추가로 남은 꼬리 제거
+                f.seek(0, os.SEEK_END)
+                (array(self.VAL_TYPE, [nan]) * (n - min(size, n))).tofile(f)
+                array(self.VAL_TYPE, [row.get(name, nan)]).tofile(f)
+        with open(self._path(self.TS), 'r+b' if n else 'wb') as f:
+            f.truncate(n * 8)
+            f.seek(n * 8)
+            array(self.VAL_TYPE, [ts]).tofile(f)
+        if ts - self._load_meta().get('compacted_until', 0) >= (ARCHIVE_HOURLY_DAYS + 1) * 86400:
+            self.compact(ts)
+        return True
+
+    def compact(self, now=None):
+        """ARCHIVE_HOURLY_DAYS 일보다 오래된 시간별 행 → KST 날짜별 1행 (열마다 그날 마지막 유효값, 시각은 그날 마지막 행).
+        모든 열을 임시 파일로 다시 쓴 뒤 교체 (시각 열은 마지막). 반환: 줄어든 행 수
+        """
+        now = time.time() if now is None else now
+        meta = self._load_meta()
+        done = meta.get('compacted_until', 0)
+        cutoff = (int((now + _KST_SECONDS) // 86400) - ARCHIVE_HOURLY_DAYS) * 86400 - _KST_SECONDS
+        if cutoff <= done:
+            return 0
+        ts = self.column(self.TS)
+        a, b = bisect.bisect_left(ts, done), bisect.bisect_left(ts, cutoff)
+        removed = 0
+        if b - a > 1:
+            days = [int((t + _KST_SECONDS) // 86400) for t in ts[a:b]]
+            ends = [a + i + 1 for i in range(len(days)) if i + 1 == len(days) or days[i + 1] != days[i]]
+            starts = [a] + ends[:-1]
+            new = {}
+            for name in self.metrics() + [self.TS]:
+                col = self.column(name)
+                out = array(self.VAL_TYPE, col[:a])
+                for s, e in zip(starts, ends):
+                    out.append(next((col[i] for i in range(e - 1, s - 1, -1) if col[i] == col[i]), float('nan')))
+                out.extend(col[b:len(ts)])
+                new[name] = out
+            removed = len(ts) - len(new[self.TS])
+            self._release()
+            for name, out in new.items():
+                with open(self._path(name) + '.tmp', 'wb') as f:
+                    out.tofile(f)
+            for name in new:
+                os.replace(self._path(name) + '.tmp', self._path(name))
+            print(f"[보관] {b - a}개 시간별 행 → {len(starts)}개 일별 행 축약")
+        meta['compacted_until'] = cutoff
+        write_atomic(self._meta_path(), json.dumps(meta))
+        return removed
+
+
+ARCHIVE = RunArchive()
+
+
+def archive_values(res):
+    """수집 결과 → 보관할 {지표: 값}. 이번에 새로 받은 값만 (스냅샷으로 대체한 소스는 제외)"""
+    def fresh(name):
+        return res.get(name) is not None and name not in SNAPSHOTS.served
+
+    values = {}
+    if fresh('yf prices'):
+        for tk in ARCHIVE_TICKERS:
+            row = snapshot_row(res['yf prices'], tk)
+            if row is not None:
+                values[tk] = row['last']
+    for col, (name, pick) in ARCHIVE_SENTIMENT.items():
+        if fresh(name):
+            try:
+                values[col] = pick(res[name])
+            except (TypeError, AttributeError, IndexError, KeyError):
+                pass
+    return values
+
+
+def archive_run(res):
+    """이번 실행 값을 ARCHIVE 에 한 행 추가 (실패해도 갱신은 계속)"""
+    try:
+        with METRICS.stage('archive'):
+            ARCHIVE.append(archive_values(res))
+    except OSError as e:
+        print(f"[보관] 기록 실패: {e}")
+
+
+def archive_history(name, hours=ARCHIVE_SPARK_HOURS):
+    """보관소의 최근 값 [[시각, 값], ...] (점이 2개 미만이면 None). 최대 ARCHIVE_SPARK_POINTS 개로 솎음"""
+    try:
+        pts = ARCHIVE.window(name, hours)
+    except (OSError, ValueError):
+        return None
+    if len(pts) < 2:
+        return None
+    step = -(-len(pts) // ARCHIVE_SPARK_POINTS)
+    pts = pts[::-1][::step][::-1]               # 마지막(현재) 점은 항상 포함
+    return [[int(t), round(v, 4)] for t, v in pts]
+
+
+def sparkline_svg(points, color, width=56, height=14):
+    """[[시각, 값], ...] → 인라인 SVG 꺾은선 (x 는 시각 비례)"""
+    t0, t1 = points[0][0], points[-1][0]
+    vals = [v for _, v in points]
+    lo, hi = min(vals), max(vals)
+    coords = ' '.join(
+        f"{(t - t0) / ((t1 - t0) or 1) * width:.1f},"
+        f"{(height - 1) - ((v - lo) / ((hi - lo) or 1)) * (height - 2):.1f}"
+        for t, v in points)
+    return (f'<svg class="spark" width="{width}" height="{height}" viewBox="0 0 {width} {height}"'
+            f' style="vertical-align:middle;margin-left:4px;">'
+            f'<polyline fill="none" stroke="{color}" stroke-width="1.2" points="{coords}"/></svg>')
+
 # ─── HTML 업데이트 ────────────────────────────────────────────────────────────
 
-def update_index_html(data):
-    if not os.path.exists(INDEX_HTML_PATH):
-        return
+def data_fingerprint(obj):
+    """카드 입력 데이터 → sha1 (키 정렬 JSON, 직렬화 불가 값은 str)"""
+    raw = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
 
-    with open(INDEX_HTML_PATH, 'r', encoding='utf-8') as f:
-        content = f.read()
 
-    # --- 왼쪽 카드 HTML ---
-    indices_parts = []
-    for idx in data['market']['indices']:
-        cls   = 'change-up' if idx['up'] else 'change-down'
-        arrow = '▲' if idx['up'] else '▼'
-        indices_parts.append(
-            f'<div class="mini-box"><span class="mini-name">{idx["name"]}</span>'
-            f'<span class="mini-val">{idx["val"]}</span>'
-            f'<span class="mini-pct {cls}">{arrow} {idx["pct"]}</span></div>'
-        )
-    indices_html = ''.join(indices_parts)
-
-    sectors_parts = []
-    for s in data['market']['sectors']:
-        cls = 'change-up' if s.get('up') else 'change-down'
-        sectors_parts.append(
-            f'<div class="data-bar-row"><div class="data-bar-label"><span>{s["name"]}</span>'
-            f'<div class="data-bar-visual"><div class="data-bar-fill" style="width:{s["val"]}; background:{s["color"]};"></div></div></div>'
-            f'<span class="{cls}">{s["pct"]}</span></div>'
-        )
-    sectors_html = ''.join(sectors_parts)
-
-    bigtech_parts = []
-    for b in data['market']['bigtech']:
-        cls = 'change-up' if b['up'] else 'change-down'
-        bigtech_parts.append(
-            f'<div class="mini-box" style="padding:8px 4px;"><span class="mini-name" style="font-size:0.8rem;">{b["name"]}</span>'
-            f'<span class="{cls}" style="font-size:0.95rem; font-weight:700;">{b["pct"]}</span></div>'
-        )
-    bigtech_html = ''.join(bigtech_parts)
+def spark_fingerprint(points):
+    """스파크라인 점 [[시각, 값], ...] → 지문용 값 목록 (시각 제외, 연속으로 같은 값은 하나로).
+    실행마다 보관소에 행이 늘어 시각·점 수는 바뀌므로, 값이 달라질 때만 지문이 바뀌도록.
+    """
+    vals = [v for _, v in points or ()]
+    return [v for i, v in enumerate(vals) if i == 0 or v != vals[i - 1]]
+
+
+def write_atomic(path, text):
+    """임시 파일에 쓴 뒤 os.replace (중간에 실패해도 기존 파일 유지)"""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class RenderState:
+    """마지막으로 쓴 index.html 의 sha1 과 영역별 입력 데이터 지문.
+    디스크의 페이지가 기록과 다르면 (수동 수정·캐시 유실) 모든 영역을 변경으로 간주.
+    """
+
+    def __init__(self, path=RENDER_STATE_PATH):
+        self.path = path
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _page_hash(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
 
-    left_card_content = f'''
+    def changed(self, content, fingerprints):
+        """지문이 바뀐 영역 이름 목록 (문서 순서 무관, fingerprints 순서)"""
+        prev = self._load()
+        if prev.get('page') != self._page_hash(content):
+            return list(fingerprints)
+        regions = prev.get('regions', {})
+        return [name for name, fp in fingerprints.items() if regions.get(name) != fp]
+
+    def commit(self, rendered, fingerprints):
+        prev = self._load().get('regions', {})
+        state = {'page': self._page_hash(rendered), 'regions': dict(prev, **fingerprints)}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        write_atomic(self.path, json.dumps(state))
+
+
+RENDER_STATE = RenderState()
+
+
+_RAW_TEXT_RE = re.compile(r'(<(script|style|pre|textarea)\b.*?</\2\s*>)', re.S | re.I)
+
+
+def minify_html(fragment):
+    """생성 영역 축소: 줄바꿈 포함 공백 → 줄바꿈 하나 (렌더링 동일).
+    <script>/<style> 은 줄 앞 들여쓰기만 제거, <pre>/<textarea> 는 그대로.
+    """
+    parts = _RAW_TEXT_RE.split(fragment)
+    out = []
+    # split 결과: [텍스트, 원시블록, 태그명, 텍스트, 원시블록, 태그명, ...]
+    for i in range(0, len(parts), 3):
+        out.append(re.sub(r'[ \t\r\f\v]*\n\s*', '\n', parts[i]))
+        if i + 1 < len(parts):
+            raw, tag = parts[i + 1], parts[i + 2].lower()
+            out.append(re.sub(r'\n[ \t]+', '\n', raw) if tag in ('script', 'style') else raw)
+    return ''.join(out)
+
+
+def _kb(n):
+    return f"{n / 1024:.1f}KB"
+
+
+def publish_index_html(path=INDEX_HTML_PATH, budget=None):
+    """게시 단계: .gz/.br 압축본 생성 + 영역별 바이트 예산 보고.
+    반환: 예산을 넘은 항목 이름 목록
+    """
+    budget = PAGE_BUDGET if budget is None else budget
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    sizes = {}
+    if PUBLISH_COMPRESSED:
+        gz = gzip.compress(raw, compresslevel=9, mtime=0)   # mtime=0 → 같은 입력이면 같은 바이트
+        with open(path + '.gz', 'wb') as f:
+            f.write(gz)
+        sizes['gz'] = len(gz)
+        if brotli:
+            br = brotli.compress(raw, quality=11)
+            with open(path + '.br', 'wb') as f:
+                f.write(br)
+            sizes['br'] = len(br)
+
+    page = MarkerPage(raw.decode('utf-8'))
+    rows = [(name, len(page.region(name).encode('utf-8')), top)
+            for name, (_, _, top) in sorted(page.spans.items(), key=lambda kv: kv[1][0])]
+    static = len(raw) - sum(n for _, n, top in rows if top)
+
+    comp = ', '.join(f"{k} {_kb(v)}" for k, v in sizes.items())
+    print(f"[PAGE] {os.path.basename(path)} {_kb(len(raw))}" + (f" ({comp})" if comp else ''))
+    over = []
+    for name, n, top in rows + [('(정적)', static, True)]:
+        limit = budget.get(name)
+        flag = ''
+        if limit is not None and n > limit:
+            flag = f"  ← 예산 {_kb(limit)} 초과"
+            over.append(name)
+        indent = '  ' if top else '    '
+        print(f"{indent}{name:<18} {_kb(n):>8} {n / len(raw):6.1%}{flag}")
+    limit = budget.get(os.path.basename(path))
+    if limit is not None and len(raw) > limit:
+        print(f"[PAGE] 전체 {_kb(len(raw))} > 예산 {_kb(limit)}")
+        over.append(os.path.basename(path))
+    return over
+
+
+class MarkerError(ValueError):
+    """index.html 마커가 없거나 중복·짝이 맞지 않음"""
+
+
+class MarkerPage:
+    """<!-- X_START -->…<!-- X_END --> 영역 기준으로 문서를 한 번만 토큰화.
+    최상위 영역은 이름으로 교체, 안쪽(중첩) 영역은 읽기 전용.
+    render() 는 고정 구간과 영역 본문을 한 번의 join 으로 조립.
+    """
+    MARKER_RE = re.compile(r'<!-- ([A-Z][A-Z0-9_]*)_(START|END) -->')
+
+    def __init__(self, text):
+        self.text    = text
+        self.spans   = {}      # name → (본문 시작, 본문 끝, 최상위 여부)
+        self.order   = []      # 최상위 영역 이름 (문서 순서)
+        self.bodies  = {}      # 교체된 최상위 영역 본문
+        stack = []
+        for m in self.MARKER_RE.finditer(text):
+            name, kind = m.group(1), m.group(2)
+            if kind == 'START':
+                if name in self.spans or any(n == name for n, _ in stack):
+                    raise MarkerError(f"마커 중복: {name}")
+                stack.append((name, m.end()))
+                continue
+            if not stack or stack[-1][0] != name:
+                raise MarkerError(f"짝 없는 마커: <!-- {name}_END -->")
+            _, start = stack.pop()
+            self.spans[name] = (start, m.start(), not stack)
+            if not stack:
+                self.order.append(name)
+        if stack:
+            raise MarkerError(f"닫히지 않은 마커: <!-- {stack[-1][0]}_START -->")
+
+    def __contains__(self, name):
+        return name in self.spans
+
+    def _span(self, name):
+        if name not in self.spans:
+            raise MarkerError(f"마커 없음: <!-- {name}_START -->")
+        return self.spans[name]
+
+    def region(self, name):
+        """영역 본문 (교체됐으면 교체된 본문)"""
+        if name in self.bodies:
+            return self.bodies[name]
+        start, end, _ = self._span(name)
+        return self.text[start:end]
+
+    def replace(self, name, body):
+        """최상위 영역 본문 교체 (마커 자체는 유지)"""
+        if not self._span(name)[2]:
+            raise MarkerError(f"중첩 영역은 교체 불가: {name}")
+        self.bodies[name] = body
+
+    def render(self):
+        parts, pos = [], 0
+        for name in self.order:
+            start, end, _ = self.spans[name]
+            if name not in self.bodies:
+                continue
+            parts.append(self.text[pos:start])
+            parts.append(self.bodies[name])
+            pos = end
+        parts.append(self.text[pos:])
+        return ''.join(parts)
+
+
+# 왼쪽 시장 카드: 지수·섹터·Mag7 행 + 카드 본문.
+# 표시 이름·제목·요약 문구는 코드에 정의된 값이라 기존 출력과 같게 그대로 씀 (예: 'S&P 500')
+MarketTile = namedtuple('MarketTile', 'name val cls arrow pct spark')
+SectorRow  = namedtuple('SectorRow', 'name val color cls pct')
+BigtechTile = namedtuple('BigtechTile', 'name cls pct')
+LeftCard   = namedtuple('LeftCard', 'date weekday stale title indices sectors bigtech korea')
+
+MARKET_TILE_TPL = Template(
+    '<div class="mini-box"><span class="mini-name">{name|raw}</span>'
+    '<span class="mini-val">{val}</span>'
+    '<span class="mini-pct {cls}">{arrow} {pct}</span>{spark|raw}</div>', MarketTile)
+SECTOR_ROW_TPL = Template(
+    '<div class="data-bar-row"><div class="data-bar-label"><span>{name|raw}</span>'
+    '<div class="data-bar-visual"><div class="data-bar-fill" style="width:{val}; background:{color};"></div></div></div>'
+    '<span class="{cls}">{pct}</span></div>', SectorRow)
+BIGTECH_TILE_TPL = Template(
+    '<div class="mini-box" style="padding:8px 4px;"><span class="mini-name" style="font-size:0.8rem;">{name|raw}</span>'
+    '<span class="{cls}" style="font-size:0.95rem; font-weight:700;">{pct}</span></div>', BigtechTile)
+LEFT_CARD_TPL = Template('''
                         <div class="news-card-header">
                             <div class="header-top">
-                                <span class="date-badge">{data['date']} ({data['weekday']})</span>
-                                <span style="font-size: 0.9rem; color: #94a3b8;">US Market Focus</span>
+                                <span class="date-badge">{date} ({weekday})</span>
+                                <span style="font-size: 0.9rem; color: #94a3b8;">US Market Focus</span>{stale|raw}
                             </div>
-                            <div class="market-status-title" style="margin-top: 5px; font-size: 1.25rem;">{data['market']['title']}</div>
+                            <div class="market-status-title" style="margin-top: 5px; font-size: 1.25rem;">{title|raw}</div>
                         </div>
                         <div class="section-label">Major Indices</div>
-                        <div class="index-grid-3">{indices_html}</div>
+                        <div class="index-grid-3">{indices|parts}</div>
                         <div class="section-label">S&P 500 Sectors</div>
-                        <div style="margin-bottom:20px;">{sectors_html}</div>
+                        <div style="margin-bottom:20px;">{sectors|parts}</div>
                         <div class="section-label">Magnificent 7</div>
-                        <div class="index-grid-3" style="grid-template-columns: repeat(4, 1fr);">{bigtech_html}</div>
+                        <div class="index-grid-3" style="grid-template-columns: repeat(4, 1fr);">{bigtech|parts}</div>
                         <div class="section-label">Korea Market Summary</div>
                         <div style="font-size:1rem; line-height:1.6; color:#cbd5e1; background:rgba(255,255,255,0.03); padding:12px; border-radius:10px;">
-                            🇰🇷 {data['market']['korea']}
+                            🇰🇷 {korea|raw}
                         </div>
-    '''
-
-    # --- 오른쪽 카드 HTML ---
-    nn = data['news']
-    mk_dropdown_html = build_mk_dropdown_html(data.get('mk_data', {}))
-
-    upd_time   = nn['updated_time']
-    reload_btn = (
-        '<button onclick="refreshRightCard()" title="새로고침"'
-        ' style="margin-left:auto;background:rgba(255,255,255,0.08);'
-        'border:1px solid rgba(255,255,255,0.15);color:#94a3b8;font-size:0.8rem;'
-        'padding:3px 10px;border-radius:6px;cursor:pointer;transition:all 0.2s;"'
-        ' onmouseover="this.style.background=\'rgba(255,255,255,0.15)\';this.style.color=\'#f8fafc\'"'
-        ' onmouseout="this.style.background=\'rgba(255,255,255,0.08)\';this.style.color=\'#94a3b8\'">⟳ 새로고침</button>'
-    )
-
-    right_card_content = (
-        '<div class="news-card-header">'
-        '<div class="header-top">'
-        '<span class="date-badge" style="background:rgba(251,191,36,0.15);color:#fbbf24;">뉴스</span>'
-        f'<span style="font-size:0.9rem;color:#94a3b8;">Updated: {upd_time} KST</span>'
-        + reload_btn +
-        '</div>'
-        '<div class="market-status-title" style="margin-top:10px;">📰 뉴스 브리핑</div>'
-        '</div>'
-        '<div>'
-        '<strong style="color:#fbbf24;font-size:0.82em;display:block;margin-bottom:8px;'
-        'letter-spacing:0.03em;border-bottom:1px solid rgba(251,191,36,0.2);padding-bottom:4px;">'
-        '📰 매일경제</strong>'
-        + mk_dropdown_html +
-        '</div>'
-    )
-
-    # --- 변동성 & 매크로 카드 업데이트 ---
-    if 'volatility' in data:
-        vol_html = build_volatility_card_html(data['volatility'], data['news']['updated_time'])
-        vol_pat  = r'<!-- VOLATILITY_CARD_START -->.*?<!-- VOLATILITY_CARD_END -->'
-        vol_rep  = '<!-- VOLATILITY_CARD_START -->\n' + vol_html + '\n            <!-- VOLATILITY_CARD_END -->'
-        content  = re.sub(vol_pat, vol_rep, content, flags=re.DOTALL)
-
-    # 업데이트 로직
-    pattern = r'(<!-- MARKET_NEWS_CARD_START -->)(.*?)(<!-- MARKET_NEWS_CARD_END -->)'
-    if not re.search(pattern, content, re.DOTALL):
-        print("마커를 찾을 수 없습니다.")
-        return
-
-    # 왼쪽 카드: 아침/저녁 업데이트 or --force 시에만 갱신
-    left_html_to_use = left_card_content
-    left_pattern = r'<!-- LEFT_CARD_START -->(.*?)<!-- LEFT_CARD_END -->'
-    left_match = re.search(left_pattern, content, re.DOTALL)
-    if left_match and not data['is_morning_update'] and '--force' not in sys.argv:
-        left_html_to_use = left_match.group(1).strip()
-
-    new_card_html = f'''
+    ''', LeftCard)
+
+
+def build_left_card_html(data, stale=None):
+    """왼쪽 시장 카드 HTML (지수·섹터·Mag7·한국 시장 요약)"""
+    market = data['market']
+    indices = []
+    for idx in market['indices']:
+        spark = sparkline_svg(idx['spark'], '#10b981' if idx['up'] else '#f43f5e') if idx.get('spark') else ''
+        indices += MARKET_TILE_TPL.parts(MarketTile(
+            idx['name'], idx['val'], 'change-up' if idx['up'] else 'change-down',
+            '▲' if idx['up'] else '▼', idx['pct'], spark))
+
+    sectors = []
+    for s in market['sectors']:
+        sectors += SECTOR_ROW_TPL.parts(SectorRow(
+            s['name'], s['val'], s['color'], 'change-up' if s.get('up') else 'change-down', s['pct']))
+
+    bigtech = []
+    for b in market['bigtech']:
+        bigtech += BIGTECH_TILE_TPL.parts(BigtechTile(
+            b['name'], 'change-up' if b['up'] else 'change-down', b['pct']))
+
+    return LEFT_CARD_TPL.render(LeftCard(
+        data['date'], data['weekday'], stale_mark(stale), market['title'],
+        indices, sectors, bigtech, market['korea']))
+
+
+# 오른쪽 뉴스 카드: 헤더(갱신 시각·새로고침 버튼) + 매일경제 드롭다운
+RightCard = namedtuple('RightCard', 'updated_time stale mk_dropdown')
+
+RIGHT_CARD_TPL = Template(
+    '<div class="news-card-header">'
+    '<div class="header-top">'
+    '<span class="date-badge" style="background:rgba(251,191,36,0.15);color:#fbbf24;">뉴스</span>'
+    '<span style="font-size:0.9rem;color:#94a3b8;">Updated: {updated_time} KST</span>'
+    '{stale|raw}'
+    '<button onclick="refreshRightCard()" title="새로고침"'
+    ' style="margin-left:auto;background:rgba(255,255,255,0.08);'
+    'border:1px solid rgba(255,255,255,0.15);color:#94a3b8;font-size:0.8rem;'
+    'padding:3px 10px;border-radius:6px;cursor:pointer;transition:all 0.2s;"'
+    ' onmouseover="this.style.background=\'rgba(255,255,255,0.15)\';this.style.color=\'#f8fafc\'"'
+    ' onmouseout="this.style.background=\'rgba(255,255,255,0.08)\';this.style.color=\'#94a3b8\'">⟳ 새로고침</button>'
+    '</div>'
+    '<div class="market-status-title" style="margin-top:10px;">📰 뉴스 브리핑</div>'
+    '</div>'
+    '<div>'
+    '<strong style="color:#fbbf24;font-size:0.82em;display:block;margin-bottom:8px;'
+    'letter-spacing:0.03em;border-bottom:1px solid rgba(251,191,36,0.2);padding-bottom:4px;">'
+    '📰 매일경제</strong>'
+    '{mk_dropdown|parts}'
+    '</div>', RightCard)
+
+
+def build_right_card_html(data, stale=None):
+    """오른쪽 뉴스 카드 HTML (헤더 + 매일경제 드롭다운)"""
+    return RIGHT_CARD_TPL.render(RightCard(
+        data['news']['updated_time'], stale_mark(stale), mk_dropdown_parts(data.get('mk_data', {}))))
+
+
+# 시장·뉴스 카드 영역: 왼쪽·오른쪽 카드 (각각 완성된 HTML 또는 페이지의 기존 내용)
+MarketNewsCard = namedtuple('MarketNewsCard', 'left right')
+
+MARKET_NEWS_CARD_TPL = Template('''
             <div id="marketNewsCardArea">
                 <div class="news-card-wrapper">
                     <div class="news-card-column" id="left-card-column">
                         <!-- LEFT_CARD_START -->
-                        {left_html_to_use}
+                        {left|raw}
                         <!-- LEFT_CARD_END -->
                     </div>
                     <div class="news-card-column" id="right-card-column">
                         <!-- RIGHT_CARD_START -->
-                        {right_card_content}
+                        {right|raw}
                         <!-- RIGHT_CARD_END -->
                     </div>
                 </div>
             </div>
-'''
+''', MarketNewsCard)
+
+
+def update_index_html(data):
+    """index.html 갱신. 반환: True=씀, False=변경 없음(생략), None=파일·마커 없음"""
+    if not os.path.exists(INDEX_HTML_PATH):
+        return None
 
-    updated = re.sub(pattern, rf'\1{new_card_html}\3', content, flags=re.DOTALL)
-    updated = update_econ_dashboard(updated)   # 경제지표 FRED 데이터 업데이트
-    with open(INDEX_HTML_PATH, 'w', encoding='utf-8') as f:
-        f.write(updated)
+    with open(INDEX_HTML_PATH, 'r', encoding='utf-8') as f:
+        content = f.read()
+    try:
+        page = MarkerPage(content)
+    except MarkerError as e:
+        print(f"index.html 마커 오류: {e}")
+        return None
+    if 'MARKET_NEWS_CARD' not in page:
+        print("마커를 찾을 수 없습니다.")
+        return None
+
+    # --- 변경 감지: 카드별 입력 데이터 지문 (갱신 시각 제외) ---
+    # 데이터가 없는 영역(--sections 에서 빠진 영역)은 페이지의 기존 내용 유지
+    force         = '--force' in sys.argv
+    refresh_left  = 'market' in data
+    refresh_right = 'mk_data' in data or 'RIGHT_CARD' not in page
+    econ_state    = prepare_econ_state(page, data['econ_fred']) if 'econ_fred' in data else None
+    stale         = data.get('stale') or {}
+    left_stale    = {n: t for n, t in stale.items() if n == 'yf prices'}
+    right_stale   = {n: t for n, t in stale.items() if n.startswith('MK ')}
+    fingerprints  = {}
+    if 'volatility' in data:
+        vm = data['volatility']
+        fingerprints['VOLATILITY_CARD'] = data_fingerprint(dict(
+            vm, history={k: spark_fingerprint(h) for k, h in vm.get('history', {}).items()}))
+    if refresh_right:
+        fingerprints['RIGHT_CARD'] = data_fingerprint([data.get('mk_data', {}), right_stale])
+    if econ_state is not None:
+        fingerprints['ECON_DATA'] = data_fingerprint({k: v for k, v in econ_state.items()
+                                                      if k != 'lastUpdated'})
+    if refresh_left:
+        market = dict(data['market'], indices=[
+            dict(idx, spark=spark_fingerprint(idx['spark'])) if 'spark' in idx else idx
+            for idx in data['market'].get('indices', [])])
+        fingerprints['LEFT_CARD'] = data_fingerprint(
+            [data['date'], data['weekday'], market, left_stale])
+    changes = RENDER_STATE.changed(content, fingerprints)
+    if not changes and not force:
+        print("[변경 없음] 카드 데이터 동일 → 렌더링·쓰기 생략")
+        return False
+    print(f"[변경] {', '.join(changes) or '--force'}")
+
+    # --- 변동성 & 매크로 카드 업데이트 ---
+    if 'volatility' in data:
+        vol_html = build_volatility_card_html(data['volatility'], data['news']['updated_time'])
+        if 'VOLATILITY_CARD' in page:
+            page.replace('VOLATILITY_CARD', '\n' + vol_html + '\n            ')
+
+    # 왼쪽·오른쪽 카드: 이번 실행에 데이터가 있는 쪽만 새로 생성, 나머지는 기존 내용 유지
+    if refresh_left:
+        left_html_to_use = build_left_card_html(data, left_stale)
+    else:
+        left_html_to_use = page.region('LEFT_CARD').strip() if 'LEFT_CARD' in page else ''
+    if refresh_right:
+        right_card_content = build_right_card_html(data, right_stale)
+    else:
+        right_card_content = page.region('RIGHT_CARD').strip()
+
+    new_card_html = MARKET_NEWS_CARD_TPL.render(MarketNewsCard(left_html_to_use, right_card_content))
+    page.replace('MARKET_NEWS_CARD', new_card_html)
+    if econ_state is not None:
+        update_econ_dashboard(page, econ_state)   # 경제지표 FRED 데이터 업데이트
+    for name in list(page.bodies):
+        page.replace(name, minify_html(page.region(name)))
+    rendered = page.render()
+    write_atomic(INDEX_HTML_PATH, rendered)
+    RENDER_STATE.commit(rendered, fingerprints)
     print("index.html 업데이트 완료.")
+    return True
+
+
+def update_once(market_data):
+    """렌더링 + 게시 → 종료 코드 (0=갱신, EXIT_UNCHANGED, EXIT_OVER_BUDGET, 1=index.html/마커 문제)"""
+    with METRICS.stage('render'):
+        written = update_index_html(market_data)
+    with METRICS.stage('publish'):
+        over = publish_index_html(INDEX_HTML_PATH) if written else []
+    code = 1 if written is None else EXIT_OVER_BUDGET if over else 0 if written else EXIT_UNCHANGED
+    METRICS.write(exit=code, changed=bool(written))
+    return code
+
+
+def run_daemon(intervals=None, sections=None):
+    """상주 실행: 그룹별 주기로 해당 소스만 다시 수집하고, 나머지는 직전 결과 재사용.
+    HTTP 캐시·연결 풀·번역 메모·FRED 저장소는 프로세스 안에서 계속 유지.
+    페이지는 카드 데이터 지문이 바뀐 영역이 있을 때만 다시 씀 (update_index_html).
+    sections 를 주면 그 영역만, 아니면 주기마다 default_sections() 영역을 갱신
+    (수집 작업도 그 영역 기준 — 왼쪽 카드 티커는 07·22시(KST) 에만. 영역이 바뀐 주기는 모든 그룹 재수집).
+    SIGTERM/SIGINT 시 진행 중인 주기를 마치고 종료.
+    """
+    global METRICS
+    intervals = {**DAEMON_INTERVALS, **(intervals or {})}
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+
+    next_at = {g: 0.0 for g in market_fetch_groups(sections or SECTIONS)}
+    active  = None              # 직전 주기의 갱신 영역
+    res: dict = {}
+    print(f"[daemon] 시작 · " + ' '.join(f"{g}={intervals[g]}s" for g in next_at))
+    while not stop.is_set():
+        now_sections = sections or default_sections()
+        groups = market_fetch_groups(now_sections)
+        if now_sections != active:  # 영역이 바뀌면 (예: 왼쪽 카드 시각) 새 영역 기준으로 전부 다시 수집
+            active = now_sections
+            due = list(groups)
+        else:
+            due = [g for g in groups if next_at.get(g, 0.0) <= time.monotonic()]
+        if due:
+            METRICS = RunMetrics(METRICS.path)
+            if 'fred' in due:
+                FRED.reset()
+            with METRICS.stage('collect'):
+                got, _ = run_fetch_graph([t for g in due for t in groups[g]])
+                archive_run(got)            # 이번 주기에 받은 소스만 기록
+                res.update(got)
+                market_data = assemble_market_data(res, active)
+            code = update_once(market_data)
+            print(f"[daemon] {', '.join(due)} 갱신 · 종료 코드 {code}")
+            for g in due:
+                next_at[g] = time.monotonic() + intervals[g]
+        stop.wait(max(1.0, min(next_at.values()) - time.monotonic()))
+    print(HTTP_CACHE.summary())
+    print(TRANSPORT.summary())
+    print("[daemon] 종료")
+    return 0
 
 
 if __name__ == "__main__":
-    update_index_html(get_latest_market_data())
+    # python scripts/update_news.py [--sections news,volatility,econ,left] [--force]
+    sections = None
+    if '--sections' in sys.argv:
+        i = sys.argv.index('--sections')
+        try:
+            sections = parse_sections(sys.argv[i + 1] if len(sys.argv) > i + 1 else '')
+        except ValueError as e:
+            print(f"--sections: {e}")
+            sys.exit(2)
+
+    if '--daemon' in sys.argv:
+        # python scripts/update_news.py --daemon  (cron 대신 상주 실행)
+        sys.exit(run_daemon(sections=sections))
+
+    if '--summary' in sys.argv:
+        # python scripts/update_news.py --summary [최근 실행 수]
+        i = sys.argv.index('--summary')
+        n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else 50
+        sys.exit(summarize_metrics(last=n))
+
+    sections = sections or default_sections('--force' in sys.argv)
+    print(f"[영역] {','.join(sections)}")
+    with METRICS.stage('collect'):
+        market_data = get_latest_market_data(sections)
+    code = update_once(market_data)
+    print(HTTP_CACHE.summary())
+    print(TRANSPORT.summary())
+    sys.exit(code)